@@ -0,0 +1,7 @@
+"""__init__.py for adapters package"""
+
+from .http_client import ServiceUnavailableError
+from .services import crm_adapter, credit_bureau_adapter, offer_mart_adapter, close_adapters
+
+__all__ = ['ServiceUnavailableError', 'crm_adapter', 'credit_bureau_adapter', 'offer_mart_adapter',
+           'close_adapters']
@@ -0,0 +1,103 @@
+"""Pooled async HTTP client shared by the service adapters"""
+
+from typing import Any, Dict, Optional
+import asyncio
+import random
+
+import httpx
+
+import config
+
+
+class ServiceUnavailableError(RuntimeError):
+    """Raised when a backing service keeps failing after all retries"""
+
+    def __init__(self, service: str, reason: str):
+        super().__init__(f"{service} unavailable: {reason}")
+        self.service = service
+        self.reason = reason
+
+
+class ServiceClient:
+    """
+    JSON client for one backing service
+
+    Connections are pooled and kept alive across requests. Connection errors,
+    timeouts and 5xx responses are retried with jittered exponential backoff
+    (config.SERVICE_RETRIES times); a 404 means "not found" and returns None.
+    The underlying httpx.AsyncClient is created on first use in the running
+    event loop.
+    """
+
+    RETRY_STATUSES = {502, 503, 504}
+
+    def __init__(self, name: str, base_url: str):
+        """
+        Initialize client
+
+        Args:
+            name: Service name used in errors and logs
+            base_url: Service root URL
+        """
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Pooled client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(config.SERVICE_TIMEOUT_SECONDS,
+                                      connect=config.SERVICE_CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(max_connections=config.SERVICE_MAX_CONNECTIONS,
+                                    max_keepalive_connections=config.SERVICE_MAX_KEEPALIVE_CONNECTIONS,
+                                    keepalive_expiry=config.SERVICE_KEEPALIVE_EXPIRY_SECONDS)
+            )
+            self._loop = loop
+        return self._client
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        GET a JSON resource
+
+        Args:
+            path: Path below the base URL
+            params: Query parameters
+
+        Returns:
+            Decoded body, or None if the service answered 404
+
+        Raises:
+            ServiceUnavailableError: If every attempt failed
+        """
+        client = self._get_client()
+        reason = ""
+        for attempt in range(config.SERVICE_RETRIES + 1):
+            if attempt:
+                backoff = config.SERVICE_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+            try:
+                response = await client.get(path, params=params)
+            except httpx.TransportError as e:  # Connect errors and timeouts
+                reason = f"{type(e).__name__}: {e}"
+                continue
+            if response.status_code == 404:
+                return None
+            if response.status_code in self.RETRY_STATUSES:
+                reason = f"HTTP {response.status_code}"
+                continue
+            if response.is_error:
+                raise ServiceUnavailableError(self.name, f"HTTP {response.status_code}")
+            return response.json()
+        print(f"[Adapters] ERROR: {self.name} {path} failed after {config.SERVICE_RETRIES + 1} attempts: {reason}")
+        raise ServiceUnavailableError(self.name, reason)
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
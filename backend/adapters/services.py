@@ -0,0 +1,213 @@
+"""
+Async adapters for the CRM, credit bureau and offer mart
+
+The agent layer awaits these instead of calling the mocks directly. Each
+service has two implementations:
+- Local*: the in-process mock (the default)
+- HTTP*: a remote service over a pooled ServiceClient, used when the
+  service's URL is configured (e.g. standin_server.py for load tests)
+"""
+
+from typing import Dict, Optional, Protocol
+
+from models import Customer, TierOffer
+from adapters.http_client import ServiceClient
+from mocks.cache import AsyncReadThroughCache
+from mocks.crm_service import crm_service
+from mocks.credit_bureau import credit_bureau_service
+from mocks.offer_mart import offer_mart_service
+import config
+
+
+class CRMAdapter(Protocol):
+    """Customer lookups needed by the agents"""
+
+    async def get_customer_by_phone(self, phone: str) -> Optional[Customer]:
+        """Customer with this phone number, or None"""
+        ...
+
+    async def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
+        """Customer with this ID, or None"""
+        ...
+
+
+class CreditBureauAdapter(Protocol):
+    """Credit score lookups"""
+
+    async def get_credit_score(self, phone: str) -> Optional[int]:
+        """Bureau score for a phone number, or None"""
+        ...
+
+
+class OfferMartAdapter(Protocol):
+    """Loan offer terms"""
+
+    async def get_offers(self, customer_id: str, credit_score: int) -> Optional[TierOffer]:
+        """Offer terms for a customer's rate tier, or None if the offer mart has none"""
+        ...
+
+
+class LocalCRMAdapter:
+    """In-process mock CRM"""
+
+    async def get_customer_by_phone(self, phone: str) -> Optional[Customer]:
+        """Fetch customer profile by phone number"""
+        return crm_service.get_customer_by_phone(phone)
+
+    async def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
+        """Fetch customer profile by customer ID"""
+        return crm_service.get_customer_by_id(customer_id)
+
+
+class LocalCreditBureauAdapter:
+    """In-process mock credit bureau"""
+
+    async def get_credit_score(self, phone: str) -> Optional[int]:
+        """Fetch credit score for a phone number"""
+        return credit_bureau_service.get_credit_score(phone)
+
+
+class LocalOfferMartAdapter:
+    """In-process mock offer mart"""
+
+    async def get_offers(self, customer_id: str, credit_score: int) -> TierOffer:
+        """Fetch offer terms for a customer (shared per rate tier)"""
+        return offer_mart_service.get_offers(customer_id, credit_score)
+
+
+class HTTPCRMAdapter:
+    """Remote CRM with read-through caching of customer lookups"""
+
+    def __init__(self, base_url: str):
+        """
+        Initialize adapter
+
+        Args:
+            base_url: CRM service root URL
+        """
+        self.client = ServiceClient("crm", base_url)
+        self._by_phone = AsyncReadThroughCache("crm_http_phone", self._fetch_by_phone,
+                                               config.CRM_CACHE_TTL_SECONDS)
+        self._by_id = AsyncReadThroughCache("crm_http_id", self._fetch_by_id,
+                                            config.CRM_CACHE_TTL_SECONDS)
+
+    async def _fetch_by_phone(self, phone: str) -> Optional[Customer]:
+        """Load a customer by phone from the CRM"""
+        data = await self.client.get_json(f"/crm/customers/by-phone/{phone}")
+        return Customer(**data) if data is not None else None
+
+    async def _fetch_by_id(self, customer_id: str) -> Optional[Customer]:
+        """Load a customer by ID from the CRM"""
+        data = await self.client.get_json(f"/crm/customers/{customer_id}")
+        return Customer(**data) if data is not None else None
+
+    async def get_customer_by_phone(self, phone: str) -> Optional[Customer]:
+        """
+        Fetch customer profile by phone number
+
+        Raises:
+            ServiceUnavailableError: If the CRM cannot be reached
+        """
+        return await self._by_phone.get(phone)
+
+    async def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
+        """
+        Fetch customer profile by customer ID
+
+        Raises:
+            ServiceUnavailableError: If the CRM cannot be reached
+        """
+        return await self._by_id.get(customer_id)
+
+
+class HTTPCreditBureauAdapter:
+    """Remote credit bureau with read-through caching of scores"""
+
+    def __init__(self, base_url: str):
+        """
+        Initialize adapter
+
+        Args:
+            base_url: Bureau service root URL
+        """
+        self.client = ServiceClient("credit_bureau", base_url)
+        self._scores = AsyncReadThroughCache("credit_bureau_http", self._fetch_credit_score,
+                                             config.CREDIT_BUREAU_CACHE_TTL_SECONDS)
+
+    async def _fetch_credit_score(self, phone: str) -> Optional[int]:
+        """Load a score from the bureau"""
+        data = await self.client.get_json(f"/bureau/scores/{phone}")
+        return int(data["credit_score"]) if data is not None else None
+
+    async def get_credit_score(self, phone: str) -> Optional[int]:
+        """
+        Fetch credit score for a phone number
+
+        Raises:
+            ServiceUnavailableError: If the bureau cannot be reached
+        """
+        return await self._scores.get(phone)
+
+
+class HTTPOfferMartAdapter:
+    """Remote offer mart; identical responses share one TierOffer"""
+
+    MAX_SHARED_OFFERS = 64
+
+    def __init__(self, base_url: str):
+        """
+        Initialize adapter
+
+        Args:
+            base_url: Offer mart service root URL
+        """
+        self.client = ServiceClient("offer_mart", base_url)
+        self._shared: Dict[TierOffer, TierOffer] = {}
+
+    async def get_offers(self, customer_id: str, credit_score: int) -> Optional[TierOffer]:
+        """
+        Fetch offer terms for a customer
+
+        Raises:
+            ServiceUnavailableError: If the offer mart cannot be reached
+        """
+        data = await self.client.get_json(f"/offers/{customer_id}", {"credit_score": credit_score})
+        if data is None:
+            return None
+        offer = TierOffer(**data)
+        if len(self._shared) >= self.MAX_SHARED_OFFERS:
+            self._shared.clear()
+        return self._shared.setdefault(offer, offer)
+
+
+def create_crm_adapter() -> CRMAdapter:
+    """CRM adapter selected by config.CRM_SERVICE_URL"""
+    return HTTPCRMAdapter(config.CRM_SERVICE_URL) if config.CRM_SERVICE_URL else LocalCRMAdapter()
+
+
+def create_credit_bureau_adapter() -> CreditBureauAdapter:
+    """Credit bureau adapter selected by config.CREDIT_BUREAU_SERVICE_URL"""
+    if config.CREDIT_BUREAU_SERVICE_URL:
+        return HTTPCreditBureauAdapter(config.CREDIT_BUREAU_SERVICE_URL)
+    return LocalCreditBureauAdapter()
+
+
+def create_offer_mart_adapter() -> OfferMartAdapter:
+    """Offer mart adapter selected by config.OFFER_MART_SERVICE_URL"""
+    if config.OFFER_MART_SERVICE_URL:
+        return HTTPOfferMartAdapter(config.OFFER_MART_SERVICE_URL)
+    return LocalOfferMartAdapter()
+
+
+async def close_adapters() -> None:
+    """Close the pooled connections of the HTTP adapters"""
+    for adapter in (crm_adapter, credit_bureau_adapter, offer_mart_adapter):
+        client = getattr(adapter, "client", None)
+        if client is not None:
+            await client.aclose()
+
+
+# Singleton instances
+crm_adapter = create_crm_adapter()
+credit_bureau_adapter = create_credit_bureau_adapter()
+offer_mart_adapter = create_offer_mart_adapter()
@@ -1,9 +1,10 @@
 """Sales Agent - Handles offer presentation and negotiation"""
 
-from models import Customer, LoanApplication, OfferDetails, ConversationMemory
-from utils.emi_calculator import calculate_emi, calculate_total_payable, get_interest_rate
-from mocks.offer_mart import offer_mart_service
-import config
+from models import Customer, LoanApplication, OfferDetails, ConversationMemory, TierOffer
+from utils.emi_calculator import get_interest_rate
+from utils.amortization import amortization_schedule
+from utils.offer_grid import offer_grid_service
+from message_templates import render_template, RATE_MESSAGES
 
 
 class SalesAgent:
@@ -11,12 +12,11 @@ class SalesAgent:
     Sales Agent responsible for:
     - Presenting pre-approved offers
     - Negotiating interest rate, tenure, amount
-    - Handling objections
     - Maximizing conversion probability
     """
     
     def present_offer(self, customer: Customer, requested_amount: float, 
-                     requested_tenure: int) -> dict:
+                     requested_tenure: int, offer_terms: TierOffer) -> dict:
         """
         Present loan offer to customer
         
@@ -24,6 +24,7 @@ class SalesAgent:
             customer: Customer profile
             requested_amount: Requested loan amount
             requested_tenure: Requested tenure in months
+            offer_terms: Offer mart terms for the customer's rate tier
             
         Returns:
             Dictionary with offer presentation message and details
@@ -31,12 +32,10 @@ class SalesAgent:
         # Get interest rate based on credit score
         interest_rate = get_interest_rate(customer.credit_score)
         
-        # Calculate EMI
-        emi = calculate_emi(requested_amount, interest_rate, requested_tenure)
-        total_payable = calculate_total_payable(emi, requested_tenure)
-        
-        # Get offer details from offer mart
-        offers = offer_mart_service.get_offers(customer.id, customer.credit_score)
+        # Calculate EMI and total payable from the amortization schedule
+        schedule = amortization_schedule(requested_amount, interest_rate, requested_tenure)
+        emi = schedule.emi
+        total_payable = schedule.total_payable
         
         # Create offer details
         offer = OfferDetails(
@@ -48,137 +47,65 @@ class SalesAgent:
         )
         
         # Craft persuasive message
-        message = self._craft_offer_message(customer, offer, offers)
+        template_params = self._offer_template_params(offer, offer_terms)
+        message = render_template("offer_presented", template_params)
         
         return {
             "message": message,
             "offer": offer,
-            "offers_data": offers
+            "offer_terms": offer_terms,
+            "template_params": template_params
         }
     
-    def _craft_offer_message(self, customer: Customer, offer: OfferDetails, 
-                            offers_data: dict) -> str:
-        """Craft a persuasive offer presentation message"""
+    def _offer_template_params(self, offer: OfferDetails, offer_terms: TierOffer) -> dict:
+        """Parameters for the offer_presented message template"""
         
-        # Determine credit score category
-        if customer.credit_score >= 800:
-            credit_category = "excellent"
-            rate_message = "🌟 Congratulations! Your excellent credit score qualifies you for our **best interest rate**!"
-        elif customer.credit_score >= 750:
-            credit_category = "good"
-            rate_message = "✨ Great news! Your good credit score qualifies you for a **competitive interest rate**!"
-        else:
-            credit_category = "fair"
-            rate_message = "👍 You qualify for our personal loan with a fair interest rate."
+        # Credit score category (tiers without their own message read as fair)
+        credit_tier = offer_terms.tier if offer_terms.tier in RATE_MESSAGES else "fair"
         
-        message = f"""
-{rate_message}
-
-**📋 Your Personalized Loan Offer:**
-
-💰 **Loan Amount:** ₹{offer.amount:,.0f}
-⏱️ **Tenure:** {offer.tenure} months ({offer.tenure//12} years)
-📊 **Interest Rate:** {offer.interest_rate}% per annum
-💳 **Monthly EMI:** ₹{offer.emi:,.2f}
-📈 **Total Payable:** ₹{offer.total_payable:,.2f}
-
-**✅ Key Benefits:**
-• Instant approval for pre-approved customers
-• Flexible repayment options
-• No hidden charges
-• Quick disbursement within 24-48 hours
-
-**💡 Processing Fee:** {offers_data['processing_fee_percent']}% + GST (deducted from loan amount)
-
-Would you like to proceed with this offer? You can also choose a different tenure if you prefer.
-""".strip()
-        
-        return message
+        return {
+            "credit_tier": credit_tier,
+            "amount": offer.amount,
+            "tenure": offer.tenure,
+            "years": offer.tenure // 12,
+            "interest_rate": offer.interest_rate,
+            "emi": offer.emi,
+            "total_payable": offer.total_payable,
+            "processing_fee_percent": offer_terms.catalogue.processing_fee_percent
+        }
     
-    def handle_tenure_change(self, customer: Customer, amount: float, 
-                           new_tenure: int) -> dict:
+    def present_tenure_options(self, customer: Customer, amount: float) -> dict:
         """
-        Handle customer request to change tenure
+        Show the EMI for every tenure option at once
         
         Args:
             customer: Customer profile
             amount: Loan amount
-            new_tenure: New requested tenure
             
         Returns:
-            Updated offer details
+            Dictionary with the options message and the per-tenure options
         """
-        if new_tenure not in config.TENURE_OPTIONS:
-            return {
-                "success": False,
-                "message": f"Sorry, {new_tenure} months is not a valid tenure option. Please choose from: {', '.join(map(str, config.TENURE_OPTIONS))} months."
-            }
+        options = offer_grid_service.get_grid(customer).options(amount)
         
-        # Recalculate with new tenure
-        interest_rate = get_interest_rate(customer.credit_score)
-        emi = calculate_emi(amount, interest_rate, new_tenure)
-        total_payable = calculate_total_payable(emi, new_tenure)
+        lines = []
+        for option in options:
+            line = f"• **{option['tenure']} months:** EMI ₹{option['emi']:,.2f}, total ₹{option['total_payable']:,.2f}"
+            if option['emi_to_salary'] is not None:
+                line += f" ({option['emi_to_salary']:.0%} of salary)"
+            lines.append(line)
         
         message = f"""
-**Updated Offer with {new_tenure} months tenure:**
+**EMI options for ₹{amount:,.0f}:**
 
-💳 **Monthly EMI:** ₹{emi:,.2f}
-📈 **Total Payable:** ₹{total_payable:,.2f}
+{chr(10).join(lines)}
 
-This looks good! Shall we proceed with this?
+Which tenure would you like? (e.g. '36 months')
 """.strip()
         
         return {
-            "success": True,
             "message": message,
-            "emi": emi,
-            "total_payable": total_payable
+            "options": options
         }
-    
-    def handle_objection(self, objection_type: str, customer: Customer, 
-                        amount: float, tenure: int) -> str:
-        """
-        Handle customer objections with persuasive responses
-        
-        Args:
-            objection_type: Type of objection (high_emi, high_rate, etc.)
-            customer: Customer profile
-            amount: Loan amount
-            tenure: Tenure in months
-            
-        Returns:
-            Persuasive response message
-        """
-        if objection_type == "high_emi":
-            # Suggest longer tenure
-            longer_tenure = min([t for t in config.TENURE_OPTIONS if t > tenure], default=tenure)
-            if longer_tenure > tenure:
-                interest_rate = get_interest_rate(customer.credit_score)
-                new_emi = calculate_emi(amount, interest_rate, longer_tenure)
-                return f"""
-I understand your concern about the EMI. Let me offer you a more comfortable option:
-
-If we extend the tenure to **{longer_tenure} months**, your EMI would reduce to just **₹{new_emi:,.2f}** per month.
-
-This gives you more breathing room in your monthly budget. Would this work better for you?
-""".strip()
-            else:
-                return "I understand. The current tenure is already at maximum. Would you like to consider a lower loan amount?"
-        
-        elif objection_type == "high_rate":
-            return f"""
-I appreciate your concern. The interest rate of **{get_interest_rate(customer.credit_score)}%** is based on your credit score of **{customer.credit_score}**.
-
-This is actually a competitive rate in the market for personal loans. Plus, you get:
-✅ No collateral required
-✅ Quick disbursement
-✅ Flexible prepayment options
-
-Would you like to proceed? The rate is locked for you right now!
-""".strip()
-        
-        else:
-            return "I understand your concern. Let me know how I can help make this work for you!"
 
 
 # Singleton instance
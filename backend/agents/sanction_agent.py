@@ -1,10 +1,13 @@
 """Sanction Letter Generator Agent"""
 
-from models import Customer, LoanApplication, OfferDetails, SanctionResponse
-from utils.sanction_letter_generator import SanctionLetterGenerator
-from datetime import datetime
+from models import Customer, LoanApplication, OfferCatalogue, OfferDetails, SanctionResponse, TierOffer
+from mocks.offer_mart import offer_catalogue_store
+from utils.render_pool import render_pool
+from sanction_artifacts import sanction_artifacts
+from message_templates import render_template
+from datetime import date, datetime
+from typing import Optional, Tuple, Union
 import uuid
-import config
 
 
 class SanctionAgent:
@@ -15,29 +18,102 @@ class SanctionAgent:
     - Providing download link
     """
     
-    def __init__(self):
-        self.generator = SanctionLetterGenerator()
-    
-    def generate_sanction_letter(self, customer: Customer, application: LoanApplication,
-                                offer: OfferDetails) -> SanctionResponse:
+    async def generate_sanction_letter(self, customer: Customer, application: LoanApplication,
+                                offer: OfferDetails, catalogue: OfferCatalogue,
+                                session_id: Optional[str] = None) -> SanctionResponse:
         """
         Generate sanction letter for approved loan
         
+        Each application is rendered once: if a letter is already indexed for
+        the application (or session), it is returned without rendering.
+        
         Args:
             customer: Customer profile
             application: Loan application details
             offer: Offer details
+            catalogue: Offer catalogue the customer was quoted under
+            session_id: Chat session ID, indexed alongside the letter
             
         Returns:
             SanctionResponse with PDF URL and sanction ID
+            
+        Raises:
+            RenderQueueFullError: If the render pool is saturated
+            RenderTimeoutError: If rendering takes too long
         """
+        existing = sanction_artifacts.lookup(
+            sanction_id=application.sanction_id,
+            application_id=application.application_id,
+            session_id=session_id
+        )
+        if existing:
+            print(f"[Sanction Agent] Reusing letter {existing['sanction_id']} ({existing['digest'][:12]})")
+            return SanctionResponse(
+                sanction_id=existing['sanction_id'],
+                pdf_url=f"/api/sanction/download/{existing['sanction_id']}",
+                generated_at=datetime.fromisoformat(existing['created_at'])
+            )
+        
         # Generate unique sanction ID
-        sanction_id = f"SAN{datetime.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
+        sanction_id = application.sanction_id or f"SAN{datetime.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
+        
+        application_data, customer_data, loan_details = self.letter_inputs(customer, sanction_id, offer, catalogue)
+        digest = sanction_artifacts.digest(application_data, customer_data, loan_details)
         
+        if sanction_artifacts.exists(digest):
+            sanction_artifacts.link(digest, sanction_id, application.application_id, session_id)
+        else:
+            # Generate PDF in the render pool
+            pdf_bytes = await render_pool.render(
+                application_data=application_data,
+                customer_data=customer_data,
+                loan_details=loan_details
+            )
+            sanction_artifacts.put(digest, pdf_bytes, sanction_id, application.application_id, session_id)
+        
+        # Create response
+        response = SanctionResponse(
+            sanction_id=sanction_id,
+            pdf_url=f"/api/sanction/download/{sanction_id}",
+            generated_at=datetime.now()
+        )
+        
+        return response
+    
+    def offer_catalogue(self, offer_terms: Optional[Union[TierOffer, dict]]) -> OfferCatalogue:
+        """
+        Catalogue a session's offer was quoted under
+        
+        Args:
+            offer_terms: The session's 'offer_terms' context (a plain dict
+                when reloaded from a persistent store), or None
+            
+        Returns:
+            The offer's catalogue, or the current one if the session has no offer terms
+        """
+        if offer_terms is None:
+            return offer_catalogue_store.get()
+        return TierOffer.model_validate(offer_terms).catalogue
+    
+    def letter_inputs(self, customer: Customer, sanction_id: str, offer: OfferDetails,
+                      catalogue: OfferCatalogue) -> Tuple[dict, dict, dict]:
+        """
+        Canonical inputs for a sanction letter
+        
+        Args:
+            customer: Customer profile
+            sanction_id: Sanction ID printed on the letter
+            offer: Approved offer
+            catalogue: Offer catalogue (processing fee)
+            
+        Returns:
+            (application_data, customer_data, loan_details) for the generator
+        """
         # Prepare application data
         application_data = {
             'application_id': sanction_id,
-            'sanction_letter_no': f'SL/2025/{sanction_id}'
+            'sanction_letter_no': f'SL/2025/{sanction_id}',
+            'issue_date': datetime.combine(date.today(), datetime.min.time())
         }
         
         # Prepare customer data
@@ -54,30 +130,32 @@ class SanctionAgent:
             'interest_rate': offer.interest_rate,
             'tenure': offer.tenure,
             'emi': offer.emi,
-            'processing_fee': offer.amount * 0.02  # 2% processing fee
+            'processing_fee': catalogue.processing_fee(offer.amount)
         }
         
-        # Generate PDF
-        pdf_bytes = self.generator.generate_sanction_letter(
-            application_data=application_data,
-            customer_data=customer_data,
-            loan_details=loan_details
-        )
-        
-        # Save PDF to file
-        sanction_filename = f"sanction_{sanction_id}.pdf"
-        sanction_path = config.SANCTION_DIR / sanction_filename
-        with open(sanction_path, 'wb') as f:
-            f.write(pdf_bytes)
-        
-        # Create response
-        response = SanctionResponse(
-            sanction_id=sanction_id,
-            pdf_url=f"/api/sanction/download/{sanction_id}",
-            generated_at=datetime.now()
-        )
+        return application_data, customer_data, loan_details
+    
+    def sanction_message_params(self, customer: Customer, sanction_id: str,
+                                offer: OfferDetails) -> dict:
+        """
+        Parameters for the sanction_generated message template
         
-        return response
+        Args:
+            customer: Customer profile
+            sanction_id: Generated sanction ID
+            offer: Offer details
+            
+        Returns:
+            Template parameters
+        """
+        return {
+            "name": customer.name,
+            "sanction_id": sanction_id,
+            "amount": offer.amount,
+            "tenure": offer.tenure,
+            "emi": offer.emi,
+            "interest_rate": offer.interest_rate
+        }
     
     def craft_sanction_message(self, customer: Customer, sanction_id: str,
                               pdf_url: str, offer: OfferDetails) -> str:
@@ -93,36 +171,8 @@ class SanctionAgent:
         Returns:
             Message with sanction details
         """
-        message = f"""
-🎊 **Sanction Letter Generated Successfully!** 🎊
-
-Dear {customer.name},
-
-Congratulations! Your loan has been sanctioned. Here are your loan details:
-
-**📄 Sanction ID:** {sanction_id}
-**💰 Sanctioned Amount:** Rs. {offer.amount:,.0f}
-**⏱️ Tenure:** {offer.tenure} months
-**💳 Monthly EMI:** Rs. {offer.emi:,.2f}
-**📊 Interest Rate:** {offer.interest_rate}% p.a.
-
-**📥 Download Your Sanction Letter:**
-Your official sanction letter is ready! Click the download button below to get your PDF.
-
-**🎯 Next Steps:**
-1. Download and review your sanction letter
-2. Our team will contact you within 24 hours
-3. Complete documentation process
-4. Funds will be disbursed within 48 hours
-
-**📞 Need Help?**
-Contact us at: 1800-123-4567
-Email: support@tatacapital.com
-
-Thank you for choosing Tata Capital! We're excited to serve you. 🙏
-""".strip()
-        
-        return message
+        return render_template("sanction_generated",
+                               self.sanction_message_params(customer, sanction_id, offer))
 
 
 # Singleton instance
@@ -2,9 +2,90 @@
 
 from models import Customer, LoanApplication, LoanDecision
 from utils.emi_calculator import calculate_emi
+from utils.emi_solver import max_affordable_amount, max_principal, min_tenure_option
+from policy import policy_store, UnderwritingPolicy
+from typing import Dict, Optional, Sequence
+import numpy as np
 import config
 
 
+# Reason codes of evaluate_batch, by integer code, and the decision each implies
+REASON_CODES = (
+    "LOW_CREDIT_SCORE",
+    "PRE_APPROVED",
+    "SALARY_VERIFICATION_REQUIRED",
+    "APPROVED_WITH_SALARY_VERIFICATION",
+    "HIGH_EMI_TO_SALARY_RATIO",
+    "AMOUNT_EXCEEDS_LIMIT"
+)
+REASON_DECISIONS = (
+    LoanDecision.REJECTED,
+    LoanDecision.APPROVED,
+    LoanDecision.CONDITIONAL,
+    LoanDecision.APPROVED,
+    LoanDecision.REJECTED,
+    LoanDecision.REJECTED
+)
+LOW_CREDIT_SCORE, PRE_APPROVED, SALARY_VERIFICATION_REQUIRED, \
+    APPROVED_WITH_SALARY_VERIFICATION, HIGH_EMI_TO_SALARY_RATIO, AMOUNT_EXCEEDS_LIMIT = range(len(REASON_CODES))
+
+
+class BatchEvaluation:
+    """
+    Underwriting results for many applications, held as columns
+    
+    'reason' is an int8 array of indices into REASON_CODES; decisions, labels
+    and messages are derived from it on demand.
+    """
+    
+    def __init__(self, reason: np.ndarray, emi: np.ndarray, emi_ratio: np.ndarray,
+                 amount: np.ndarray, tenure: np.ndarray, salary: np.ndarray, policy_version: str):
+        self.policy_version = policy_version  # Underwriting policy every row was decided under
+        self.reason = reason
+        self.emi = emi  # NaN where the EMI check did not apply
+        self.emi_ratio = emi_ratio  # NaN where the EMI check did not apply
+        self.amount = amount
+        self.tenure = tenure
+        self.salary = salary
+    
+    def __len__(self) -> int:
+        return len(self.reason)
+    
+    @property
+    def approved(self) -> np.ndarray:
+        """Boolean mask of approved applications"""
+        return (self.reason == PRE_APPROVED) | (self.reason == APPROVED_WITH_SALARY_VERIFICATION)
+    
+    def decisions(self) -> np.ndarray:
+        """LoanDecision value of each application"""
+        return np.array([decision.value for decision in REASON_DECISIONS])[self.reason]
+    
+    def reason_codes(self) -> np.ndarray:
+        """Reason code string of each application"""
+        return np.array(REASON_CODES)[self.reason]
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of applications per reason code"""
+        return dict(zip(REASON_CODES, np.bincount(self.reason, minlength=len(REASON_CODES)).tolist()))
+    
+    def evaluation(self, i: int, customer: Customer) -> dict:
+        """
+        Full evaluate_loan result, message included, for one application
+        
+        Messages are only built when asked for, by running the single-customer
+        path on that row, so they are exactly what the chat would have shown.
+        
+        Args:
+            i: Row index
+            customer: Customer profile of that row (supplies the name)
+            
+        Returns:
+            Same dictionary as UnderwritingAgent.evaluate_loan
+        """
+        salary = None if np.isnan(self.salary[i]) else float(self.salary[i])
+        return underwriting_agent.evaluate_loan(customer, float(self.amount[i]), int(self.tenure[i]), salary)
+
+
 class UnderwritingAgent:
     """
     Underwriting Agent responsible for:
@@ -19,7 +100,7 @@ class UnderwritingAgent:
         """
         Evaluate loan application based on underwriting rules
         
-        Rules:
+        Rules (thresholds from the current underwriting policy, defaults shown):
         1. Credit score < 700 → Reject
         2. Amount ≤ pre-approved limit → Instant Approval
         3. Amount ≤ 2× pre-approved limit:
@@ -34,15 +115,24 @@ class UnderwritingAgent:
             parsed_salary: Parsed salary from slip (if uploaded)
             
         Returns:
-            Dictionary with decision, reason, and reason code
+            Dictionary with decision, reason, reason code and the
+            'policy_version' it was made under
         """
+        policy = policy_store.get()
+        evaluation = self._evaluate(policy, customer, requested_amount, tenure, parsed_salary)
+        evaluation["policy_version"] = policy.version
+        return evaluation
+    
+    def _evaluate(self, policy: UnderwritingPolicy, customer: Customer, requested_amount: float,
+                  tenure: int, parsed_salary: Optional[float]) -> dict:
+        """Apply the rules of evaluate_loan under one policy"""
         # Rule 1: Check credit score
-        if customer.credit_score < config.MIN_CREDIT_SCORE:
+        if customer.credit_score < policy.min_credit_score:
             return {
                 "decision": LoanDecision.REJECTED,
-                "reason": f"Your credit score ({customer.credit_score}) is below our minimum requirement of {config.MIN_CREDIT_SCORE}.",
+                "reason": f"Your credit score ({customer.credit_score}) is below our minimum requirement of {policy.min_credit_score}.",
                 "reason_code": "LOW_CREDIT_SCORE",
-                "message": self._craft_rejection_message(customer, "credit_score")
+                "message": self._craft_rejection_message(customer, "credit_score", policy.min_credit_score)
             }
         
         # Rule 2: Check if within pre-approved limit
@@ -55,7 +145,8 @@ class UnderwritingAgent:
             }
         
         # Rule 3: Check if within 2x pre-approved limit
-        if requested_amount <= customer.pre_approved_limit * config.PRE_APPROVED_MULTIPLIER:
+        max_eligible = policy.max_eligible_amount(customer.pre_approved_limit)
+        if requested_amount <= max_eligible:
             # Need salary verification
             if parsed_salary is None:
                 return {
@@ -66,12 +157,11 @@ class UnderwritingAgent:
                 }
             
             # Check EMI to salary ratio
-            from utils.emi_calculator import get_interest_rate
-            interest_rate = get_interest_rate(customer.credit_score)
+            interest_rate = policy.interest_rate(customer.credit_score)
             emi = calculate_emi(requested_amount, interest_rate, tenure)
             emi_ratio = emi / parsed_salary
             
-            if emi_ratio <= config.MAX_EMI_TO_SALARY_RATIO:
+            if emi_ratio <= policy.max_emi_to_salary_ratio:
                 return {
                     "decision": LoanDecision.APPROVED,
                     "reason": f"EMI (₹{emi:,.2f}) is {emi_ratio*100:.1f}% of salary, within acceptable limit.",
@@ -80,23 +170,153 @@ class UnderwritingAgent:
                     "message": self._craft_approval_message(customer, requested_amount, tenure, emi_ratio)
                 }
             else:
+                counter_offer = self.counter_offer(customer, requested_amount, tenure, parsed_salary, policy)
                 return {
                     "decision": LoanDecision.REJECTED,
-                    "reason": f"EMI (₹{emi:,.2f}) is {emi_ratio*100:.1f}% of your salary, exceeding our maximum limit of {config.MAX_EMI_TO_SALARY_RATIO*100}%.",
+                    "reason": f"EMI (₹{emi:,.2f}) is {emi_ratio*100:.1f}% of your salary, exceeding our maximum limit of {policy.max_emi_to_salary_ratio*100}%.",
                     "reason_code": "HIGH_EMI_TO_SALARY_RATIO",
                     "emi_ratio": emi_ratio,
-                    "message": self._craft_rejection_message(customer, "emi_ratio", emi, parsed_salary, emi_ratio)
+                    "counter_offer": counter_offer,
+                    "message": self._craft_rejection_message(customer, "emi_ratio", emi, parsed_salary, emi_ratio,
+                                                             policy.max_emi_to_salary_ratio, counter_offer)
                 }
         
         # Rule 4: Amount exceeds 2x pre-approved limit
         else:
+            counter_offer = self.counter_offer(customer, requested_amount, tenure, parsed_salary, policy)
             return {
                 "decision": LoanDecision.REJECTED,
-                "reason": f"Requested amount (₹{requested_amount:,.0f}) exceeds maximum eligible amount (₹{customer.pre_approved_limit * config.PRE_APPROVED_MULTIPLIER:,.0f}).",
+                "reason": f"Requested amount (₹{requested_amount:,.0f}) exceeds maximum eligible amount (₹{max_eligible:,.0f}).",
                 "reason_code": "AMOUNT_EXCEEDS_LIMIT",
-                "message": self._craft_rejection_message(customer, "amount_exceeded", requested_amount, customer.pre_approved_limit * config.PRE_APPROVED_MULTIPLIER)
+                "counter_offer": counter_offer,
+                "message": self._craft_rejection_message(customer, "amount_exceeded", requested_amount, max_eligible, counter_offer)
             }
     
+    def evaluate_batch(self, credit_scores: Sequence[int], pre_approved_limits: Sequence[float],
+                       salaries: Sequence[float], amounts: Sequence[float],
+                       tenures: Sequence[int]) -> BatchEvaluation:
+        """
+        Evaluate many applications at once with the rules of evaluate_loan
+        
+        Each rule is a boolean mask over whole columns, and the EMI is only
+        computed for rows that reach the salary check. No messages are built
+        (see BatchEvaluation.evaluation).
+        
+        Args:
+            credit_scores: Credit score per application
+            pre_approved_limits: Pre-approved limit per application
+            salaries: Verified monthly salary per application (NaN if no slip)
+            amounts: Requested amount per application
+            tenures: Tenure in months per application
+            
+        Returns:
+            BatchEvaluation with a reason code per application
+        """
+        policy = policy_store.get()
+        credit_score = np.asarray(credit_scores)
+        limit = np.asarray(pre_approved_limits, dtype=float)
+        salary = np.asarray(salaries, dtype=float)
+        amount = np.asarray(amounts, dtype=float)
+        tenure = np.asarray(tenures)
+        
+        reason = np.full(len(amount), AMOUNT_EXCEEDS_LIMIT, dtype=np.int8)
+        emi = np.full(len(amount), np.nan)
+        emi_ratio = np.full(len(amount), np.nan)
+        
+        # Rules 1-4, most specific first so earlier rules win
+        eligible = credit_score >= policy.min_credit_score
+        pre_approved = eligible & (amount <= limit)
+        within_multiple = eligible & ~pre_approved & (amount <= limit * policy.pre_approved_multiplier)
+        needs_slip = within_multiple & np.isnan(salary)
+        salary_check = within_multiple & ~needs_slip
+        
+        # EMI for the rows that reach the salary check (same rounding as calculate_emi)
+        rows = np.flatnonzero(salary_check)
+        monthly_rate = policy.interest_rates(credit_score[rows]) / 12 / 100
+        principal, months = amount[rows], tenure[rows]
+        growth = (1 + monthly_rate) ** months
+        with np.errstate(divide="ignore", invalid="ignore"):
+            row_emi = np.round(principal * (monthly_rate * growth / (growth - 1)), 2)
+            row_emi = np.where((principal > 0) & (months > 0), row_emi, 0.0)
+            emi[rows] = row_emi
+            emi_ratio[rows] = row_emi / salary[rows]
+        affordable = emi_ratio <= policy.max_emi_to_salary_ratio  # False for NaN
+        
+        reason[~eligible] = LOW_CREDIT_SCORE
+        reason[pre_approved] = PRE_APPROVED
+        reason[needs_slip] = SALARY_VERIFICATION_REQUIRED
+        reason[salary_check & affordable] = APPROVED_WITH_SALARY_VERIFICATION
+        reason[salary_check & ~affordable] = HIGH_EMI_TO_SALARY_RATIO
+        
+        return BatchEvaluation(reason, emi, emi_ratio, amount, tenure, salary, policy.version)
+    
+    def counter_offer(self, customer: Customer, requested_amount: float, tenure: int,
+                      monthly_salary: Optional[float],
+                      policy: Optional[UnderwritingPolicy] = None) -> Optional[dict]:
+        """
+        Closest offer that passes underwriting
+        
+        Without a verified salary only the pre-approved limit can be approved,
+        so the requested amount is capped there. With one, it is capped at the
+        maximum eligible amount and the tenure is lengthened as little as
+        needed to bring the EMI within the policy's EMI-to-salary limit; if no
+        tenure option is long enough, the largest amount that passes at the
+        longest tenure is offered. Amounts up to the pre-approved limit always
+        pass, whatever the EMI.
+        
+        Args:
+            customer: Customer profile
+            requested_amount: Requested loan amount
+            tenure: Requested tenure in months
+            monthly_salary: Salary from the uploaded slip, the one underwriting
+                checks the EMI against (None: no slip yet)
+            policy: Underwriting policy (defaults to the current one)
+            
+        Returns:
+            Dictionary with 'amount', 'tenure', 'interest_rate', 'emi',
+            'emi_ratio' and 'max_amount_by_tenure' (largest affordable amount
+            for each tenure option), or None if nothing can be offered
+        """
+        policy = policy or policy_store.get()
+        interest_rate = policy.interest_rate(customer.credit_score)
+        limit = float(customer.pre_approved_limit)
+        max_amount = policy.max_eligible_amount(limit) if monthly_salary else limit
+        max_emi = monthly_salary * policy.max_emi_to_salary_ratio if monthly_salary else float("inf")
+        options = sorted(config.TENURE_OPTIONS)
+        
+        # Largest amount that passes per tenure option, in one pass
+        if monthly_salary:
+            by_tenure = max_principal(max_emi, interest_rate, options)
+            step = config.COUNTER_OFFER_AMOUNT_STEP
+            by_tenure = np.clip(np.floor(by_tenure / step) * step, limit, max_amount)
+        else:
+            by_tenure = np.full(len(options), max_amount)
+        max_amount_by_tenure = dict(zip(options, by_tenure.tolist()))
+        
+        amount = float(min(requested_amount, max_amount))
+        longer_options = [option for option in options if option >= tenure] or options[-1:]
+        if amount <= limit:
+            offer_tenure = longer_options[0]
+        else:
+            offer_tenure = min_tenure_option(amount, interest_rate, max_emi, longer_options)
+        if offer_tenure is None:
+            # Confirm the quoted (paise-rounded) EMI still fits at the longest tenure
+            amount = min(max(max_affordable_amount(max_emi, interest_rate, options[-1]), limit), max_amount)
+            max_amount_by_tenure[options[-1]] = amount
+            offer_tenure = longer_options[0] if amount <= limit else options[-1]
+        if amount <= 0:
+            return None
+        
+        emi = calculate_emi(amount, interest_rate, offer_tenure)
+        return {
+            "amount": amount,
+            "tenure": offer_tenure,
+            "interest_rate": interest_rate,
+            "emi": emi,
+            "emi_ratio": emi / monthly_salary if monthly_salary else None,
+            "max_amount_by_tenure": max_amount_by_tenure
+        }
+    
     def _craft_approval_message(self, customer: Customer, amount: float, 
                                tenure: int, emi_ratio: float = None) -> str:
         """Craft approval message"""
@@ -124,6 +344,7 @@ You're just one step away from getting your funds. Let me generate your sanction
         """Craft rejection message"""
         
         if reason_type == "credit_score":
+            min_credit_score, = args
             message = f"""
 😔 **Loan Application Status: Not Approved**
 
@@ -131,7 +352,7 @@ Dear {customer.name},
 
 Unfortunately, we're unable to approve your loan application at this time.
 
-**Reason:** Your credit score ({customer.credit_score}) is below our minimum requirement of {config.MIN_CREDIT_SCORE}.
+**Reason:** Your credit score ({customer.credit_score}) is below our minimum requirement of {min_credit_score}.
 
 **💡 What you can do:**
 • Work on improving your credit score by:
@@ -144,7 +365,14 @@ We're here to help you in your financial journey. For any queries, contact us at
 """.strip()
         
         elif reason_type == "emi_ratio":
-            emi, salary, ratio = args
+            emi, salary, ratio, max_ratio, counter_offer = args
+            if counter_offer:
+                suggestions = self._counter_offer_text(counter_offer)
+            else:
+                suggestions = """**💡 Suggestions:**
+• Consider a lower loan amount
+• Choose a longer tenure to reduce EMI
+• You can reapply with updated income documents"""
             message = f"""
 😔 **Loan Application Status: Not Approved**
 
@@ -152,18 +380,25 @@ Dear {customer.name},
 
 After careful evaluation, we're unable to approve your loan application.
 
-**Reason:** The monthly EMI (₹{emi:,.2f}) would be {ratio*100:.1f}% of your monthly salary (₹{salary:,.2f}), which exceeds our safe lending limit of {config.MAX_EMI_TO_SALARY_RATIO*100}%.
+**Reason:** The monthly EMI (₹{emi:,.2f}) would be {ratio*100:.1f}% of your monthly salary (₹{salary:,.2f}), which exceeds our safe lending limit of {max_ratio*100}%.
 
-**💡 Suggestions:**
-• Consider a lower loan amount
-• Choose a longer tenure to reduce EMI
-• You can reapply with updated income documents
+{suggestions}
 
 For assistance, contact us at 1800-123-4567.
 """.strip()
         
         elif reason_type == "amount_exceeded":
-            requested, max_eligible = args
+            requested, max_eligible, counter_offer = args
+            if counter_offer:
+                options = self._counter_offer_text(counter_offer)
+                if counter_offer['amount'] < max_eligible and counter_offer['emi_ratio'] is None:
+                    # Sized to the pre-approved limit because no salary slip has been verified
+                    options += (f"\n\nAmounts above your pre-approved limit of ₹{customer.pre_approved_limit:,.0f} "
+                                f"(up to ₹{max_eligible:,.0f}) need salary slip verification.")
+            else:
+                options = f"""**💡 Options:**
+• Apply for ₹{max_eligible:,.0f} or less
+• Build your credit history and reapply later"""
             message = f"""
 😔 **Loan Application Status: Not Approved**
 
@@ -174,9 +409,7 @@ We're unable to approve the requested loan amount.
 **Requested Amount:** ₹{requested:,.0f}
 **Maximum Eligible Amount:** ₹{max_eligible:,.0f}
 
-**💡 Options:**
-• Apply for ₹{max_eligible:,.0f} or less
-• Build your credit history and reapply later
+{options}
 
 We appreciate your interest. Contact us at 1800-123-4567 for more information.
 """.strip()
@@ -186,6 +419,17 @@ We appreciate your interest. Contact us at 1800-123-4567 for more information.
         
         return message
     
+    def _counter_offer_text(self, counter_offer: dict) -> str:
+        """Describe a counter-offer and how to accept it"""
+        ratio = counter_offer['emi_ratio']
+        ratio_text = f" ({ratio*100:.1f}% of your salary)" if ratio else ""
+        return f"""**💡 Here's what we can offer you instead:**
+• **Loan Amount:** ₹{counter_offer['amount']:,.0f}
+• **Tenure:** {counter_offer['tenure']} months
+• **Monthly EMI:** ₹{counter_offer['emi']:,.2f}{ratio_text}
+
+Type **'yes'** to go ahead with this offer."""
+    
     def _craft_conditional_message(self, customer: Customer, amount: float) -> str:
         """Craft message for conditional approval"""
         
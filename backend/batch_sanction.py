@@ -0,0 +1,269 @@
+"""
+Batch sanction letter (re-)issuance for the back office
+
+Reads a JSONL manifest, one approved application per line, using the same
+fields as the /api/generate-sanction-letter request:
+
+    {"application_id": "APP001", "customer_name": "Rakesh Kumar",
+     "customer_email": "...", "customer_phone": "...", "customer_address": "...",
+     "loan_amount": 400000, "interest_rate": 10.5, "tenure": 48, "emi": 10151.47,
+     "processing_fee": 8000, "sanction_id": "SAN...", "issue_date": "2025-01-15"}
+
+sanction_id, processing_fee and issue_date are optional (the sanction ID
+defaults to the application ID, the fee to the current offer catalogue's
+processing fee and the date to today).
+Give issue_date if a re-run should resume: it is part of each letter's
+cache key, so without it the key changes the next day and every letter
+renders again.
+
+Letters are rendered in parallel worker processes and stored in the sanction
+artifact store (atomic writes, indexed by sanction / application ID), so
+downloads pick up re-issued letters immediately. Letters are named by a hash
+of their inputs and renderer version (a per-sanction cache key): re-running
+the same manifest skips everything already rendered, which makes an
+interrupted run resumable. After a wording change, bump the renderer's
+version (TEMPLATE_VERSION for the platypus layout) and every letter
+renders again.
+
+Usage:
+    python batch_sanction.py manifest.jsonl --workers 4
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+from mocks.offer_mart import offer_catalogue_store
+from sanction_artifacts import sanction_artifacts, write_atomic
+
+
+class ManifestError(ValueError):
+    """Raised for a manifest line that cannot be turned into a letter"""
+
+
+def load_manifest(manifest_path: Path) -> Iterator[Tuple[int, str]]:
+    """
+    Read manifest lines
+
+    Args:
+        manifest_path: JSONL file
+
+    Yields:
+        (line number, line) for each non-blank line
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                yield line_no, line
+
+
+def parse_entry(line: str) -> dict:
+    """
+    Decode one manifest line
+
+    Raises:
+        ManifestError: If the line is not a JSON object
+    """
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ManifestError(f"{type(e).__name__}: {e}") from e
+    if not isinstance(entry, dict):
+        raise ManifestError(f"expected a JSON object, got {type(entry).__name__}")
+    return entry
+
+
+def letter_inputs(entry: dict) -> Tuple[str, dict, dict, dict]:
+    """
+    Turn a manifest entry into generator inputs
+
+    Args:
+        entry: Manifest entry
+
+    Returns:
+        (sanction_id, application_data, customer_data, loan_details)
+
+    Raises:
+        ManifestError: If a required field is missing or malformed
+    """
+    try:
+        application_id = str(entry["application_id"])
+        sanction_id = str(entry.get("sanction_id") or application_id)
+        issue_date = date.fromisoformat(entry["issue_date"]) if entry.get("issue_date") else date.today()
+        amount = float(entry["loan_amount"])
+
+        application_data = {
+            'application_id': sanction_id,
+            'sanction_letter_no': f'SL/2025/{sanction_id}',
+            'issue_date': datetime.combine(issue_date, datetime.min.time())
+        }
+        customer_data = {
+            'name': entry["customer_name"],
+            'email': entry.get("customer_email") or 'N/A',
+            'phone': entry.get("customer_phone") or 'N/A',
+            'address': entry.get("customer_address") or 'N/A'
+        }
+        loan_details = {
+            'amount': amount,
+            'interest_rate': float(entry["interest_rate"]),
+            'tenure': int(entry["tenure"]),
+            'emi': float(entry["emi"]),
+            'processing_fee': (float(entry["processing_fee"]) if entry.get("processing_fee") is not None
+                               else offer_catalogue_store.get().processing_fee(amount))
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        raise ManifestError(f"{type(e).__name__}: {e}") from e
+    return sanction_id, application_data, customer_data, loan_details
+
+
+def _warm_worker():
+    """Worker initializer: import ReportLab and compile the letter template"""
+    from utils.letter_renderer import get_letter_renderer
+    get_letter_renderer().warm()
+
+
+def _ping() -> bool:
+    """No-op task used to start every worker before timing"""
+    return True
+
+
+def _render_to_file(object_path: str, application_data: dict, customer_data: dict,
+                    loan_details: dict) -> Tuple[int, float]:
+    """Worker: render one letter straight to its object path, return (size, seconds)"""
+    from utils.sanction_letter_generator import SanctionLetterGenerator
+
+    started = time.perf_counter()
+    pdf_bytes = SanctionLetterGenerator().generate_sanction_letter(
+        application_data=application_data,
+        customer_data=customer_data,
+        loan_details=loan_details
+    )
+    write_atomic(Path(object_path), pdf_bytes)
+    return len(pdf_bytes), time.perf_counter() - started
+
+
+def _percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def run_batch(manifest_path: Path, workers: Optional[int] = None, force: bool = False) -> Dict:
+    """
+    Render every letter in a manifest
+
+    Args:
+        manifest_path: JSONL manifest
+        workers: Worker processes (defaults to the CPU count)
+        force: Re-render letters that already exist
+
+    Returns:
+        Report with counts ('rendered', 'skipped', 'failed'), 'errors'
+        (line number -> message), 'elapsed_seconds', 'letters_per_second'
+        and per-letter render latency percentiles in milliseconds
+    """
+    workers = workers or os.cpu_count() or 1
+    report = {"rendered": 0, "skipped": 0, "failed": 0, "errors": {}}
+    latencies = []
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_warm_worker) as pool:
+        # Start and warm every worker first so throughput reflects rendering only
+        for future in [pool.submit(_ping) for _ in range(workers)]:
+            future.result()
+        started = time.perf_counter()
+        futures = {}
+        for line_no, line in load_manifest(manifest_path):
+            try:
+                entry = parse_entry(line)
+                sanction_id, application_data, customer_data, loan_details = letter_inputs(entry)
+            except ManifestError as e:
+                report["failed"] += 1
+                report["errors"][line_no] = str(e)
+                continue
+
+            digest = sanction_artifacts.digest(application_data, customer_data, loan_details)
+            link = (digest, sanction_id, str(entry["application_id"]))
+            if not force and sanction_artifacts.exists(digest):
+                _link(*link)
+                report["skipped"] += 1
+                continue
+
+            future = pool.submit(_render_to_file, str(sanction_artifacts.object_path(digest)),
+                                 application_data, customer_data, loan_details)
+            futures[future] = (line_no, link)
+
+        for future in as_completed(futures):
+            line_no, link = futures[future]
+            try:
+                size, seconds = future.result()
+            except Exception as e:
+                report["failed"] += 1
+                report["errors"][line_no] = f"{type(e).__name__}: {e}"
+                continue
+            _link(*link)
+            latencies.append(seconds * 1000)
+            report["rendered"] += 1
+            if report["rendered"] % 100 == 0:
+                print(f"[Batch Sanction] {report['rendered']} letters rendered...")
+
+    elapsed = time.perf_counter() - started
+    report.update({
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "letters_per_second": round(report["rendered"] / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 2),
+            "p95": round(_percentile(latencies, 95), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+            "max": round(max(latencies), 2) if latencies else 0.0
+        }
+    })
+    return report
+
+
+def _link(digest: str, sanction_id: str, application_id: str):
+    """
+    Index a letter, keeping the session it was first issued in
+
+    The previous letter is found by sanction ID, or by application ID when
+    the manifest left the sanction ID to default.
+    """
+    previous = sanction_artifacts.lookup(sanction_id=sanction_id, application_id=application_id)
+    session_id = previous["session_id"] if previous else None
+    sanction_artifacts.link(digest, sanction_id, application_id, session_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch sanction letter (re-)issuance")
+    parser.add_argument("manifest", type=Path, help="JSONL manifest of approved applications")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render letters that already exist")
+    args = parser.parse_args()
+
+    report = run_batch(args.manifest, workers=args.workers, force=args.force)
+
+    print()
+    print("=" * 60)
+    print(f"Rendered {report['rendered']}, skipped {report['skipped']} (already issued), "
+          f"failed {report['failed']}")
+    print(f"{report['letters_per_second']} letters/s with {report['workers']} worker(s) "
+          f"in {report['elapsed_seconds']}s")
+    latency = report["latency_ms"]
+    print(f"Per-letter render: p50={latency['p50']} ms  p95={latency['p95']} ms  "
+          f"p99={latency['p99']} ms  max={latency['max']} ms")
+    for line_no, error in sorted(report["errors"].items()):
+        print(f"  line {line_no}: {error}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
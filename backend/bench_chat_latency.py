@@ -0,0 +1,118 @@
+"""
+Chat latency benchmark under mixed load
+
+Runs the FastAPI app in-process and drives two kinds of concurrent sessions:
+- light: quick conversational turns (phone lookup, offer, change tenure)
+- heavy: full applications that end in a sanction letter PDF build
+
+Reports p50/p99 latency per kind, plus event loop lag (how late a 10 ms
+ticker fires), which shows whether blocking work is stalling other users.
+
+Usage:
+    python bench_chat_latency.py --light 40 --heavy 8 --rounds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from main import app
+from utils.render_pool import render_pool
+
+PHONE = "9876543210"
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def timed_post(client, url, latencies, **kwargs):
+    """POST and record the latency in milliseconds"""
+    start = time.perf_counter()
+    response = await client.post(url, **kwargs)
+    latencies.append((time.perf_counter() - start) * 1000)
+    response.raise_for_status()
+    return response.json()
+
+
+async def light_session(client, rounds, latencies):
+    """Short turns that never leave the offer stage"""
+    session_id = (await timed_post(client, "/api/chat/start", latencies))["session_id"]
+    await timed_post(client, "/api/chat", latencies, json={"session_id": session_id, "message": PHONE})
+    await timed_post(client, "/api/chat", latencies,
+                     json={"session_id": session_id, "message": "I need 200000 for 24 months"})
+    for _ in range(rounds):
+        await timed_post(client, "/api/chat", latencies,
+                         json={"session_id": session_id, "message": "change tenure"})
+        await timed_post(client, "/api/chat", latencies,
+                         json={"session_id": session_id, "message": "36 months"})
+
+
+async def heavy_session(client, rounds, latencies):
+    """Full applications; the accepting turn builds the sanction letter"""
+    for _ in range(rounds):
+        session_id = (await client.post("/api/chat/start")).json()["session_id"]
+        for text in (PHONE, "I need 200000 for 24 months"):
+            await client.post("/api/chat", json={"session_id": session_id, "message": text})
+        await timed_post(client, "/api/chat", latencies, json={"session_id": session_id, "message": "yes"})
+
+
+async def measure_loop_lag(stop, lags, interval=0.01):
+    """Record how late a periodic timer fires"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def run(light, heavy, rounds):
+    """Run the mixed workload and print the report"""
+    light_latencies, heavy_latencies, lags = [], [], []
+    stop = asyncio.Event()
+    render_pool.start()  # As on app startup, so worker warm-up is not measured
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        ticker = asyncio.create_task(measure_loop_lag(stop, lags))
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(light_session(client, rounds, light_latencies) for _ in range(light)),
+            *(heavy_session(client, rounds, heavy_latencies) for _ in range(heavy))
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await ticker
+    render_pool.shutdown()
+
+    print()
+    print("=" * 60)
+    print(f"Mixed load: {light} light sessions, {heavy} heavy sessions, {rounds} rounds ({elapsed:.2f}s)")
+    print("=" * 60)
+    for name, samples in (("light turns", light_latencies), ("sanction turns", heavy_latencies),
+                          ("event loop lag", lags)):
+        if not samples:
+            continue
+        print(f"{name:<16} n={len(samples):<6} p50={percentile(samples, 50):8.1f} ms  "
+              f"p99={percentile(samples, 99):8.1f} ms  max={max(samples):8.1f} ms  "
+              f"mean={statistics.fmean(samples):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat latency benchmark under mixed load")
+    parser.add_argument("--light", type=int, default=40, help="Concurrent light sessions")
+    parser.add_argument("--heavy", type=int, default=8, help="Concurrent sanction-letter sessions")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per session")
+    args = parser.parse_args()
+    asyncio.run(run(args.light, args.heavy, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
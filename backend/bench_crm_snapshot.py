@@ -0,0 +1,93 @@
+"""
+CRM snapshot benchmark
+
+Loads a synthetic CRM export of --rows customers into the JSON-backed
+CRMService and into a columnar snapshot, and times startup and lookups for
+each. Lookups are checked to return the same customers.
+
+Usage:
+    python bench_crm_snapshot.py --rows 500000
+"""
+
+from pathlib import Path
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+
+from mocks.crm_service import CRMService
+from mocks.crm_snapshot import CRMSnapshotService, build_snapshot
+
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Chennai", "Pune", "Hyderabad", "Kolkata", "Ahmedabad"]
+
+
+def synthetic_export(rows: int, seed: int = 42) -> dict:
+    """CRM export in the mock_data.json layout"""
+    rng = random.Random(seed)
+    customers = []
+    for i in range(rows):
+        city = rng.choice(CITIES)
+        customers.append({
+            "id": f"CUST{i:08d}", "name": f"Customer {i}", "age": rng.randrange(21, 60), "city": city,
+            "phone": f"9{i:09d}", "email": f"customer{i}@example.com",
+            "credit_score": rng.randrange(600, 900), "monthly_salary": rng.randrange(20, 300) * 1000,
+            "current_loans": rng.randrange(0, 4), "pre_approved_limit": rng.randrange(1, 21) * 50000,
+            "kyc_status": "verified", "address": f"{i}, Main Road, {city}"
+        })
+    return {"customers": customers}
+
+
+def timed(label: str, load):
+    """Run a loader, printing wall time and peak Python allocations"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:9.3f}s  {peak / 1e6:10.1f} MB peak")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CRM snapshot benchmark")
+    parser.add_argument("--rows", type=int, default=500000, help="Customers in the export")
+    parser.add_argument("--lookups", type=int, default=20000, help="Phone lookups timed")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp())
+    export_path = workdir / "crm_export.json"
+    with open(export_path, "w") as f:
+        json.dump(synthetic_export(args.rows), f)
+
+    print("=" * 60)
+    print(f"CRM with {args.rows:,} customers")
+    print("=" * 60)
+
+    json_crm = timed("CRMService (JSON) startup", lambda: CRMService(export_path))
+    with open(export_path, "r") as f:
+        records = json.load(f)["customers"]
+    start = time.perf_counter()
+    build_snapshot(records, workdir / "snapshot", source=str(export_path))
+    print(f"{'snapshot build (one-off)':<28} {time.perf_counter() - start:9.3f}s")
+    del records
+    snapshot_crm = timed("CRMSnapshotService startup", lambda: CRMSnapshotService(workdir / "snapshot"))
+
+    rng = random.Random(7)
+    phones = [f"9{rng.randrange(args.rows):09d}" for _ in range(args.lookups)]
+    for label, crm in (("JSON", json_crm), ("snapshot", snapshot_crm)):
+        start = time.perf_counter()
+        for phone in phones:
+            crm.get_customer_by_phone(phone)
+        elapsed = time.perf_counter() - start
+        print(f"{'lookup by phone (' + label + ')':<28} {elapsed / len(phones) * 1e6:9.1f} us")
+
+    mismatches = sum(json_crm.get_customer_by_phone(p) != snapshot_crm.get_customer_by_phone(p) for p in phones[:2000])
+    mismatches += json_crm.get_customers_by_credit_score(880, 885) != snapshot_crm.get_customers_by_credit_score(880, 885)
+    print(f"Lookups differing between the two: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+EMI memoization benchmark
+
+Replays the EMI lookups of a stream of sessions (each quotes the offer,
+underwrites it and walks the tenure options) through calculate_emi, against
+the uncached formula, and checks that both quote the same EMI.
+
+Usage:
+    python bench_emi.py --sessions 20000
+"""
+
+import argparse
+import math
+import random
+import time
+
+from utils.emi_calculator import calculate_emi, emi_cache_stats
+from policy import policy_store
+import config
+
+
+def formula_emi(principal: float, annual_rate: float, tenure_months: int) -> float:
+    """EMI straight from the formula, without the factor table or cache"""
+    monthly_rate = annual_rate / 12 / 100
+    growth = math.pow(1 + monthly_rate, tenure_months)
+    return round(principal * monthly_rate * growth / (growth - 1), 2)
+
+
+def session_lookups(sessions: int, seed: int = 42):
+    """(amount, rate, tenure) lookups in the order a session makes them"""
+    rng = random.Random(seed)
+    policy = policy_store.get()
+    lookups = []
+    for _ in range(sessions):
+        rate = policy.interest_rate(rng.randrange(700, 900))
+        amount = rng.randrange(1, 41) * 25000.0
+        tenure = rng.choice(config.TENURE_OPTIONS)
+        lookups += [(amount, rate, tenure)] * 3  # Offer, underwriting, sanction letter
+        lookups += [(amount, rate, option) for option in config.TENURE_OPTIONS]  # Tenure change
+    return lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EMI memoization benchmark")
+    parser.add_argument("--sessions", type=int, default=20000, help="Sessions replayed")
+    args = parser.parse_args()
+
+    lookups = session_lookups(args.sessions)
+
+    print("=" * 60)
+    print(f"Replaying {len(lookups):,} EMI lookups from {args.sessions:,} sessions")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    expected = [formula_emi(*lookup) for lookup in lookups]
+    formula_elapsed = time.perf_counter() - start
+    print(f"{'formula':<28} {len(lookups) / formula_elapsed:14,.0f} lookups/s")
+
+    start = time.perf_counter()
+    quoted = [calculate_emi(*lookup) for lookup in lookups]
+    cached_elapsed = time.perf_counter() - start
+    print(f"{'calculate_emi (memoized)':<28} {len(lookups) / cached_elapsed:14,.0f} lookups/s")
+    print(f"Speedup: {formula_elapsed / cached_elapsed:.1f}x")
+
+    mismatches = sum(a != b for a, b in zip(expected, quoted))
+    print(f"EMIs differing from the formula: {mismatches}")
+    print()
+    for name, stats in emi_cache_stats().items():
+        print(f"  {name:<16} size {stats['size']:>7,}  hit rate {stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
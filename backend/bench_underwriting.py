@@ -0,0 +1,84 @@
+"""
+Bulk underwriting benchmark
+
+Times UnderwritingAgent.evaluate_batch on a synthetic pre-approval book
+against evaluate_loan one application at a time, and checks that both
+reach the same decision for a sample of rows.
+
+Usage:
+    python bench_underwriting.py --rows 2000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from agents.underwriting_agent import underwriting_agent, REASON_CODES
+from models import Customer
+import config
+
+
+def synthetic_book(rows: int, seed: int = 42):
+    """Random application columns (about a third without a salary slip)"""
+    rng = np.random.default_rng(seed)
+    credit_scores = rng.integers(600, 900, rows)
+    limits = rng.integers(1, 21, rows) * 50000.0
+    salaries = rng.integers(20, 300, rows) * 1000.0
+    salaries[rng.random(rows) < 0.33] = np.nan
+    amounts = limits * rng.uniform(0.2, 3.0, rows).round(2)
+    tenures = rng.choice(config.TENURE_OPTIONS, rows)
+    return credit_scores, limits, salaries, amounts, tenures
+
+
+def customer_for(credit_score, limit, salary) -> Customer:
+    """Customer profile carrying just the columns underwriting reads"""
+    return Customer(
+        id="BENCH", name="Bench Customer", age=30, city="Mumbai", phone="9999999999",
+        email="bench@example.com", credit_score=int(credit_score),
+        monthly_salary=0.0 if np.isnan(salary) else float(salary), current_loans=0,
+        pre_approved_limit=float(limit), kyc_status="verified", address="N/A"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk underwriting benchmark")
+    parser.add_argument("--rows", type=int, default=2000000, help="Applications in the batch")
+    parser.add_argument("--sample", type=int, default=5000, help="Rows evaluated one at a time")
+    args = parser.parse_args()
+
+    columns = synthetic_book(args.rows)
+    credit_scores, limits, salaries, amounts, tenures = columns
+
+    print("=" * 60)
+    print(f"Underwriting {args.rows:,} applications")
+    print("=" * 60)
+
+    underwriting_agent.evaluate_batch(*(column[:1000] for column in columns))  # Warm up
+    start = time.perf_counter()
+    result = underwriting_agent.evaluate_batch(*columns)
+    batch_elapsed = time.perf_counter() - start
+    print(f"{'evaluate_batch':<28} {args.rows / batch_elapsed:14,.0f} rows/s")
+
+    sample = min(args.sample, args.rows)
+    customers = [customer_for(credit_scores[i], limits[i], salaries[i]) for i in range(sample)]
+    start = time.perf_counter()
+    single = [
+        underwriting_agent.evaluate_loan(customers[i], float(amounts[i]), int(tenures[i]),
+                                         None if np.isnan(salaries[i]) else float(salaries[i]))
+        for i in range(sample)
+    ]
+    single_elapsed = time.perf_counter() - start
+    print(f"{'evaluate_loan per row':<28} {sample / single_elapsed:14,.0f} rows/s")
+    print(f"Speedup: {(args.rows / batch_elapsed) / (sample / single_elapsed):,.0f}x")
+
+    reason_codes = result.reason_codes()
+    mismatches = sum(single[i]["reason_code"] != reason_codes[i] for i in range(sample))
+    print(f"Decisions differing from evaluate_loan (first {sample:,} rows): {mismatches}")
+    print()
+    for code, count in result.counts().items():
+        print(f"  {code:<36} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,27 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Mock data path
 MOCK_DATA_PATH = BASE_DIR / "mock_data.json"
+# Columnar CRM snapshot built from a CRM export (python -m mocks.crm_snapshot);
+# when set, customers are read from it instead of MOCK_DATA_PATH
+CRM_SNAPSHOT_PATH = os.getenv("CRM_SNAPSHOT_PATH", "")
+
+# Read-through caches in front of the CRM and credit bureau
+CRM_CACHE_TTL_SECONDS = float(os.getenv("CRM_CACHE_TTL_SECONDS", "300"))  # Customer profiles
+CREDIT_BUREAU_CACHE_TTL_SECONDS = float(os.getenv("CREDIT_BUREAU_CACHE_TTL_SECONDS", "3600"))  # Credit scores
+NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", "30"))  # Phones / customers not found
+LOOKUP_CACHE_MAX_ENTRIES = 100000  # Per cache, least recently used dropped beyond this
+
+# Remote services (adapters package); empty URL uses the in-process mock
+CRM_SERVICE_URL = os.getenv("CRM_SERVICE_URL", "")
+CREDIT_BUREAU_SERVICE_URL = os.getenv("CREDIT_BUREAU_SERVICE_URL", "")
+OFFER_MART_SERVICE_URL = os.getenv("OFFER_MART_SERVICE_URL", "")
+SERVICE_TIMEOUT_SECONDS = float(os.getenv("SERVICE_TIMEOUT_SECONDS", "2.0"))  # Per attempt
+SERVICE_CONNECT_TIMEOUT_SECONDS = 0.5
+SERVICE_RETRIES = int(os.getenv("SERVICE_RETRIES", "2"))  # Extra attempts on timeouts, connect errors and 502-504
+SERVICE_RETRY_BACKOFF_SECONDS = 0.05  # Doubles per retry, with jitter
+SERVICE_MAX_CONNECTIONS = 100  # Per service
+SERVICE_MAX_KEEPALIVE_CONNECTIONS = 20
+SERVICE_KEEPALIVE_EXPIRY_SECONDS = 30.0
 
 # File upload settings
 UPLOAD_DIR = BASE_DIR / "uploads"
@@ -16,23 +37,65 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 # Sanction letter output - Secure storage for generated sanction letters
 SANCTION_DIR = BASE_DIR / "data" / "sanction_letters"
 SANCTION_DIR.mkdir(parents=True, exist_ok=True)
+SANCTION_OBJECTS_DIR = SANCTION_DIR / "objects"  # Rendered PDFs, named by the hash of their inputs
+SANCTION_INDEX_PATH = SANCTION_DIR / "index.db"  # sanction / application / session ID -> artifact
+
+# Session storage
+# "memory" keeps sessions in a process-local dict; "sqlite" persists them to a
+# shared WAL-mode database so they survive restarts and multiple workers
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory")
+SESSION_DB_PATH = Path(os.getenv("SESSION_DB_PATH", str(BASE_DIR / "data" / "sessions.db")))
+SESSION_FLUSH_INTERVAL = 0.05  # Seconds between write-behind flushes
+SESSION_FLUSH_BATCH_SIZE = 256  # Flush early once this many sessions are dirty
+
+SESSION_LOCK_STRIPES = 256  # Per-session request locks, shared by hashing the session ID
+
+# Session eviction
+SESSION_IDLE_TTL_SECONDS = int(os.getenv("SESSION_IDLE_TTL_SECONDS", "1800"))  # 30 minutes
+SESSION_CLOSED_TTL_SECONDS = int(os.getenv("SESSION_CLOSED_TTL_SECONDS", "300"))  # Finished conversations
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "10000"))  # Least recently used sessions are evicted beyond this
+
+# Conversation history
+HISTORY_BUFFER_SIZE = 20  # Recent turns kept in session memory
+HISTORY_ARCHIVE_DIR = BASE_DIR / "data" / "history"  # Older turns are appended here
+HISTORY_PAGE_SIZE = 50  # Default turns per page from GET /api/session
+HISTORY_MAX_PAGE_SIZE = 200
+
+# Blocking work offloaded from the event loop
+IO_EXECUTOR_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "16"))  # LLM / HTTP calls
+IO_EXECUTOR_MAX_PENDING = 64  # Running plus queued; further callers wait
+CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))  # PDF parse / build
+CPU_EXECUTOR_MAX_PENDING = 32
+
+# Sanction letter layout engine: "platypus" (flowable layout) or "canvas" (fixed positions, faster)
+SANCTION_RENDERER = os.getenv("SANCTION_RENDERER", "platypus")
+
+# Sanction letter rendering (separate worker processes; 0 renders in the CPU thread pool)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(2, os.cpu_count() or 1))))
+RENDER_MAX_PENDING = 32  # Renders running plus queued before new ones are refused (HTTP 503)
+RENDER_TIMEOUT_SECONDS = 30  # Caller gives up after this (HTTP 504)
 
 # Business rules
-MIN_CREDIT_SCORE = 700
-MAX_EMI_TO_SALARY_RATIO = 0.50  # 50%
-PRE_APPROVED_MULTIPLIER = 2  # Can request up to 2x pre-approved limit with salary slip
-
-# Interest rates (annual %)
-INTEREST_RATES = {
-    "excellent": 10.5,  # Credit score >= 800
-    "good": 11.5,       # Credit score >= 750
-    "fair": 12.5,       # Credit score >= 700
-    "default": 13.5
-}
+# The credit score cut-off, interest rate tiers, pre-approved multiplier and
+# EMI-to-salary limit are in the versioned underwriting policy file (policy.py)
+UNDERWRITING_POLICY_PATH = Path(os.getenv("UNDERWRITING_POLICY_PATH", str(BASE_DIR / "underwriting_policy.json")))
+POLICY_RELOAD_INTERVAL = 1.0  # Seconds between checks for an edited policy file
+COUNTER_OFFER_AMOUNT_STEP = 1000  # Counter-offer amounts are rounded down to this
+
+# Offer mart catalogue (processing fee, prepayment charges, features), versioned like the policy
+OFFER_CATALOGUE_PATH = Path(os.getenv("OFFER_CATALOGUE_PATH", str(BASE_DIR / "offer_catalogue.json")))
 
 # Tenure options (months)
 TENURE_OPTIONS = [12, 24, 36, 48, 60]
 
+# Offer grid (EMI for every tenure option across an amount ladder)
+OFFER_GRID_AMOUNT_STEP = 50000  # Ladder spacing, up to the largest amount a customer can apply for
+OFFER_GRID_CACHE_SIZE = 1024  # Grids kept (one per rate tier / salary / amount ceiling)
+
+# EMI memoization
+ANNUITY_FACTOR_CACHE_SIZE = 1024  # (rate, tenure) factors; one per rate tier and tenure option in practice
+EMI_CACHE_SIZE = int(os.getenv("EMI_CACHE_SIZE", "65536"))  # (amount, rate, tenure) EMIs
+
 # API settings
 API_HOST = "0.0.0.0"
 API_PORT = 8000
@@ -0,0 +1,81 @@
+"""Bounded thread pools for blocking work called from async endpoints"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+import asyncio
+import functools
+import config
+
+
+class BlockingExecutor:
+    """
+    Runs blocking calls (legacy HTTP clients, PDF parsing, PDF builds) off the event loop
+
+    The pool has a fixed number of threads, and a semaphore caps how many calls
+    may be running or queued at once. Callers beyond that wait on the event
+    loop instead of piling up in the pool's unbounded queue.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        """
+        Initialize executor
+
+        Args:
+            name: Name used for thread names and logs
+            max_workers: Number of worker threads
+            max_pending: Maximum calls running or queued in the pool
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        self._slots = asyncio.Semaphore(max_pending)
+        self._in_flight = 0
+        self._completed = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function in the pool and wait for its result
+
+        Args:
+            fn: Blocking function
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Whatever fn returns (exceptions propagate to the caller)
+        """
+        async with self._slots:
+            self._in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
+            finally:
+                self._in_flight -= 1
+                self._completed += 1
+
+    def get_stats(self) -> dict:
+        """
+        Get executor load
+
+        Returns:
+            Dictionary with pool size and call counters
+        """
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "completed": self._completed
+        }
+
+    def shutdown(self):
+        """Stop accepting work and wait for running calls to finish"""
+        self._pool.shutdown(wait=True)
+        print(f"[Executors] {self.name} pool shut down")
+
+
+# Singleton instances
+# Waiting on external services (LLM APIs over requests/httpx.Client)
+io_executor = BlockingExecutor("io", config.IO_EXECUTOR_WORKERS, config.IO_EXECUTOR_MAX_PENDING)
+# CPU-heavy work (PyPDF2 text extraction, ReportLab builds)
+cpu_executor = BlockingExecutor("cpu", config.CPU_EXECUTOR_WORKERS, config.CPU_EXECUTOR_MAX_PENDING)
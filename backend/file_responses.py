@@ -0,0 +1,145 @@
+"""File response with conditional GET, byte ranges and zero-copy sends"""
+
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+import os
+
+import anyio
+from fastapi.responses import FileResponse
+
+
+class ConditionalFileResponse(FileResponse):
+    """
+    FileResponse that honours If-None-Match / If-Modified-Since (304),
+    Range / If-Range (206, 416) and the ASGI zero-copy send extension
+
+    When the server offers "http.response.zerocopysend" the file descriptor
+    is handed to it (sendfile); otherwise the requested bytes are streamed
+    in chunks, as FileResponse does.
+    """
+
+    def __init__(self, path: str, request_headers: Mapping[str, str], etag: Optional[str] = None,
+                 stat_result: Optional[os.stat_result] = None, **kwargs):
+        """
+        Initialize response and evaluate the request's preconditions
+
+        Args:
+            path: File to send
+            request_headers: Incoming request headers
+            etag: Strong validator for the file (e.g. its content hash); the
+                mtime/size based tag from FileResponse is used when omitted
+            stat_result: os.stat of the file, if already known
+            **kwargs: Passed to FileResponse (media_type, filename, headers, ...)
+        """
+        stat_result = stat_result or os.stat(path)
+        super().__init__(path, stat_result=stat_result, **kwargs)
+        if etag:
+            self.headers["etag"] = f'"{etag}"'
+        self.headers["accept-ranges"] = "bytes"
+        self.size = stat_result.st_size
+        self.offset, self.count = 0, self.size
+
+        if self._not_modified(request_headers, stat_result):
+            self.status_code = 304
+            self.send_header_only = True
+            del self.headers["content-length"]
+            return
+
+        byte_range = self._requested_range(request_headers)
+        if byte_range == "unsatisfiable":
+            self.status_code = 416
+            self.send_header_only = True
+            self.headers["content-range"] = f"bytes */{self.size}"
+            self.headers["content-length"] = "0"
+        elif byte_range:
+            start, end = byte_range
+            self.status_code = 206
+            self.offset, self.count = start, end - start + 1
+            self.headers["content-range"] = f"bytes {start}-{end}/{self.size}"
+            self.headers["content-length"] = str(self.count)
+
+    def _not_modified(self, request_headers: Mapping[str, str], stat_result: os.stat_result) -> bool:
+        """Whether the client's cached copy is still current"""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            current = self.headers["etag"].removeprefix("W/")
+            return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _requested_range(self, request_headers: Mapping[str, str]):
+        """
+        Parse a single "bytes=" range
+
+        Returns:
+            (start, end) inclusive, "unsatisfiable", or None to send the whole file
+            (no Range, If-Range mismatch, or a multi-range request)
+        """
+        range_header = request_headers.get("range")
+        if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+            return None
+
+        if_range = request_headers.get("if-range")
+        if if_range and if_range.strip() not in (self.headers["etag"], self.headers["last-modified"]):
+            return None
+
+        start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+        try:
+            if not start_text:
+                # Suffix range: the last N bytes
+                length = int(end_text)
+                if length <= 0:
+                    return "unsatisfiable"
+                return max(0, self.size - length), self.size - 1
+            start = int(start_text)
+            end = int(end_text) if end_text else self.size - 1
+        except ValueError:
+            return None
+        if start >= self.size or end < start:
+            return "unsatisfiable"
+        return start, min(end, self.size - 1)
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers
+        })
+        if self.send_header_only or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False
+                })
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.offset)
+                remaining = self.count
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send({
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0
+                    })
+                if remaining > 0:
+                    # File shrank underneath us; close the body rather than hang
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
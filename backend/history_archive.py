@@ -0,0 +1,93 @@
+"""Append-only on-disk archive for conversation turns spilled out of memory"""
+
+from pathlib import Path
+from typing import Iterator, List, Optional
+import json
+import re
+import threading
+import config
+
+
+_SAFE_SESSION_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class HistoryArchive:
+    """
+    Stores older conversation turns as one JSON-lines file per session
+
+    Each line is a stored turn plus its absolute 'index' in the conversation,
+    so the archive and the in-memory buffer together form one sequence.
+    """
+
+    def __init__(self, archive_dir: Path):
+        """
+        Initialize archive
+
+        Args:
+            archive_dir: Directory holding the per-session log files
+        """
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, session_id: str) -> Path:
+        """Log file for a session (session IDs come from clients, so validate)"""
+        if not _SAFE_SESSION_ID.fullmatch(session_id):
+            raise ValueError(f"Invalid session ID: {session_id!r}")
+        return self.archive_dir / f"{session_id}.jsonl"
+
+    def append(self, session_id: str, first_index: int, turns: List[dict]):
+        """
+        Append turns to a session's log
+
+        Args:
+            session_id: Session ID
+            first_index: Absolute index of turns[0]
+            turns: Stored turns, oldest first
+        """
+        if not turns:
+            return
+        lines = "".join(
+            json.dumps({"index": first_index + i, **turn}, ensure_ascii=False, default=str) + "\n"
+            for i, turn in enumerate(turns)
+        )
+        with self._lock:
+            with open(self._path(session_id), "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def read(self, session_id: str, after: int = -1, limit: Optional[int] = None) -> Iterator[dict]:
+        """
+        Read archived turns in order
+
+        Args:
+            session_id: Session ID
+            after: Only return turns with index greater than this
+            limit: Maximum number of turns to return
+
+        Yields:
+            Stored turns including their 'index'
+        """
+        path = self._path(session_id)
+        if not path.exists() or limit == 0:
+            return
+        returned = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                turn = json.loads(line)
+                # Skips turns before the cursor, and any re-spilled after a write conflict
+                if turn["index"] <= after:
+                    continue
+                after = turn["index"]
+                yield turn
+                returned += 1
+                if limit is not None and returned >= limit:
+                    return
+
+    def delete(self, session_id: str):
+        """Remove a session's log"""
+        with self._lock:
+            self._path(session_id).unlink(missing_ok=True)
+
+
+# Singleton instance
+history_archive = HistoryArchive(config.HISTORY_ARCHIVE_DIR)
@@ -1,20 +1,32 @@
 """FastAPI main application"""
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
+from typing import Optional
+from datetime import date
+import asyncio
 import shutil
 import uuid
-import io
 
-from models import ChatMessage, ChatResponse
+from models import ChatMessage, ChatResponse, OfferDetails
 from master_agent import master_agent
-from memory_manager import memory_manager
+from memory_manager import memory_manager, SessionNotFoundError, SessionConflictError
+from executors import io_executor, cpu_executor
 from utils.salary_parser import parse_salary_slip, validate_salary_slip
-from utils.sanction_letter_generator import SanctionLetterGenerator
+from utils.render_pool import render_pool, RenderQueueFullError, RenderTimeoutError
+from utils.amortization import amortization_schedule
+from utils.emi_calculator import emi_cache_stats
+from utils.offer_grid import offer_grid_service
+from policy import policy_store
+from mocks.cache import cache_stats
+from mocks.offer_mart import offer_catalogue_store
+from adapters import ServiceUnavailableError, close_adapters
 from agents.verification_agent import verification_agent
+from agents.sanction_agent import sanction_agent
+from sanction_artifacts import sanction_artifacts
+from file_responses import ConditionalFileResponse
 import config
 
 # Create FastAPI app
@@ -33,6 +45,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+RENDER_BUSY_DETAIL = "Sanction letters are busy rendering, please retry shortly"
+RENDER_TIMEOUT_DETAIL = "Sanction letter took too long to render, please retry"
+SERVICE_UNAVAILABLE_DETAIL = "Customer records are temporarily unavailable, please retry shortly"
+
 # Mount static files for sanction letters
 app.mount("/sanctions", StaticFiles(directory=str(config.SANCTION_DIR)), name="sanctions")
 
@@ -59,8 +75,18 @@ async def chat(message: ChatMessage):
         ChatResponse from the master agent
     """
     try:
-        response = master_agent.process_message(message)
+        # Turns for the same session run one at a time; other sessions are unaffected
+        async with memory_manager.locks.lock(message.session_id):
+            response = await master_agent.process_message(message)
         return response
+    except SessionConflictError:
+        raise HTTPException(status_code=409, detail="Session was modified concurrently, please retry")
+    except RenderQueueFullError:
+        raise HTTPException(status_code=503, detail=RENDER_BUSY_DETAIL, headers={"Retry-After": "5"})
+    except RenderTimeoutError:
+        raise HTTPException(status_code=504, detail=RENDER_TIMEOUT_DETAIL)
+    except ServiceUnavailableError:
+        raise HTTPException(status_code=503, detail=SERVICE_UNAVAILABLE_DETAIL, headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -77,7 +103,7 @@ async def start_chat():
     
     # Get initial greeting
     initial_message = ChatMessage(session_id=session_id, message="start")
-    response = master_agent.process_message(initial_message)
+    response = await master_agent.process_message(initial_message)
     
     return {
         "session_id": session_id,
@@ -90,74 +116,75 @@ async def start_chat():
 async def upload_file(session_id: str, file: UploadFile = File(...)):
     """
     Handle file upload (salary slip)
-    
+
     Args:
         session_id: Chat session ID
         file: Uploaded file
-        
+
     Returns:
         Upload result with parsed salary
     """
     try:
-        # Get session memory
-        memory = memory_manager.get_session(session_id)
-        if not memory:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Validate file
-        file_size = 0
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        validation = verification_agent.validate_uploaded_file(file.filename, file_size)
-        if not validation['success']:
-            return {
-                "success": False,
-                "message": validation['message']
-            }
-        
-        # Save file
-        file_id = str(uuid.uuid4())
-        file_extension = Path(file.filename).suffix
-        saved_filename = f"{file_id}{file_extension}"
-        file_path = config.UPLOAD_DIR / saved_filename
-        
-        with open(file_path, 'wb') as f:
-            f.write(file_content)
-        
-        # Parse salary slip
-        parsed_result = parse_salary_slip(str(file_path))
-        
-        if parsed_result['success']:
-            parsed_data = parsed_result['parsed_data']
-            
-            # Check if employee name was extracted
-            employee_name = parsed_data.get('employee_name', None)
-            customer_name = memory.customer.name
-            
-            # Verify name match if we have the employee name from salary slip
-            if employee_name and employee_name != "Unknown":
-                print(f"[Upload] Verifying name match...")
-                print(f"[Upload] Customer: {customer_name}")
-                print(f"[Upload] Salary Slip: {employee_name}")
-                
-                from utils.name_verifier import verify_names_match
-                verification = verify_names_match(customer_name, employee_name)
-                
-                print(f"[Upload] Name verification result: {verification}")
-                
-                # If names don't match, reject the upload
-                # We reject if match is False, regardless of confidence
-                # The 'confidence' in the response represents how confident the AI is in its decision
-                if not verification['match']:
-                    print(f"[Upload] ❌ Name mismatch detected!")
-                    print(f"[Upload] Confidence in mismatch: {verification['confidence']}")
-                    
-                    # Mark that name verification failed
-                    memory_manager.update_context(session_id, 'name_mismatch_detected', True)
-                    memory_manager.update_context(session_id, 'awaiting_salary_slip', True)
-                    
-                    mismatch_message = f"""
+        # One request at a time per session (chat turns take the same lock)
+        async with memory_manager.locks.lock(session_id):
+            # Load the session once; everything below commits in a single write
+            with memory_manager.session(session_id) as session:
+                memory = session.memory
+
+                # Validate file
+                file_size = 0
+                file_content = await file.read()
+                file_size = len(file_content)
+
+                validation = verification_agent.validate_uploaded_file(file.filename, file_size)
+                if not validation['success']:
+                    return {
+                        "success": False,
+                        "message": validation['message']
+                    }
+
+                # Save file
+                file_id = str(uuid.uuid4())
+                file_extension = Path(file.filename).suffix
+                saved_filename = f"{file_id}{file_extension}"
+                file_path = config.UPLOAD_DIR / saved_filename
+
+                with open(file_path, 'wb') as f:
+                    f.write(file_content)
+
+                # Parse salary slip (PDF extraction plus an LLM call, so off the event loop)
+                parsed_result = await io_executor.run(parse_salary_slip, str(file_path))
+
+                if parsed_result['success']:
+                    parsed_data = parsed_result['parsed_data']
+
+                    # Check if employee name was extracted
+                    employee_name = parsed_data.get('employee_name', None)
+                    customer_name = memory.customer.name
+
+                    # Verify name match if we have the employee name from salary slip
+                    if employee_name and employee_name != "Unknown":
+                        print(f"[Upload] Verifying name match...")
+                        print(f"[Upload] Customer: {customer_name}")
+                        print(f"[Upload] Salary Slip: {employee_name}")
+
+                        from utils.name_verifier import verify_names_match
+                        verification = await io_executor.run(verify_names_match, customer_name, employee_name)
+
+                        print(f"[Upload] Name verification result: {verification}")
+
+                        # If names don't match, reject the upload
+                        # We reject if match is False, regardless of confidence
+                        # The 'confidence' in the response represents how confident the AI is in its decision
+                        if not verification['match']:
+                            print(f"[Upload] ❌ Name mismatch detected!")
+                            print(f"[Upload] Confidence in mismatch: {verification['confidence']}")
+
+                            # Mark that name verification failed
+                            session.update_context('name_mismatch_detected', True)
+                            session.update_context('awaiting_salary_slip', True)
+
+                            mismatch_message = f"""
 ❌ **Name Verification Failed**
 
 The name on the salary slip doesn't match your customer profile:
@@ -174,59 +201,96 @@ The name on the salary slip doesn't match your customer profile:
 
 Please respond with your choice.
 """.strip()
-                    
+
+                            return {
+                                "success": False,
+                                "message": mismatch_message,
+                                "name_mismatch": True,
+                                "customer_name": customer_name,
+                                "salary_slip_name": employee_name
+                            }
+
+                    # Name matches or no name extracted - proceed normally
+                    print(f"[Upload] ✅ Name verification passed")
+
+                    # Update application with parsed salary
+                    application = memory.application
+                    application.salary_slip_uploaded = True
+                    application.salary_slip_url = f"/uploads/{saved_filename}"
+                    application.parsed_salary = parsed_data['monthly_salary']
+                    session.set_application(application)
+
+                    # Update context
+                    session.update_context('awaiting_salary_slip', False)
+                    session.update_context('salary_verified', True)
+                    session.update_context('name_mismatch_detected', False)
+
+                    # Get confirmation message
+                    confirmation = verification_agent.confirm_salary_verification(
+                        application.parsed_salary,
+                        memory.customer.name
+                    )
+
+                    # Re-run underwriting with salary
+                    underwriting_response = await master_agent._process_underwriting(session)
+
+                    return {
+                        "success": True,
+                        "message": confirmation + "\n\n" + underwriting_response.message,
+                        "parsed_salary": application.parsed_salary,
+                        "stage": underwriting_response.stage,
+                        "metadata": underwriting_response.metadata
+                    }
+                else:
                     return {
                         "success": False,
-                        "message": mismatch_message,
-                        "name_mismatch": True,
-                        "customer_name": customer_name,
-                        "salary_slip_name": employee_name
+                        "message": "Failed to parse salary slip. Please upload a clear, readable PDF."
                     }
-            
-            # Name matches or no name extracted - proceed normally
-            print(f"[Upload] ✅ Name verification passed")
-            
-            # Update application with parsed salary
-            application = memory.application
-            application.salary_slip_uploaded = True
-            application.salary_slip_url = f"/uploads/{saved_filename}"
-            application.parsed_salary = parsed_data['monthly_salary']
-            memory_manager.set_application(session_id, application)
-            
-            # Update context
-            memory_manager.update_context(session_id, 'awaiting_salary_slip', False)
-            memory_manager.update_context(session_id, 'salary_verified', True)
-            memory_manager.update_context(session_id, 'name_mismatch_detected', False)
-            
-            # Get confirmation message
-            confirmation = verification_agent.confirm_salary_verification(
-                application.parsed_salary,
-                memory.customer.name
-            )
-            
-            # Re-run underwriting with salary
-            from master_agent import master_agent
-            underwriting_response = master_agent._process_underwriting(session_id, memory)
-            
-            return {
-                "success": True,
-                "message": confirmation + "\n\n" + underwriting_response.message,
-                "parsed_salary": application.parsed_salary,
-                "stage": underwriting_response.stage,
-                "metadata": underwriting_response.metadata
-            }
-        else:
-            return {
-                "success": False,
-                "message": "Failed to parse salary slip. Please upload a clear, readable PDF."
-            }
-    
+
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Session not found")
+    except SessionConflictError:
+        raise HTTPException(status_code=409, detail="Session was modified concurrently, please retry")
+    except RenderQueueFullError:
+        raise HTTPException(status_code=503, detail=RENDER_BUSY_DETAIL, headers={"Retry-After": "5"})
+    except RenderTimeoutError:
+        raise HTTPException(status_code=504, detail=RENDER_TIMEOUT_DETAIL)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def sanction_file_response(request: Request, path: Path, filename: str,
+                           digest: Optional[str] = None) -> ConditionalFileResponse:
+    """
+    Serve a sanction letter from disk with caching headers
+    
+    Args:
+        request: Incoming request (for If-None-Match / Range)
+        path: PDF file
+        filename: Download file name
+        digest: Artifact digest (per-sanction hash of the letter inputs and renderer),
+            used as a strong ETag
+        
+    Returns:
+        200, 206, 304 or 416 file response
+    """
+    return ConditionalFileResponse(
+        path=str(path),
+        request_headers=request.headers,
+        etag=digest,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            # Revalidate every time; unchanged letters cost a 304
+            "Cache-Control": "private, no-cache",
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Expose-Headers": "Content-Disposition, ETag, Content-Range"
+        }
+    )
+
+
 @app.get("/api/sanction/download/{sanction_id}")
-async def download_sanction(sanction_id: str):
+async def download_sanction(sanction_id: str, request: Request):
     """
     Download sanction letter PDF
     
@@ -236,20 +300,22 @@ async def download_sanction(sanction_id: str):
     Returns:
         PDF file
     """
-    file_path = config.SANCTION_DIR / f"sanction_{sanction_id}.pdf"
+    # Letters are stored by content hash; the index maps the ID to the object
+    artifact = sanction_artifacts.lookup(sanction_id=sanction_id, application_id=sanction_id)
+    if artifact:
+        return sanction_file_response(request, artifact['path'], f"sanction_{sanction_id}.pdf",
+                                      artifact['digest'])
     
+    # Letters written before the artifact store existed
+    file_path = config.SANCTION_DIR / f"sanction_{sanction_id}.pdf"
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Sanction letter not found")
     
-    return FileResponse(
-        path=str(file_path),
-        media_type="application/pdf",
-        filename=f"sanction_{sanction_id}.pdf"
-    )
+    return sanction_file_response(request, file_path, f"sanction_{sanction_id}.pdf")
 
 
 @app.get("/api/sanction/generate/{session_id}")
-async def generate_sanction_letter(session_id: str):
+async def generate_sanction_letter(session_id: str, request: Request):
     """
     Generate or retrieve sanction letter PDF for a session
     
@@ -257,122 +323,84 @@ async def generate_sanction_letter(session_id: str):
         session_id: Session ID
         
     Returns:
-        PDF file as streaming response
+        PDF file (rendered at most once per application)
     """
+    # Repeat downloads: an indexed letter means the loan was approved, so skip
+    # the session lock and load entirely
+    artifact = sanction_artifacts.lookup(session_id=session_id, application_id=session_id)
+    if artifact:
+        return sanction_file_response(request, artifact['path'], f"sanction_{artifact['sanction_id']}.pdf",
+                                      artifact['digest'])
+    
     try:
-        print(f"[Sanction] Request for sanction letter - session: {session_id}")
+        async with memory_manager.locks.lock(session_id):
+            print(f"[Sanction] Request for sanction letter - session: {session_id}")
         
-        # Get session memory
-        memory = memory_manager.get_session(session_id)
-        if not memory:
-            print(f"[Sanction] ERROR: Session not found: {session_id}")
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Check if application is approved
-        application = memory.application
-        if not application:
-            print(f"[Sanction] ERROR: No application found for session: {session_id}")
-            raise HTTPException(status_code=400, detail="No application found")
+            # Get session memory
+            with memory_manager.session(session_id) as session:
+                memory = session.memory
             
-        if not application.loan_approved:
-            print(f"[Sanction] ERROR: Loan not approved for session: {session_id}")
-            raise HTTPException(status_code=400, detail="Loan not approved yet")
-        
-        # Check if sanction letter already exists
-        if application.sanction_id:
-            sanction_filename = f"sanction_{application.sanction_id}.pdf"
-            sanction_path = config.SANCTION_DIR / sanction_filename
+                # Check if application is approved
+                application = memory.application
+                if not application:
+                    print(f"[Sanction] ERROR: No application found for session: {session_id}")
+                    raise HTTPException(status_code=400, detail="No application found")
+                
+                if not application.loan_approved:
+                    print(f"[Sanction] ERROR: Loan not approved for session: {session_id}")
+                    raise HTTPException(status_code=400, detail="Loan not approved yet")
             
-            if sanction_path.exists():
-                print(f"[Sanction] ✅ Reusing existing PDF: {sanction_path}")
+                # Serve the indexed letter if this application already has one
+                artifact = sanction_artifacts.lookup(
+                    sanction_id=application.sanction_id,
+                    application_id=application.application_id,
+                    session_id=session_id
+                )
                 
-                # Read existing PDF
-                with open(sanction_path, 'rb') as f:
-                    pdf_bytes = f.read()
+                if not artifact:
+                    print(f"[Sanction] No letter indexed for this application, rendering one...")
+                    
+                    offer = OfferDetails(
+                        amount=application.approved_amount,
+                        tenure=application.tenure,
+                        interest_rate=application.interest_rate or 10.5,
+                        emi=application.emi_amount,
+                        total_payable=amortization_schedule(application.approved_amount, application.interest_rate or 10.5,
+                                                            application.tenure, emi=application.emi_amount).total_payable
+                    )
+                    sanction_response = await sanction_agent.generate_sanction_letter(
+                        memory.customer, application, offer,
+                        sanction_agent.offer_catalogue(session.get_context('offer_terms')),
+                        session_id=session_id
+                    )
+                    
+                    # Update application with sanction info if not already set
+                    if not application.sanction_id:
+                        application.sanction_id = sanction_response.sanction_id
+                        application.sanction_letter_url = sanction_response.pdf_url
+                        session.set_application(application)
+                    
+                    artifact = sanction_artifacts.lookup(sanction_id=sanction_response.sanction_id)
                 
-                print(f"[Sanction] Returning existing PDF ({len(pdf_bytes)} bytes)")
+                sanction_filename = f"sanction_{artifact['sanction_id']}.pdf"
+                print(f"[Sanction] ✅ Returning {sanction_filename} ({artifact['size']} bytes, {artifact['digest'][:12]})")
                 
-                # Return existing file
-                return StreamingResponse(
-                    io.BytesIO(pdf_bytes),
-                    media_type="application/pdf",
-                    headers={
-                        "Content-Disposition": f"attachment; filename={sanction_filename}",
-                        "Access-Control-Allow-Origin": "*",
-                        "Access-Control-Expose-Headers": "Content-Disposition"
-                    }
-                )
-        
-        # If no existing PDF, generate a new one
-        print(f"[Sanction] No existing PDF found, generating new one...")
-        
-        # Initialize generator
-        generator = SanctionLetterGenerator()
-        
-        # Prepare application data
-        application_data = {
-            'application_id': application.application_id or session_id[:8].upper(),
-            'sanction_letter_no': f'SL/2025/{application.application_id or session_id[:8].upper()}'
-        }
-        
-        # Prepare customer data
-        customer = memory.customer
-        customer_data = {
-            'name': customer.name,
-            'email': customer.email or 'N/A',
-            'phone': customer.phone or 'N/A',
-            'address': customer.address or 'N/A'
-        }
-        
-        # Prepare loan details
-        loan_details = {
-            'amount': application.approved_amount,
-            'interest_rate': application.interest_rate or 10.5,
-            'tenure': application.tenure,
-            'emi': application.emi_amount,
-            'processing_fee': application.approved_amount * 0.02  # 2% processing fee
-        }
-        
-        print(f"[Sanction] Generating new PDF...")
-        print(f"[Sanction] Application ID: {application_data['application_id']}")
-        print(f"[Sanction] Customer: {customer_data['name']}")
-        print(f"[Sanction] Amount: Rs. {loan_details['amount']:,.2f}")
-        
-        # Generate PDF
-        pdf_bytes = generator.generate_sanction_letter(
-            application_data=application_data,
-            customer_data=customer_data,
-            loan_details=loan_details
-        )
-        
-        # Save to file (use application_id for consistency)
-        sanction_filename = f"sanction_{application_data['application_id']}.pdf"
-        sanction_path = config.SANCTION_DIR / sanction_filename
-        
-        print(f"[Sanction] Saving PDF to: {sanction_path}")
-        with open(sanction_path, 'wb') as f:
-            f.write(pdf_bytes)
-        print(f"[Sanction] PDF saved successfully")
-        
-        # Update application with sanction info if not already set
-        if not application.sanction_id:
-            application.sanction_id = application_data['application_id']
-            application.sanction_letter_url = f"/api/sanction/download/{application_data['application_id']}"
-            memory_manager.set_application(session_id, application)
-        
-        print(f"[Sanction] Returning new PDF ({len(pdf_bytes)} bytes)")
-        
-        # Return as downloadable file
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={sanction_filename}",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Expose-Headers": "Content-Disposition"
-            }
-        )
+                # Return as downloadable file
+                return sanction_file_response(request, artifact['path'], sanction_filename,
+                                              artifact['digest'])
         
+    except SessionNotFoundError:
+        print(f"[Sanction] ERROR: Session not found: {session_id}")
+        raise HTTPException(status_code=404, detail="Session not found")
+    except SessionConflictError:
+        print(f"[Sanction] ERROR: Concurrent update on session: {session_id}")
+        raise HTTPException(status_code=409, detail="Session was modified concurrently, please retry")
+    except RenderQueueFullError:
+        print(f"[Sanction] ERROR: Render pool saturated, session: {session_id}")
+        raise HTTPException(status_code=503, detail=RENDER_BUSY_DETAIL, headers={"Retry-After": "5"})
+    except RenderTimeoutError:
+        print(f"[Sanction] ERROR: Render timed out, session: {session_id}")
+        raise HTTPException(status_code=504, detail=RENDER_TIMEOUT_DETAIL)
     except HTTPException:
         raise
     except Exception as e:
@@ -382,15 +410,15 @@ async def generate_sanction_letter(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-
-
 @app.get("/api/session/{session_id}")
-async def get_session(session_id: str):
+async def get_session(session_id: str, after: int = -1, limit: int = config.HISTORY_PAGE_SIZE):
     """
-    Get session details
+    Get session details with a page of conversation history
     
     Args:
         session_id: Session ID
+        after: Return history turns with an index greater than this cursor
+        limit: Maximum number of history turns to return
         
     Returns:
         Session memory
@@ -399,24 +427,148 @@ async def get_session(session_id: str):
     if not memory:
         raise HTTPException(status_code=404, detail="Session not found")
     
+    limit = max(0, min(limit, config.HISTORY_MAX_PAGE_SIZE))
+    history = memory_manager.get_history(memory, after=after, limit=limit)
+    
     return {
         "session_id": memory.session_id,
+        "revision": memory.revision,
         "stage": memory.current_stage,
         "customer": memory.customer.dict() if memory.customer else None,
         "application": memory.application.dict() if memory.application else None,
-        "conversation_history": memory.conversation_history
+        "conversation_history": history,
+        "history_length": memory.history_offset + len(memory.conversation_history),
+        "next_after": history[-1]["index"] if history else after
+    }
+
+
+@app.get("/api/session/{session_id}/state")
+async def get_session_state(session_id: str, since: int = 0):
+    """
+    Get only what changed in a session since a revision (cheap polling)
+    
+    Args:
+        session_id: Session ID
+        since: Revision returned by the previous call (0 for everything)
+        
+    Returns:
+        Stage, revision, history length, and the customer / application
+        fields that changed after 'since' (None when unchanged)
+    """
+    memory = memory_manager.get_session(session_id)
+    if not memory:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    return memory_manager.get_state_delta(memory, since)
+
+
+@app.get("/api/session/{session_id}/schedule")
+async def get_repayment_schedule(session_id: str, start: Optional[date] = None):
+    """
+    Get the month-by-month repayment schedule of a session's loan offer
+    
+    Args:
+        session_id: Session ID
+        start: Disbursement date the due dates count from (defaults to today)
+        
+    Returns:
+        Loan terms, totals, first EMI and maturity dates, and one row per
+        month with payment, principal, interest, balance and due date
+    """
+    memory = memory_manager.get_session(session_id)
+    if not memory:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    # Approved terms once underwriting is done, the quoted offer before that
+    application = memory.application
+    amount = application and (application.approved_amount or application.requested_amount)
+    tenure = application and (application.tenure or application.requested_tenure)
+    if not amount or not tenure or not application.interest_rate:
+        raise HTTPException(status_code=400, detail="No loan offer yet")
+    
+    start = start or date.today()
+    schedule = amortization_schedule(amount, application.interest_rate, tenure,
+                                     emi=application.emi_amount or application.emi)
+    
+    return {
+        "session_id": session_id,
+        "amount": amount,
+        "interest_rate": application.interest_rate,
+        "tenure": tenure,
+        "emi": schedule.emi,
+        "total_payable": schedule.total_payable,
+        "total_interest": schedule.total_interest,
+        "first_emi_date": schedule.first_emi_date(start).isoformat(),
+        "maturity_date": schedule.maturity_date(start).isoformat(),
+        "schedule": schedule.rows(start)
     }
 
 
+@app.get("/api/offers/grid")
+async def get_offer_grid(session_id: str, amount: Optional[float] = None):
+    """
+    Get the customer's offer grid: EMI, total payable and EMI-to-salary ratio
+    for every tenure option across an amount ladder
+    
+    Args:
+        session_id: Session ID (the customer must be identified)
+        amount: Also return the options for this exact amount
+        
+    Returns:
+        Grid matrices (amounts x tenures) and, with 'amount', one option per tenure
+    """
+    memory = memory_manager.get_session(session_id)
+    if not memory:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not memory.customer:
+        raise HTTPException(status_code=400, detail="Customer not identified yet")
+    
+    application = memory.application
+    grid = offer_grid_service.get_grid(memory.customer, application.parsed_salary if application else None)
+    
+    response = {"session_id": session_id, **grid.to_dict()}
+    if amount is not None:
+        if amount <= 0:
+            raise HTTPException(status_code=400, detail="Amount must be positive")
+        response["options"] = grid.options(amount)
+    return response
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "service": "NBFC Agentic AI Loan System"
+        "service": "NBFC Agentic AI Loan System",
+        "sessions": memory_manager.get_stats(),
+        "executors": {
+            "io": io_executor.get_stats(),
+            "cpu": cpu_executor.get_stats()
+        },
+        "render_pool": render_pool.get_stats(),
+        "offer_grids": offer_grid_service.get_stats(),
+        "underwriting_policy": policy_store.version(),
+        "offer_catalogue": offer_catalogue_store.get().version,
+        "emi_cache": emi_cache_stats(),
+        "lookup_caches": cache_stats()
     }
 
 
+@app.on_event("startup")
+async def start_render_pool():
+    """Warm the PDF render workers before the first approval needs them"""
+    await asyncio.get_running_loop().run_in_executor(None, render_pool.start)
+
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    """Let in-flight blocking work finish before the worker exits"""
+    io_executor.shutdown()
+    cpu_executor.shutdown()
+    render_pool.shutdown()
+    await close_adapters()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=config.API_HOST, port=config.API_PORT)
@@ -1,13 +1,17 @@
 """Master Agent - The Orchestrator"""
 
 from models import (ConversationStage, ConversationMemory, ChatMessage, ChatResponse,
-                   LoanApplication, LoanDecision, OfferDetails, Customer)
-from memory_manager import memory_manager
+                   LoanApplication, LoanDecision, OfferDetails, Customer, TierOffer)
+from memory_manager import memory_manager, SessionTransaction
 from state_machine import state_machine
+from message_templates import render_template
 from agents import sales_agent, verification_agent, underwriting_agent, sanction_agent
-from mocks import crm_service, credit_bureau_service
-from typing import Optional
+from adapters import crm_adapter, credit_bureau_adapter, offer_mart_adapter, ServiceUnavailableError
+from utils.amortization import amortization_schedule
+from typing import Optional, Tuple
+import asyncio
 import re
+import config
 
 
 class MasterAgent:
@@ -28,7 +32,7 @@ class MasterAgent:
         self.memory_manager = memory_manager
         self.state_machine = state_machine
     
-    def process_message(self, message: ChatMessage) -> ChatResponse:
+    async def process_message(self, message: ChatMessage) -> ChatResponse:
         """
         Main entry point - process user message and orchestrate response
         
@@ -38,88 +42,75 @@ class MasterAgent:
         Returns:
             ChatResponse with agent's reply
         """
-        # Get or create session
-        memory = self.memory_manager.get_session(message.session_id)
-        if not memory:
-            session_id = self.memory_manager.create_session()
-            memory = self.memory_manager.get_session(session_id)
-            message.session_id = session_id
-        
-        # Add user message to history
-        self.memory_manager.add_message(message.session_id, "user", message.message)
-        
-        # Process based on current stage
-        current_stage = memory.current_stage
-        
-        if current_stage == ConversationStage.GREETING:
-            response = self._handle_greeting(message, memory)
-        
-        elif current_stage == ConversationStage.INTENT_CAPTURE:
-            response = self._handle_intent_capture(message, memory)
-        
-        elif current_stage == ConversationStage.LEAD_QUALIFICATION:
-            response = self._handle_lead_qualification(message, memory)
-        
-        elif current_stage == ConversationStage.OFFER_PRESENTATION:
-            response = self._handle_offer_presentation(message, memory)
-        
-        elif current_stage == ConversationStage.KYC_VERIFICATION:
-            response = self._handle_kyc_verification(message, memory)
-        
-        elif current_stage == ConversationStage.UNDERWRITING:
-            response = self._handle_underwriting(message, memory)
-        
-        elif current_stage == ConversationStage.DECISION:
-            response = self._handle_decision(message, memory)
-        
-        elif current_stage == ConversationStage.SANCTION_LETTER:
-            response = self._handle_sanction_letter(message, memory)
-        
-        elif current_stage == ConversationStage.CLOSE:
-            response = self._handle_close(message, memory)
-        
-        else:
-            response = ChatResponse(
-                session_id=message.session_id,
-                message="I'm sorry, something went wrong. Let's start over.",
-                stage=ConversationStage.GREETING
-            )
-        
-        # Add assistant message to history
-        self.memory_manager.add_message(message.session_id, "assistant", response.message)
+        # One load and one write per turn: every handler works on this transaction
+        with self.memory_manager.session(message.session_id, create=True) as session:
+            message.session_id = session.session_id
+            
+            # Add user message to history
+            session.add_message("user", message.message)
+            
+            # Process based on current stage
+            current_stage = session.memory.current_stage
+            
+            if current_stage == ConversationStage.GREETING:
+                response = await self._handle_greeting(message, session)
+            
+            elif current_stage == ConversationStage.INTENT_CAPTURE:
+                response = await self._handle_intent_capture(message, session)
+            
+            elif current_stage == ConversationStage.LEAD_QUALIFICATION:
+                response = await self._handle_lead_qualification(message, session)
+            
+            elif current_stage == ConversationStage.OFFER_PRESENTATION:
+                response = await self._handle_offer_presentation(message, session)
+            
+            elif current_stage == ConversationStage.KYC_VERIFICATION:
+                response = await self._handle_kyc_verification(message, session)
+            
+            elif current_stage == ConversationStage.UNDERWRITING:
+                response = await self._handle_underwriting(message, session)
+            
+            elif current_stage == ConversationStage.DECISION:
+                response = await self._handle_decision(message, session)
+            
+            elif current_stage == ConversationStage.SANCTION_LETTER:
+                response = await self._handle_sanction_letter(message, session)
+            
+            elif current_stage == ConversationStage.CLOSE:
+                response = await self._handle_close(message, session)
+            
+            else:
+                response = ChatResponse(
+                    session_id=message.session_id,
+                    message="I'm sorry, something went wrong. Let's start over.",
+                    stage=ConversationStage.GREETING
+                )
+            
+            # Add assistant message to history
+            session.add_message("assistant", response.message,
+                                template_id=response.template_id,
+                                template_params=response.template_params)
         
         return response
     
-    def _handle_greeting(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    async def _handle_greeting(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle greeting stage"""
         
-        greeting_message = """
-🙏 **Welcome to Tata Capital!**
-
-Hello! I'm your personal loan assistant. I'm here to help you get a personal loan quickly and easily.
-
-**Here's how I can help you:**
-✅ Check your pre-approved loan offers
-✅ Provide instant loan approval
-✅ Calculate EMI options
-✅ Generate sanction letter
-
-**To get started, please enter your 10-digit mobile number (e.g., 9876543210):**
-""".strip()
+        greeting_message = render_template("greeting")
         
         # Transition to intent capture
-        self.state_machine.transition(memory, ConversationStage.INTENT_CAPTURE)
-        self.memory_manager.update_session(message.session_id, memory)
+        self.state_machine.transition(session.memory, ConversationStage.INTENT_CAPTURE)
         
         return ChatResponse(
             session_id=message.session_id,
             message=greeting_message,
             stage=ConversationStage.INTENT_CAPTURE,
             requires_input=True,
-            input_type="text"
+            input_type="text",
+            template_id="greeting"
         )
     
-    def _handle_intent_capture(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    async def _handle_intent_capture(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle intent capture - get phone number"""
         
         # Extract phone number from message
@@ -135,108 +126,134 @@ Hello! I'm your personal loan assistant. I'm here to help you get a personal loa
             )
         
         # Store phone and transition
-        memory.phone = phone
-        self.memory_manager.update_context(message.session_id, 'phone', phone)
-        self.state_machine.transition(memory, ConversationStage.LEAD_QUALIFICATION)
-        self.memory_manager.update_session(message.session_id, memory)
+        session.memory.phone = phone
+        session.update_context('phone', phone)
+        self.state_machine.transition(session.memory, ConversationStage.LEAD_QUALIFICATION)
         
         # Immediately process lead qualification
-        return self._fetch_customer_and_qualify(message.session_id, phone, memory)
+        return await self._fetch_customer_and_qualify(session, phone)
     
-    def _handle_lead_qualification(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    async def _handle_lead_qualification(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle lead qualification - should not reach here normally"""
-        return self._fetch_customer_and_qualify(message.session_id, memory.phone, memory)
+        return await self._fetch_customer_and_qualify(session, session.memory.phone)
+    
+    async def _prefetch_lead_data(self, phone: str) -> Tuple[Optional[Customer], Optional[TierOffer]]:
+        """
+        Fetch everything qualification and the offer need, concurrently
+        
+        The CRM profile (which carries the KYC status) and the bureau score
+        are fetched together, then the offer mart terms for that score. A
+        bureau or offer mart failure is not fatal: the CRM score is used, and
+        offers are fetched again when the offer is presented.
+        
+        Args:
+            phone: Customer's phone number
+            
+        Returns:
+            (customer with the bureau score, offer terms or None); customer is
+            None if the phone is unknown
+            
+        Raises:
+            ServiceUnavailableError: If the CRM cannot be reached
+        """
+        customer, credit_score = await asyncio.gather(
+            crm_adapter.get_customer_by_phone(phone),
+            credit_bureau_adapter.get_credit_score(phone),
+            return_exceptions=True
+        )
+        if isinstance(customer, BaseException):
+            raise customer
+        if customer is None:
+            return None, None
+        
+        if isinstance(credit_score, BaseException):
+            print(f"[Master Agent] WARNING: Credit bureau lookup failed, using CRM score: {credit_score}")
+        elif credit_score is not None and credit_score != customer.credit_score:
+            customer = customer.model_copy(update={"credit_score": credit_score})
+        
+        try:
+            offer_terms = await offer_mart_adapter.get_offers(customer.id, customer.credit_score)
+        except ServiceUnavailableError as e:
+            print(f"[Master Agent] WARNING: Offer mart lookup failed, will retry at offer time: {e}")
+            offer_terms = None
+        return customer, offer_terms
     
-    def _fetch_customer_and_qualify(self, session_id: str, phone: str, 
-                                   memory: ConversationMemory) -> ChatResponse:
-        """Fetch customer from CRM and qualify lead"""
+    async def _fetch_customer_and_qualify(self, session: SessionTransaction, phone: str) -> ChatResponse:
+        """Fetch customer, bureau score and offers, and qualify lead"""
         
-        # Fetch customer from CRM
-        customer = crm_service.get_customer_by_phone(phone)
+        # Fetch customer from CRM (with bureau score and offers prefetched)
+        customer, offer_terms = await self._prefetch_lead_data(phone)
         
         if not customer:
             # Customer not found
-            not_found_message = f"""
-😔 **Customer Not Found**
-
-I couldn't find an account with phone number {phone}.
-
-**To apply for a loan, you can:**
-• Visit our website: www.tatacapital.com
-• Call us: 1800-123-4567
-• Visit nearest branch
-
-Thank you for your interest!
-""".strip()
+            not_found_params = {"phone": phone}
+            not_found_message = render_template("customer_not_found", not_found_params)
             
-            self.state_machine.transition(memory, ConversationStage.CLOSE)
-            self.memory_manager.update_session(session_id, memory)
+            self.state_machine.transition(session.memory, ConversationStage.CLOSE)
             
             return ChatResponse(
-                session_id=session_id,
+                session_id=session.session_id,
                 message=not_found_message,
                 stage=ConversationStage.CLOSE,
-                requires_input=False
+                requires_input=False,
+                template_id="customer_not_found",
+                template_params=not_found_params
             )
         
         # Customer found - store in memory
-        self.memory_manager.set_customer(session_id, customer)
+        session.set_customer(customer)
+        session.update_context('offer_terms', offer_terms)
         
         # Create loan application
         application = LoanApplication(phone=phone, customer_id=customer.id)
-        self.memory_manager.set_application(session_id, application)
+        session.set_application(application)
         
         # Ask for loan details
-        qualification_message = f"""
-✅ **Welcome back, {customer.name}!**
-
-Great news! You have a **pre-approved loan offer** of up to **₹{customer.pre_approved_limit:,.0f}**!
-
-**To help you better, I need to know:**
-
-1️⃣ **How much loan amount do you need?** (in ₹)
-2️⃣ **What tenure would you prefer?** (12, 24, 36, 48, or 60 months)
-
-Please tell me the amount and tenure. For example: "I need 200000 for 24 months" or "3 lakhs for 3 years"
-""".strip()
+        qualification_params = {
+            "name": customer.name,
+            "pre_approved_limit": customer.pre_approved_limit
+        }
+        qualification_message = render_template("customer_qualified", qualification_params)
         
-        self.state_machine.transition(memory, ConversationStage.OFFER_PRESENTATION)
-        self.memory_manager.update_session(session_id, memory)
+        self.state_machine.transition(session.memory, ConversationStage.OFFER_PRESENTATION)
         
         return ChatResponse(
-            session_id=session_id,
+            session_id=session.session_id,
             message=qualification_message,
             stage=ConversationStage.OFFER_PRESENTATION,
             requires_input=True,
-            input_type="text"
+            input_type="text",
+            template_id="customer_qualified",
+            template_params=qualification_params
         )
     
-    def _handle_offer_presentation(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    async def _handle_offer_presentation(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle offer presentation stage"""
         
-        customer = memory.customer
-        application = memory.application
+        customer = session.memory.customer
+        application = session.memory.application
         
         # Check if offer was already presented and user is responding
-        if self.memory_manager.get_context(message.session_id, 'offer_presented'):
+        if session.get_context('offer_presented'):
             user_response = message.message.lower().strip()
             
             # Check if user accepts the offer
             if user_response in ['yes', 'y', 'ok', 'proceed', 'accept', 'sure']:
                 # User accepted - move to KYC verification
-                self.state_machine.transition(memory, ConversationStage.KYC_VERIFICATION)
-                self.memory_manager.update_session(message.session_id, memory)
+                self.state_machine.transition(session.memory, ConversationStage.KYC_VERIFICATION)
                 
                 # Process KYC verification
-                return self._handle_kyc_verification(message, memory)
+                return await self._handle_kyc_verification(message, session)
             
             # Check if user wants to change tenure
             elif 'change' in user_response or 'modify' in user_response or 'different' in user_response:
-                # Reset offer presented flag
-                self.memory_manager.update_context(message.session_id, 'offer_presented', False)
+                # Reset offer presented flag and show every tenure option in one go
+                session.update_context('offer_presented', False)
+                session.update_context('awaiting_tenure', True)
+                tenure_options = sales_agent.present_tenure_options(customer, application.requested_amount)
                 return ChatResponse(
                     session_id=message.session_id,
-                    message="Sure! Please tell me the new tenure you'd like (12, 24, 36, 48, or 60 months):",
+                    message=tenure_options['message'],
                     stage=ConversationStage.OFFER_PRESENTATION,
                     requires_input=True,
                     input_type="text"
@@ -251,6 +268,26 @@ Please tell me the amount and tenure. For example: "I need 200000 for 24 months"
                     input_type="text"
                 )
         
+        # Customer is picking a new tenure from the options
+        if session.get_context('awaiting_tenure'):
+            tenure = self._extract_tenure(message.message)
+            if not tenure:
+                number_match = re.search(r'\b(\d+)\b', message.message)
+                tenure = int(number_match.group(1)) if number_match else None
+            
+            if tenure not in config.TENURE_OPTIONS:
+                return ChatResponse(
+                    session_id=message.session_id,
+                    message=f"Please choose one of: {', '.join(map(str, config.TENURE_OPTIONS))} months.",
+                    stage=ConversationStage.OFFER_PRESENTATION,
+                    requires_input=True,
+                    input_type="text"
+                )
+            
+            session.update_context('awaiting_tenure', False)
+            application.requested_tenure = tenure
+            session.set_application(application)
+        
         # Check if we already have amount and tenure
         if not application.requested_amount or not application.requested_tenure:
             # Extract amount and tenure from message
@@ -278,50 +315,59 @@ Please tell me the amount and tenure. For example: "I need 200000 for 24 months"
             # Store in application
             application.requested_amount = amount
             application.requested_tenure = tenure
-            self.memory_manager.set_application(message.session_id, application)
-        
-        # Present offer using Sales Agent
+            session.set_application(application)
+        
+        # Present offer using Sales Agent (offer terms were prefetched at qualification)
+        offer_terms = session.get_context('offer_terms')
+        if offer_terms is None:
+            offer_terms = await offer_mart_adapter.get_offers(customer.id, customer.credit_score)
+            if offer_terms is None:
+                raise ServiceUnavailableError("offer_mart", f"no offer terms for customer {customer.id}")
+            session.update_context('offer_terms', offer_terms)
+        # Sessions reloaded from a persistent store hold the terms as a plain dict
+        offer_terms = TierOffer.model_validate(offer_terms)
         offer_result = sales_agent.present_offer(customer, application.requested_amount, 
-                                                 application.requested_tenure)
+                                                 application.requested_tenure, offer_terms)
         
         # Store interest rate and EMI
         application.interest_rate = offer_result['offer'].interest_rate
         application.emi = offer_result['offer'].emi
-        self.memory_manager.set_application(message.session_id, application)
+        session.set_application(application)
         
         # Ask for confirmation
-        confirmation_message = offer_result['message'] + "\n\n**Type 'yes' to proceed or 'change tenure' to modify.**"
+        confirmation_message = render_template("offer_confirmation", offer_result['template_params'])
         
-        self.memory_manager.update_context(message.session_id, 'offer_presented', True)
-        self.memory_manager.update_context(message.session_id, 'current_offer', offer_result['offer'])
+        session.update_context('offer_presented', True)
+        session.update_context('current_offer', offer_result['offer'])
         
         return ChatResponse(
             session_id=message.session_id,
             message=confirmation_message,
             stage=ConversationStage.OFFER_PRESENTATION,
             requires_input=True,
-            input_type="text"
+            input_type="text",
+            template_id="offer_confirmation",
+            template_params=offer_result['template_params']
         )
     
-    def _handle_kyc_verification(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    async def _handle_kyc_verification(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle KYC verification stage"""
         
-        customer = memory.customer
+        customer = session.memory.customer
         
         # Check if we need to verify KYC
-        if not self.memory_manager.get_context(message.session_id, 'kyc_checked'):
+        if not session.get_context('kyc_checked'):
             # First time - check KYC status
             kyc_result = verification_agent.verify_kyc(customer)
-            self.memory_manager.update_context(message.session_id, 'kyc_checked', True)
+            session.update_context('kyc_checked', True)
             
             if kyc_result['verified']:
                 # KYC already verified - move to underwriting
-                self.memory_manager.update_context(message.session_id, 'kyc_verified', True)
-                self.state_machine.transition(memory, ConversationStage.UNDERWRITING)
-                self.memory_manager.update_session(message.session_id, memory)
+                session.update_context('kyc_verified', True)
+                self.state_machine.transition(session.memory, ConversationStage.UNDERWRITING)
                 
                 # Immediately process underwriting
-                return self._process_underwriting(message.session_id, memory)
+                return await self._process_underwriting(session)
             
             elif kyc_result.get('requires_otp'):
                 # Need OTP verification
@@ -335,8 +381,7 @@ Please tell me the amount and tenure. For example: "I need 200000 for 24 months"
             
             else:
                 # KYC failed
-                self.state_machine.transition(memory, ConversationStage.CLOSE)
-                self.memory_manager.update_session(message.session_id, memory)
+                self.state_machine.transition(session.memory, ConversationStage.CLOSE)
                 
                 return ChatResponse(
                     session_id=message.session_id,
@@ -346,31 +391,19 @@ Please tell me the amount and tenure. For example: "I need 200000 for 24 months"
                 )
         
         # Handle OTP verification or salary slip upload
-        if self.memory_manager.get_context(message.session_id, 'awaiting_salary_slip'):
+        if session.get_context('awaiting_salary_slip'):
             # Check if user wants to cancel
             user_input = message.message.lower().strip()
             if user_input in ['cancel', 'cancel application', 'stop', 'quit', 'exit']:
                 # User wants to cancel
-                self.state_machine.transition(memory, ConversationStage.CLOSE)
-                self.memory_manager.update_session(message.session_id, memory)
+                self.state_machine.transition(session.memory, ConversationStage.CLOSE)
                 
                 return ChatResponse(
                     session_id=message.session_id,
-                    message="""
-🚫 **Application Cancelled**
-
-Your loan application has been cancelled as requested.
-
-Thank you for your interest in Tata Capital. You can start a new application anytime by refreshing the page.
-
-If you have any questions, please contact us at:
-📞 1800-123-4567
-📧 support@tatacapital.com
-
-Have a great day! 🙏
-""".strip(),
+                    message=render_template("application_cancelled"),
                     stage=ConversationStage.CLOSE,
-                    requires_input=False
+                    requires_input=False,
+                    template_id="application_cancelled"
                 )
             
             # Otherwise, prompt for file upload
@@ -385,24 +418,23 @@ Have a great day! 🙏
         else:
             # Simulate OTP verification (any response verifies)
             otp_result = verification_agent.simulate_otp_verification(customer)
-            self.memory_manager.update_context(message.session_id, 'kyc_verified', True)
+            session.update_context('kyc_verified', True)
             
             # Move to underwriting
-            self.state_machine.transition(memory, ConversationStage.UNDERWRITING)
-            self.memory_manager.update_session(message.session_id, memory)
+            self.state_machine.transition(session.memory, ConversationStage.UNDERWRITING)
             
             # Process underwriting
-            return self._process_underwriting(message.session_id, memory)
+            return await self._process_underwriting(session)
     
-    def _handle_underwriting(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    async def _handle_underwriting(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle underwriting stage"""
-        return self._process_underwriting(message.session_id, memory)
+        return await self._process_underwriting(session)
     
-    def _process_underwriting(self, session_id: str, memory: ConversationMemory) -> ChatResponse:
+    async def _process_underwriting(self, session: SessionTransaction) -> ChatResponse:
         """Process underwriting evaluation"""
         
-        customer = memory.customer
-        application = memory.application
+        customer = session.memory.customer
+        application = session.memory.application
         
         # Get parsed salary if available
         parsed_salary = application.parsed_salary if application.salary_slip_uploaded else None
@@ -419,6 +451,7 @@ Have a great day! 🙏
         application.decision = evaluation['decision']
         application.decision_reason = evaluation['reason']
         application.reason_code = evaluation['reason_code']
+        application.policy_version = evaluation['policy_version']
         
         # If approved, set approved fields
         if evaluation['decision'] == LoanDecision.APPROVED:
@@ -429,19 +462,19 @@ Have a great day! 🙏
             application.emi_amount = application.emi
             # Generate application ID if not present
             if not application.application_id:
-                application.application_id = session_id[:8].upper()
+                application.application_id = session.session_id[:8].upper()
         
-        self.memory_manager.set_application(session_id, application)
+        session.set_application(application)
         
         # Handle decision
         if evaluation['decision'] == LoanDecision.CONDITIONAL:
             # Need salary slip
-            self.memory_manager.update_context(session_id, 'awaiting_salary_slip', True)
+            session.update_context('awaiting_salary_slip', True)
             
             salary_request = verification_agent.request_salary_slip(customer, evaluation['reason'])
             
             return ChatResponse(
-                session_id=session_id,
+                session_id=session.session_id,
                 message=evaluation['message'] + "\n\n" + salary_request,
                 stage=ConversationStage.KYC_VERIFICATION,
                 requires_input=True,
@@ -449,44 +482,81 @@ Have a great day! 🙏
             )
         
         else:
-            # Move to decision stage
-            self.memory_manager.update_context(session_id, 'decision', evaluation['decision'])
-            
             # If approved, automatically generate sanction letter
             if evaluation['decision'] == LoanDecision.APPROVED:
-                self.state_machine.transition(memory, ConversationStage.SANCTION_LETTER)
-                self.memory_manager.update_session(session_id, memory)
+                session.update_context('decision', evaluation['decision'])
+                self.state_machine.transition(session.memory, ConversationStage.SANCTION_LETTER)
                 
                 # Generate sanction letter immediately
-                return self._generate_sanction_letter(session_id, memory)
+                return await self._generate_sanction_letter(session)
+            elif evaluation.get('counter_offer'):
+                # Rejected with terms that would pass - offer them in the same turn,
+                # which reopens the application (decision back to PENDING)
+                self._stage_counter_offer(session, evaluation['counter_offer'])
+                session.update_context('decision', session.memory.application.decision)
+                
+                return ChatResponse(
+                    session_id=session.session_id,
+                    message=evaluation['message'],
+                    stage=ConversationStage.OFFER_PRESENTATION,
+                    requires_input=True,
+                    input_type="text",
+                    metadata={"counter_offer": evaluation['counter_offer']}
+                )
             else:
                 # Rejected - move to close
-                self.state_machine.transition(memory, ConversationStage.CLOSE)
-                self.memory_manager.update_session(session_id, memory)
+                session.update_context('decision', evaluation['decision'])
+                self.state_machine.transition(session.memory, ConversationStage.CLOSE)
                 
                 return ChatResponse(
-                    session_id=session_id,
+                    session_id=session.session_id,
                     message=evaluation['message'],
                     stage=ConversationStage.CLOSE,
                     requires_input=False
                 )
     
-    def _handle_decision(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    def _stage_counter_offer(self, session: SessionTransaction, counter_offer: dict):
+        """
+        Make a counter-offer the application's current offer
+        
+        The conversation goes back to offer presentation with the offer
+        already shown, so 'yes' runs KYC and underwriting again on the new terms.
+        """
+        application = session.memory.application
+        application.requested_amount = counter_offer['amount']
+        application.requested_tenure = counter_offer['tenure']
+        application.interest_rate = counter_offer['interest_rate']
+        application.emi = counter_offer['emi']
+        application.decision = LoanDecision.PENDING
+        session.set_application(application)
+        
+        session.update_context('offer_presented', True)
+        session.update_context('awaiting_tenure', False)
+        session.update_context('awaiting_salary_slip', False)
+        session.update_context('current_offer', OfferDetails(
+            amount=counter_offer['amount'],
+            tenure=counter_offer['tenure'],
+            interest_rate=counter_offer['interest_rate'],
+            emi=counter_offer['emi'],
+            total_payable=amortization_schedule(counter_offer['amount'], counter_offer['interest_rate'],
+                                                counter_offer['tenure']).total_payable
+        ))
+        self.state_machine.transition(session.memory, ConversationStage.OFFER_PRESENTATION)
+    
+    async def _handle_decision(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle decision stage"""
         
-        application = memory.application
+        application = session.memory.application
         
         if application.decision == LoanDecision.APPROVED:
             # Move to sanction letter generation
-            self.state_machine.transition(memory, ConversationStage.SANCTION_LETTER)
-            self.memory_manager.update_session(message.session_id, memory)
+            self.state_machine.transition(session.memory, ConversationStage.SANCTION_LETTER)
             
-            return self._generate_sanction_letter(message.session_id, memory)
+            return await self._generate_sanction_letter(session)
         
         else:
             # Rejected - close conversation
-            self.state_machine.transition(memory, ConversationStage.CLOSE)
-            self.memory_manager.update_session(message.session_id, memory)
+            self.state_machine.transition(session.memory, ConversationStage.CLOSE)
             
             return ChatResponse(
                 session_id=message.session_id,
@@ -495,15 +565,15 @@ Have a great day! 🙏
                 requires_input=False
             )
     
-    def _handle_sanction_letter(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    async def _handle_sanction_letter(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle sanction letter generation"""
-        return self._generate_sanction_letter(message.session_id, memory)
+        return await self._generate_sanction_letter(session)
     
-    def _generate_sanction_letter(self, session_id: str, memory: ConversationMemory) -> ChatResponse:
+    async def _generate_sanction_letter(self, session: SessionTransaction) -> ChatResponse:
         """Generate sanction letter"""
         
-        customer = memory.customer
-        application = memory.application
+        customer = session.memory.customer
+        application = session.memory.application
         
         # Create offer details
         offer = OfferDetails(
@@ -511,41 +581,46 @@ Have a great day! 🙏
             tenure=application.requested_tenure,
             interest_rate=application.interest_rate,
             emi=application.emi,
-            total_payable=application.emi * application.requested_tenure
+            total_payable=amortization_schedule(application.requested_amount, application.interest_rate,
+                                                application.requested_tenure, emi=application.emi).total_payable
         )
         
         # Generate sanction letter using Sanction Agent
-        sanction_response = sanction_agent.generate_sanction_letter(customer, application, offer)
+        sanction_response = await sanction_agent.generate_sanction_letter(
+            customer, application, offer, sanction_agent.offer_catalogue(session.get_context('offer_terms')),
+            session_id=session.session_id
+        )
         
         # Update application
         application.sanction_id = sanction_response.sanction_id
         application.sanction_letter_url = sanction_response.pdf_url
-        self.memory_manager.set_application(session_id, application)
+        session.set_application(application)
         
         # Craft message
-        sanction_message = sanction_agent.craft_sanction_message(
-            customer, 
+        sanction_params = sanction_agent.sanction_message_params(
+            customer,
             sanction_response.sanction_id,
-            sanction_response.pdf_url,
             offer
         )
+        sanction_message = render_template("sanction_generated", sanction_params)
         
         # Move to close
-        self.state_machine.transition(memory, ConversationStage.CLOSE)
-        self.memory_manager.update_session(session_id, memory)
+        self.state_machine.transition(session.memory, ConversationStage.CLOSE)
         
         return ChatResponse(
-            session_id=session_id,
+            session_id=session.session_id,
             message=sanction_message,
             stage=ConversationStage.CLOSE,
             requires_input=False,
+            template_id="sanction_generated",
+            template_params=sanction_params,
             metadata={
                 "sanction_id": sanction_response.sanction_id,
                 "pdf_url": sanction_response.pdf_url
             }
         )
     
-    def _handle_close(self, message: ChatMessage, memory: ConversationMemory) -> ChatResponse:
+    async def _handle_close(self, message: ChatMessage, session: SessionTransaction) -> ChatResponse:
         """Handle close stage"""
         
         return ChatResponse(
@@ -1,21 +1,200 @@
 """Memory Manager for conversation context and history"""
 
 from models import ConversationMemory, ConversationStage, Customer, LoanApplication
-from typing import Dict, Optional
+from session_store import SessionStore, SessionConflictError, create_session_store
+from history_archive import HistoryArchive, history_archive
+from message_templates import render_turn
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+import asyncio
+import heapq
+import threading
+import zlib
+import time
 import uuid
+import config
+
+
+class SessionNotFoundError(KeyError):
+    """Raised when a unit of work is opened on an unknown session"""
+
+
+class SessionLocks:
+    """
+    Striped asyncio locks that serialize requests on the same session
+    
+    A fixed pool of locks is shared by all sessions (a session always maps to
+    the same stripe), so memory stays bounded however many sessions exist.
+    Unrelated sessions occasionally share a stripe, which only costs a wait.
+    """
+    
+    def __init__(self, stripes: int):
+        """
+        Initialize lock pool
+        
+        Args:
+            stripes: Number of locks in the pool
+        """
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+    
+    def lock(self, session_id: str) -> asyncio.Lock:
+        """
+        Get the lock guarding a session
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            asyncio.Lock to hold while handling a request on the session
+        """
+        return self._locks[zlib.crc32(session_id.encode("utf-8")) % len(self._locks)]
 
 
 class MemoryManager:
     """
     Manages conversation memory and context for all sessions
     
-    In a production system, this would use Redis or a database.
-    For this MVP, we use in-memory storage.
+    Sessions live in a pluggable SessionStore: the in-memory dict by default,
+    or a disk-backed store shared by all workers (see config.SESSION_STORE_BACKEND).
+    
+    Sessions are evicted once they have been idle longer than their TTL
+    (shorter for closed conversations) or when more than max_sessions are
+    live. Expiry uses a min-heap of deadlines with lazy invalidation and
+    capacity uses an LRU order, so each request only touches the sessions
+    that are actually due. Sessions already in the store at startup are
+    tracked too, and a session another worker has written since this one
+    last saw it is never evicted from here.
     """
     
-    def __init__(self):
-        """Initialize memory manager"""
-        self.sessions: Dict[str, ConversationMemory] = {}
+    def __init__(self, store: Optional[SessionStore] = None,
+                 idle_ttl: Optional[float] = None,
+                 closed_ttl: Optional[float] = None,
+                 max_sessions: Optional[int] = None,
+                 archive: Optional[HistoryArchive] = None,
+                 history_buffer_size: Optional[int] = None):
+        """
+        Initialize memory manager
+        
+        Args:
+            store: Session store to use (defaults to the configured backend)
+            idle_ttl: Seconds an open session may stay idle
+            closed_ttl: Seconds a session in the CLOSE stage may stay idle
+            max_sessions: Maximum number of live sessions
+            archive: Where turns beyond the in-memory buffer are spilled
+            history_buffer_size: Number of recent turns kept in memory
+        """
+        self.store = store or create_session_store()
+        self.locks = SessionLocks(config.SESSION_LOCK_STRIPES)
+        self.archive = archive or history_archive
+        self.history_buffer_size = history_buffer_size or config.HISTORY_BUFFER_SIZE
+        self.idle_ttl = idle_ttl if idle_ttl is not None else config.SESSION_IDLE_TTL_SECONDS
+        self.closed_ttl = closed_ttl if closed_ttl is not None else config.SESSION_CLOSED_TTL_SECONDS
+        self.max_sessions = max_sessions if max_sessions is not None else config.MAX_SESSIONS
+        
+        self._lock = threading.Lock()
+        # session_id -> (revision, time) this worker last saw it at, least recently used first
+        self._lru: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._deadlines: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._evicted_idle = 0
+        self._evicted_capacity = 0
+        self._write_conflicts = 0
+        self._track_stored_sessions()
+    
+    def _ttl_for(self, memory: ConversationMemory) -> float:
+        """TTL that applies to a session in its current stage"""
+        if memory.current_stage == ConversationStage.CLOSE:
+            return self.closed_ttl
+        return self.idle_ttl
+    
+    def _track_stored_sessions(self):
+        """Start tracking sessions already in the store (e.g. persisted before a restart)"""
+        # The stage is not known without loading each session, so schedule the
+        # earliest possible expiry; _evict_expired re-checks against the store
+        ttl = min(self.idle_ttl, self.closed_ttl)
+        with self._lock:
+            for session_id, revision, updated in self.store.scan_activity():
+                self._deadlines[session_id] = updated + ttl
+                self._expiry_heap.append((updated + ttl, session_id))
+                self._lru[session_id] = (revision, updated)
+            heapq.heapify(self._expiry_heap)
+    
+    def _touch(self, session_id: str, memory: ConversationMemory):
+        """Record activity on a session (caller holds the lock)"""
+        now = time.time()
+        deadline = now + self._ttl_for(memory)
+        self._deadlines[session_id] = deadline
+        heapq.heappush(self._expiry_heap, (deadline, session_id))
+        self._lru[session_id] = (memory.revision, now)
+        self._lru.move_to_end(session_id)
+        
+        # Superseded heap entries are skipped lazily; rebuild once they dominate
+        if len(self._expiry_heap) > 2 * len(self._deadlines) + 64:
+            self._expiry_heap = [(d, sid) for sid, d in self._deadlines.items()]
+            heapq.heapify(self._expiry_heap)
+    
+    def _forget(self, session_id: str):
+        """Stop tracking a session (caller holds the lock)"""
+        self._lru.pop(session_id, None)
+        self._deadlines.pop(session_id, None)
+    
+    def _evict_expired(self):
+        """Evict sessions whose idle deadline has passed (caller holds the lock)"""
+        now = time.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            deadline, session_id = heapq.heappop(self._expiry_heap)
+            if self._deadlines.get(session_id) != deadline:
+                continue  # Superseded by a later touch
+            
+            # Another worker may have kept the session alive in a shared store
+            memory = self.store.get(session_id)
+            if memory is not None:
+                idle = now - memory.updated_at.timestamp()
+                remaining = self._ttl_for(memory) - idle
+                if remaining > 0:
+                    self._deadlines[session_id] = now + remaining
+                    heapq.heappush(self._expiry_heap, (now + remaining, session_id))
+                    continue
+            
+            self._forget(session_id)
+            self.store.delete(session_id)
+            self.archive.delete(session_id)
+            self._evicted_idle += 1
+    
+    def _evict_over_capacity(self):
+        """Evict least recently used sessions beyond max_sessions (caller holds the lock)"""
+        while len(self._lru) > self.max_sessions:
+            session_id, (revision, seen_at) = self._lru.popitem(last=False)
+            self._deadlines.pop(session_id, None)
+            
+            # Least recently used here may still be in use by another worker
+            # sharing the store; leave those to that worker
+            memory = self.store.get(session_id)
+            if memory is not None and (memory.revision != revision
+                                       or memory.updated_at.timestamp() > seen_at):
+                continue
+            
+            self.store.delete(session_id)
+            self.archive.delete(session_id)
+            self._evicted_capacity += 1
+    
+    def get_stats(self) -> dict:
+        """
+        Get session eviction counters
+        
+        Returns:
+            Dictionary with live session count, eviction and conflict totals
+        """
+        with self._lock:
+            return {
+                "live_sessions": len(self._lru),
+                "max_sessions": self.max_sessions,
+                "evicted_idle": self._evicted_idle,
+                "evicted_capacity": self._evicted_capacity,
+                "write_conflicts": self._write_conflicts
+            }
     
     def create_session(self) -> str:
         """
@@ -26,7 +205,11 @@ class MemoryManager:
         """
         session_id = str(uuid.uuid4())
         memory = ConversationMemory(session_id=session_id)
-        self.sessions[session_id] = memory
+        with self._lock:
+            self._evict_expired()
+            self.store.put(session_id, memory)
+            self._touch(session_id, memory)
+            self._evict_over_capacity()
         return session_id
     
     def get_session(self, session_id: str) -> Optional[ConversationMemory]:
@@ -39,17 +222,84 @@ class MemoryManager:
         Returns:
             ConversationMemory if found, None otherwise
         """
-        return self.sessions.get(session_id)
+        with self._lock:
+            self._evict_expired()
+            memory = self.store.get(session_id)
+            if memory is not None:
+                self._touch(session_id, memory)
+                self._evict_over_capacity()
+            return memory
     
-    def update_session(self, session_id: str, memory: ConversationMemory):
+    def update_session(self, session_id: str, memory: ConversationMemory,
+                       expected_revision: Optional[int] = None):
         """
         Update conversation memory
         
         Args:
             session_id: Session ID
             memory: Updated conversation memory
+            expected_revision: Revision the memory was loaded at; if the stored
+                session has moved on since, the write is refused
+            
+        Raises:
+            SessionConflictError: If expected_revision no longer matches the store
+        """
+        previous_revision = memory.revision
+        memory.updated_at = datetime.now()
+        memory.revision = previous_revision + 1
+        try:
+            self.store.put(session_id, memory, expected_revision)
+        except SessionConflictError:
+            memory.revision = previous_revision
+            with self._lock:
+                self._write_conflicts += 1
+            raise
+        with self._lock:
+            self._touch(session_id, memory)
+            self._evict_over_capacity()
+    
+    @contextmanager
+    def session(self, session_id: str, create: bool = False) -> Iterator["SessionTransaction"]:
         """
-        self.sessions[session_id] = memory
+        Open a unit of work on a session
+        
+        The memory is loaded once into a private copy, mutations made through
+        the yielded SessionTransaction apply to that copy, and a single write
+        is issued when the block exits normally (none if nothing changed). If
+        the block raises, the copy is discarded and the stored session is
+        left as it was.
+        
+        Args:
+            session_id: Session ID
+            create: Start a fresh session if session_id is unknown
+            
+        Yields:
+            SessionTransaction for the session
+            
+        Raises:
+            SessionNotFoundError: If the session does not exist and create is False
+            SessionConflictError: If the session was written elsewhere meanwhile
+        """
+        memory = self.get_session(session_id)
+        if memory is None:
+            if not create:
+                raise SessionNotFoundError(session_id)
+            memory = ConversationMemory(session_id=str(uuid.uuid4()))
+            transaction = SessionTransaction(self, memory.session_id, memory)
+            transaction.mark_dirty()
+        else:
+            # Stores may hand out their own object; keep partial changes off it
+            transaction = SessionTransaction(self, session_id, memory.model_copy(deep=True))
+        
+        yield transaction
+        transaction.commit()
+    
+    def _transaction(self, session_id: str) -> Optional["SessionTransaction"]:
+        """Open a single-operation transaction, or None if the session is unknown"""
+        memory = self.get_session(session_id)
+        if memory:
+            return SessionTransaction(self, session_id, memory.model_copy(deep=True))
+        return None
     
     def add_message(self, session_id: str, role: str, content: str):
         """
@@ -60,13 +310,10 @@ class MemoryManager:
             role: Message role (user/assistant)
             content: Message content
         """
-        memory = self.get_session(session_id)
-        if memory:
-            memory.conversation_history.append({
-                "role": role,
-                "content": content
-            })
-            self.update_session(session_id, memory)
+        transaction = self._transaction(session_id)
+        if transaction:
+            transaction.add_message(role, content)
+            transaction.commit()
     
     def set_customer(self, session_id: str, customer: Customer):
         """
@@ -76,11 +323,10 @@ class MemoryManager:
             session_id: Session ID
             customer: Customer profile
         """
-        memory = self.get_session(session_id)
-        if memory:
-            memory.customer = customer
-            memory.phone = customer.phone
-            self.update_session(session_id, memory)
+        transaction = self._transaction(session_id)
+        if transaction:
+            transaction.set_customer(customer)
+            transaction.commit()
     
     def set_application(self, session_id: str, application: LoanApplication):
         """
@@ -90,10 +336,10 @@ class MemoryManager:
             session_id: Session ID
             application: Loan application
         """
-        memory = self.get_session(session_id)
-        if memory:
-            memory.application = application
-            self.update_session(session_id, memory)
+        transaction = self._transaction(session_id)
+        if transaction:
+            transaction.set_application(application)
+            transaction.commit()
     
     def update_context(self, session_id: str, key: str, value):
         """
@@ -104,10 +350,10 @@ class MemoryManager:
             key: Context key
             value: Context value
         """
-        memory = self.get_session(session_id)
-        if memory:
-            memory.context[key] = value
-            self.update_session(session_id, memory)
+        transaction = self._transaction(session_id)
+        if transaction:
+            transaction.update_context(key, value)
+            transaction.commit()
     
     def get_context(self, session_id: str, key: str, default=None):
         """
@@ -126,6 +372,61 @@ class MemoryManager:
             return memory.context.get(key, default)
         return default
     
+    def get_history(self, memory: ConversationMemory, after: int = -1,
+                    limit: Optional[int] = None) -> List[dict]:
+        """
+        Get rendered conversation turns, reading the archive only when needed
+        
+        Args:
+            memory: Conversation memory
+            after: Only return turns with index greater than this
+            limit: Maximum number of turns to return
+            
+        Returns:
+            List of {"index", "role", "content"} dicts, oldest first
+        """
+        turns = []
+        if after + 1 < memory.history_offset:
+            archive_limit = None if limit is None else min(limit, memory.history_offset - after - 1)
+            turns.extend(self.archive.read(memory.session_id, after, archive_limit))
+        
+        start = max(after + 1, memory.history_offset)
+        for index in range(start, memory.history_offset + len(memory.conversation_history)):
+            if limit is not None and len(turns) >= limit:
+                break
+            turns.append({"index": index, **memory.conversation_history[index - memory.history_offset]})
+        
+        return [{"index": turn["index"], **render_turn(turn)} for turn in turns]
+    
+    def get_state_delta(self, memory: ConversationMemory, since: int = 0) -> dict:
+        """
+        Get the session state that changed after a given revision
+        
+        Args:
+            memory: Conversation memory
+            since: Revision the caller already has (0 for everything)
+            
+        Returns:
+            Dictionary with stage, revision, history length and the customer /
+            application fields changed since that revision (None if unchanged)
+        """
+        changed = {key for key, revision in memory.change_log.items() if revision > since}
+        
+        application = None
+        if memory.application:
+            application_fields = {key.split(".", 1)[1] for key in changed if key.startswith("application.")}
+            if application_fields:
+                application = memory.application.model_dump(mode="json", include=application_fields)
+        
+        return {
+            "session_id": memory.session_id,
+            "revision": memory.revision,
+            "stage": memory.current_stage,
+            "history_length": memory.history_offset + len(memory.conversation_history),
+            "customer": memory.customer.model_dump() if memory.customer and "customer" in changed else None,
+            "application": application
+        }
+    
     def clear_session(self, session_id: str):
         """
         Clear session memory
@@ -133,8 +434,115 @@ class MemoryManager:
         Args:
             session_id: Session ID
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        with self._lock:
+            self._forget(session_id)
+            self.store.delete(session_id)
+            self.archive.delete(session_id)
+
+
+class SessionTransaction:
+    """
+    Unit of work over one session's memory
+    
+    Mirrors the MemoryManager helpers without the session_id argument.
+    Changes are applied to the loaded memory and written back once by
+    commit(); stage transitions made directly on .memory are detected too.
+    """
+    
+    def __init__(self, manager: MemoryManager, session_id: str, memory: ConversationMemory):
+        self.manager = manager
+        self.session_id = session_id
+        self.memory = memory
+        self._dirty = False
+        self._loaded_revision = memory.revision
+        self._committed_stage = memory.current_stage
+        self._committed_customer = memory.customer
+        self._committed_application = memory.application.model_dump() if memory.application else {}
+    
+    @property
+    def is_dirty(self) -> bool:
+        """Whether there are changes to write"""
+        return self._dirty or self.memory.current_stage != self._committed_stage
+    
+    def mark_dirty(self):
+        """Flag direct changes to .memory that should be written on commit"""
+        self._dirty = True
+    
+    def add_message(self, role: str, content: str, template_id: Optional[str] = None,
+                    template_params: Optional[dict] = None):
+        """
+        Add message to conversation history
+        
+        Messages rendered from message_templates are stored as the template
+        ID and parameters rather than the rendered text.
+        """
+        if template_id:
+            turn = {"role": role, "template": template_id, "params": template_params or {}}
+        else:
+            turn = {"role": role, "content": content}
+        self.memory.conversation_history.append(turn)
+        self._dirty = True
+    
+    def _record_changes(self):
+        """Stamp stage, customer and application fields that changed with the next revision"""
+        revision = self.memory.revision + 1
+        change_log = self.memory.change_log
+        
+        if self.memory.current_stage != self._committed_stage or "stage" not in change_log:
+            change_log["stage"] = revision
+        if self.memory.customer is not self._committed_customer:
+            change_log["customer"] = revision
+        
+        application = self.memory.application.model_dump() if self.memory.application else {}
+        for field, value in application.items():
+            if field not in self._committed_application or self._committed_application[field] != value:
+                change_log[f"application.{field}"] = revision
+        
+        self._committed_stage = self.memory.current_stage
+        self._committed_customer = self.memory.customer
+        self._committed_application = application
+    
+    def _spill_history(self):
+        """Move the oldest turns to the archive once the buffer overflows"""
+        history = self.memory.conversation_history
+        buffer_size = self.manager.history_buffer_size
+        if len(history) <= buffer_size:
+            return
+        
+        # Spill down to half the buffer so archive writes happen in batches
+        spill_count = len(history) - buffer_size // 2
+        self.manager.archive.append(self.session_id, self.memory.history_offset, history[:spill_count])
+        del history[:spill_count]
+        self.memory.history_offset += spill_count
+    
+    def set_customer(self, customer: Customer):
+        """Set customer profile"""
+        self.memory.customer = customer
+        self.memory.phone = customer.phone
+        self._dirty = True
+    
+    def set_application(self, application: LoanApplication):
+        """Set loan application"""
+        self.memory.application = application
+        self._dirty = True
+    
+    def update_context(self, key: str, value):
+        """Update context variable"""
+        self.memory.context[key] = value
+        self._dirty = True
+    
+    def get_context(self, key: str, default=None):
+        """Get context variable or default"""
+        return self.memory.context.get(key, default)
+    
+    def commit(self):
+        """Write the session back to the store if anything changed"""
+        if self.is_dirty:
+            self._record_changes()
+            self._spill_history()
+            self.manager.update_session(self.session_id, self.memory, self._loaded_revision)
+            self._loaded_revision = self.memory.revision
+            self._dirty = False
 
 
 # Singleton instance
@@ -0,0 +1,168 @@
+"""
+Message templates for long, mostly static assistant messages
+
+Conversation history stores these messages as a template ID plus the few
+parameters that vary, instead of the fully rendered markdown.
+"""
+
+from typing import Dict, Optional
+
+
+GREETING = """
+🙏 **Welcome to Tata Capital!**
+
+Hello! I'm your personal loan assistant. I'm here to help you get a personal loan quickly and easily.
+
+**Here's how I can help you:**
+✅ Check your pre-approved loan offers
+✅ Provide instant loan approval
+✅ Calculate EMI options
+✅ Generate sanction letter
+
+**To get started, please enter your 10-digit mobile number (e.g., 9876543210):**
+""".strip()
+
+CUSTOMER_NOT_FOUND = """
+😔 **Customer Not Found**
+
+I couldn't find an account with phone number {phone}.
+
+**To apply for a loan, you can:**
+• Visit our website: www.tatacapital.com
+• Call us: 1800-123-4567
+• Visit nearest branch
+
+Thank you for your interest!
+""".strip()
+
+CUSTOMER_QUALIFIED = """
+✅ **Welcome back, {name}!**
+
+Great news! You have a **pre-approved loan offer** of up to **₹{pre_approved_limit:,.0f}**!
+
+**To help you better, I need to know:**
+
+1️⃣ **How much loan amount do you need?** (in ₹)
+2️⃣ **What tenure would you prefer?** (12, 24, 36, 48, or 60 months)
+
+Please tell me the amount and tenure. For example: "I need 200000 for 24 months" or "3 lakhs for 3 years"
+""".strip()
+
+OFFER_PRESENTED = """
+{rate_message}
+
+**📋 Your Personalized Loan Offer:**
+
+💰 **Loan Amount:** ₹{amount:,.0f}
+⏱️ **Tenure:** {tenure} months ({years} years)
+📊 **Interest Rate:** {interest_rate}% per annum
+💳 **Monthly EMI:** ₹{emi:,.2f}
+📈 **Total Payable:** ₹{total_payable:,.2f}
+
+**✅ Key Benefits:**
+• Instant approval for pre-approved customers
+• Flexible repayment options
+• No hidden charges
+• Quick disbursement within 24-48 hours
+
+**💡 Processing Fee:** {processing_fee_percent}% + GST (deducted from loan amount)
+
+Would you like to proceed with this offer? You can also choose a different tenure if you prefer.
+""".strip()
+
+OFFER_CONFIRMATION = OFFER_PRESENTED + "\n\n**Type 'yes' to proceed or 'change tenure' to modify.**"
+
+APPLICATION_CANCELLED = """
+🚫 **Application Cancelled**
+
+Your loan application has been cancelled as requested.
+
+Thank you for your interest in Tata Capital. You can start a new application anytime by refreshing the page.
+
+If you have any questions, please contact us at:
+📞 1800-123-4567
+📧 support@tatacapital.com
+
+Have a great day! 🙏
+""".strip()
+
+SANCTION_GENERATED = """
+🎊 **Sanction Letter Generated Successfully!** 🎊
+
+Dear {name},
+
+Congratulations! Your loan has been sanctioned. Here are your loan details:
+
+**📄 Sanction ID:** {sanction_id}
+**💰 Sanctioned Amount:** Rs. {amount:,.0f}
+**⏱️ Tenure:** {tenure} months
+**💳 Monthly EMI:** Rs. {emi:,.2f}
+**📊 Interest Rate:** {interest_rate}% p.a.
+
+**📥 Download Your Sanction Letter:**
+Your official sanction letter is ready! Click the download button below to get your PDF.
+
+**🎯 Next Steps:**
+1. Download and review your sanction letter
+2. Our team will contact you within 24 hours
+3. Complete documentation process
+4. Funds will be disbursed within 48 hours
+
+**📞 Need Help?**
+Contact us at: 1800-123-4567
+Email: support@tatacapital.com
+
+Thank you for choosing Tata Capital! We're excited to serve you. 🙏
+""".strip()
+
+# Opening line of the offer, chosen by credit tier
+RATE_MESSAGES = {
+    "excellent": "🌟 Congratulations! Your excellent credit score qualifies you for our **best interest rate**!",
+    "good": "✨ Great news! Your good credit score qualifies you for a **competitive interest rate**!",
+    "fair": "👍 You qualify for our personal loan with a fair interest rate."
+}
+
+TEMPLATES: Dict[str, str] = {
+    "greeting": GREETING,
+    "customer_not_found": CUSTOMER_NOT_FOUND,
+    "customer_qualified": CUSTOMER_QUALIFIED,
+    "offer_presented": OFFER_PRESENTED,
+    "offer_confirmation": OFFER_CONFIRMATION,
+    "application_cancelled": APPLICATION_CANCELLED,
+    "sanction_generated": SANCTION_GENERATED
+}
+
+
+def render_template(template_id: str, params: Optional[dict] = None) -> str:
+    """
+    Render a message template
+
+    Args:
+        template_id: Key in TEMPLATES
+        params: Template parameters (a 'credit_tier' expands to 'rate_message')
+
+    Returns:
+        Rendered markdown message
+    """
+    params = dict(params or {})
+    if "credit_tier" in params:
+        params["rate_message"] = RATE_MESSAGES[params["credit_tier"]]
+    return TEMPLATES[template_id].format(**params)
+
+
+def render_turn(turn: dict) -> dict:
+    """
+    Expand a stored history turn into {"role", "content"}
+
+    Args:
+        turn: Stored turn, either with 'content' or with 'template' and 'params'
+
+    Returns:
+        Turn with rendered content
+    """
+    if "template" in turn:
+        return {
+            "role": turn["role"],
+            "content": render_template(turn["template"], turn.get("params"))
+        }
+    return {"role": turn["role"], "content": turn["content"]}
@@ -0,0 +1,265 @@
+"""
+Read-through caches for CRM and credit bureau lookups
+
+Each cache wraps a loader (the call to the source system) and keeps its
+results for a per-source TTL. Not-found results (None) are cached too, for
+a shorter negative TTL, so repeated lookups of an unknown phone do not hit
+the source. Concurrent misses for the same key are coalesced into one
+load (single flight); loader errors are passed to every waiter and are not
+cached.
+
+ReadThroughCache serves synchronous loaders (threads) and
+AsyncReadThroughCache coroutine loaders (one event loop).
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import threading
+import time
+
+from models import Customer
+import config
+
+_caches: List["_CacheCore"] = []
+
+
+class _CacheCore:
+    """Entries, expiry, LRU eviction and metrics shared by both cache kinds"""
+
+    def __init__(self, name: str, ttl: float, negative_ttl: float, max_entries: int):
+        self.name = name
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "coalesced": 0,
+                       "loads": 0, "errors": 0, "evictions": 0}
+        _caches.append(self)
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """(found, value) for a fresh entry; caller holds the lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        self._stats["negative_hits" if value is None else "hits"] += 1
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Cache a loaded value; caller holds the lock"""
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key (e.g. after the source record changed)"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Entry count, hit / miss counters and hit rate (share of lookups that did not load)"""
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries))
+        served = stats["hits"] + stats["negative_hits"] + stats["coalesced"]
+        lookups = served + stats["misses"]
+        stats["hit_rate"] = round(served / lookups, 4) if lookups else 0.0
+        return stats
+
+
+class ReadThroughCache(_CacheCore):
+    """Read-through cache in front of a blocking loader, safe across threads"""
+
+    def __init__(self, name: str, loader: Callable[[Hashable], Any], ttl: float,
+                 negative_ttl: float = config.NEGATIVE_CACHE_TTL_SECONDS,
+                 max_entries: int = config.LOOKUP_CACHE_MAX_ENTRIES):
+        """
+        Initialize cache
+
+        Args:
+            name: Name reported in cache_stats()
+            loader: Fetches one key from the source (None: not found)
+            ttl: Seconds a found value is served from the cache
+            negative_ttl: Seconds a not-found result is served from the cache
+            max_entries: Least recently used entries are dropped beyond this
+        """
+        super().__init__(name, ttl, negative_ttl, max_entries)
+        self.loader = loader
+        self._inflight: Dict[Hashable, Future] = {}
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Cached value for key, loading it on a miss
+
+        Raises:
+            Exception: Whatever the loader raised (not cached)
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = Future()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return pending.result()
+
+        try:
+            value = self.loader(key)
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                del self._inflight[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._stats["loads"] += 1
+            self._store(key, value)
+            del self._inflight[key]
+        pending.set_result(value)
+        return value
+
+
+class AsyncReadThroughCache(_CacheCore):
+    """Read-through cache in front of a coroutine loader, used from one event loop"""
+
+    def __init__(self, name: str, loader: Callable[[Hashable], Awaitable[Any]], ttl: float,
+                 negative_ttl: float = config.NEGATIVE_CACHE_TTL_SECONDS,
+                 max_entries: int = config.LOOKUP_CACHE_MAX_ENTRIES):
+        """
+        Initialize cache
+
+        Args:
+            name: Name reported in cache_stats()
+            loader: Coroutine fetching one key from the source (None: not found)
+            ttl: Seconds a found value is served from the cache
+            negative_ttl: Seconds a not-found result is served from the cache
+            max_entries: Least recently used entries are dropped beyond this
+        """
+        super().__init__(name, ttl, negative_ttl, max_entries)
+        self.loader = loader
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable) -> Any:
+        """
+        Cached value for key, loading it on a miss
+
+        Raises:
+            Exception: Whatever the loader raised (not cached)
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = asyncio.get_running_loop().create_future()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return await asyncio.shield(pending)  # A cancelled waiter must not cancel the shared load
+
+        try:
+            value = await self.loader(key)
+        except BaseException as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                del self._inflight[key]
+            if isinstance(e, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(e)
+                pending.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        with self._lock:
+            self._stats["loads"] += 1
+            self._store(key, value)
+            del self._inflight[key]
+        pending.set_result(value)
+        return value
+
+
+class CachedCRM:
+    """
+    CRM with read-through caching of the per-customer lookups
+
+    Phone and ID lookups are cached for config.CRM_CACHE_TTL_SECONDS (unknown
+    phones for the negative TTL). Range and city queries go to the CRM
+    directly. upsert_customer writes through and invalidates the customer's
+    old and new keys.
+    """
+
+    def __init__(self, crm, ttl: float = config.CRM_CACHE_TTL_SECONDS):
+        """
+        Wrap a CRM
+
+        Args:
+            crm: CRM implementation (see mocks.crm_service.CRM)
+            ttl: Seconds a customer profile is served from the cache
+        """
+        self.crm = crm
+        self._by_phone = ReadThroughCache("crm_phone", crm.get_customer_by_phone, ttl)
+        self._by_id = ReadThroughCache("crm_id", crm.get_customer_by_id, ttl)
+
+    def get_customer_by_phone(self, phone: str) -> Optional[Customer]:
+        """Fetch customer profile by phone number (cached)"""
+        return self._by_phone.get(phone)
+
+    def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
+        """Fetch customer profile by customer ID (cached)"""
+        return self._by_id.get(customer_id)
+
+    def get_customer_by_email(self, email: str) -> Optional[Customer]:
+        """Fetch customer profile by email address"""
+        return self.crm.get_customer_by_email(email)
+
+    def get_customers_by_city(self, city: str) -> List[Customer]:
+        """Fetch all customers in a city"""
+        return self.crm.get_customers_by_city(city)
+
+    def get_customers_by_credit_score(self, min_score: Optional[int] = None,
+                                      max_score: Optional[int] = None) -> List[Customer]:
+        """Fetch customers within a credit score range"""
+        return self.crm.get_customers_by_credit_score(min_score, max_score)
+
+    def get_customers_by_pre_approved_limit(self, min_limit: Optional[float] = None,
+                                            max_limit: Optional[float] = None) -> List[Customer]:
+        """Fetch customers within a pre-approved limit range"""
+        return self.crm.get_customers_by_pre_approved_limit(min_limit, max_limit)
+
+    def upsert_customer(self, customer: Customer) -> None:
+        """Write the customer to the CRM and drop its cached lookups"""
+        old = self.crm.get_customer_by_id(customer.id)
+        self.crm.upsert_customer(customer)
+        for phone in {customer.phone, old.phone if old else customer.phone}:
+            self._by_phone.invalidate(phone)
+        self._by_id.invalidate(customer.id)
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """Metrics of every read-through cache, by name"""
+    return {cache.name: cache.get_stats() for cache in _caches}
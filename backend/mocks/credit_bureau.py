@@ -1,16 +1,38 @@
 """Mock Credit Bureau API"""
 
 from typing import Optional
+from mocks.cache import ReadThroughCache
 from mocks.crm_service import crm_service
+import config
 
 
 class CreditBureauService:
     """Mock credit bureau service"""
     
+    def __init__(self):
+        """Initialize service with a read-through score cache"""
+        self._scores = ReadThroughCache("credit_bureau", self._fetch_credit_score,
+                                        config.CREDIT_BUREAU_CACHE_TTL_SECONDS)
+    
     def get_credit_score(self, phone: str) -> Optional[int]:
         """
         Fetch credit score for a customer
         
+        Scores are cached for config.CREDIT_BUREAU_CACHE_TTL_SECONDS (unknown
+        phones for config.NEGATIVE_CACHE_TTL_SECONDS).
+        
+        Args:
+            phone: Customer's phone number
+            
+        Returns:
+            Credit score (0-900) or None if not found
+        """
+        return self._scores.get(phone)
+    
+    def _fetch_credit_score(self, phone: str) -> Optional[int]:
+        """
+        Fetch credit score from the bureau
+        
         In a real system, this would call CIBIL/Experian/Equifax API
         For this mock, we fetch from our customer data
         
@@ -1,48 +1,265 @@
 """Mock CRM service"""
 
 import json
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
+import threading
 from models import Customer
+from mocks.cache import CachedCRM
 import config
 
 
+class CRM(Protocol):
+    """
+    Customer lookups the agents and back-office tools rely on
+
+    Implementations must be safe to call from multiple threads.
+    """
+
+    def get_customer_by_phone(self, phone: str) -> Optional[Customer]:
+        """Customer with this phone number, or None"""
+        ...
+
+    def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
+        """Customer with this ID, or None"""
+        ...
+
+    def get_customer_by_email(self, email: str) -> Optional[Customer]:
+        """Customer with this email address (case-insensitive), or None"""
+        ...
+
+    def get_customers_by_city(self, city: str) -> List[Customer]:
+        """Customers in a city (case-insensitive)"""
+        ...
+
+    def get_customers_by_credit_score(self, min_score: Optional[int] = None,
+                                      max_score: Optional[int] = None) -> List[Customer]:
+        """Customers with min_score <= credit score <= max_score, lowest first"""
+        ...
+
+    def get_customers_by_pre_approved_limit(self, min_limit: Optional[float] = None,
+                                            max_limit: Optional[float] = None) -> List[Customer]:
+        """Customers with min_limit <= pre-approved limit <= max_limit, lowest first"""
+        ...
+
+    def upsert_customer(self, customer: Customer) -> None:
+        """Insert a customer or replace the one with the same ID"""
+        ...
+
+
+class SortedIndex:
+    """Customer IDs ordered by one numeric attribute, for range queries"""
+
+    def __init__(self, entries: Iterable[Tuple[float, str]] = ()):
+        """
+        Initialize index
+
+        Args:
+            entries: Initial (key, customer_id) pairs, sorted once here
+        """
+        self._entries: List[Tuple[float, str]] = sorted(entries)  # (key, customer_id)
+        self._keys: List[float] = [key for key, _ in self._entries]  # Parallel to _entries
+
+    def add(self, key: float, customer_id: str) -> None:
+        """Index a customer under key"""
+        pos = bisect_right(self._entries, (key, customer_id))
+        self._keys.insert(pos, key)
+        self._entries.insert(pos, (key, customer_id))
+
+    def remove(self, key: float, customer_id: str) -> None:
+        """Drop a customer indexed under key (no-op if absent)"""
+        pos = bisect_left(self._entries, (key, customer_id))
+        if pos < len(self._entries) and self._entries[pos] == (key, customer_id):
+            del self._keys[pos]
+            del self._entries[pos]
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> List[str]:
+        """IDs with low <= key <= high (either bound optional), in key order"""
+        start = bisect_left(self._keys, low) if low is not None else 0
+        end = bisect_right(self._keys, high) if high is not None else len(self._keys)
+        return [customer_id for _, customer_id in self._entries[start:end]]
+
+
 class CRMService:
-    """Mock CRM service to fetch customer data"""
-    
-    def __init__(self):
-        """Load customer data from mock JSON file"""
-        with open(config.MOCK_DATA_PATH, 'r') as f:
+    """
+    Mock CRM service to fetch customer data
+
+    Customers are held by ID with hash indexes on phone, email and city and
+    sorted indexes on credit score and pre-approved limit. The indexes are
+    built in one pass at load and kept in step by upsert_customer.
+    """
+
+    def __init__(self, data_path: Optional[Path] = config.MOCK_DATA_PATH):
+        """
+        Load customer data from mock JSON file
+
+        Args:
+            data_path: Mock CRM export with a 'customers' list (None: start empty)
+        """
+        self.customers: Dict[str, Customer] = {}  # By customer ID
+        self._by_phone: Dict[str, str] = {}
+        self._by_email: Dict[str, str] = {}
+        self._by_city: Dict[str, Dict[str, None]] = {}  # City -> customer IDs (insertion ordered)
+        self._by_credit_score = SortedIndex()
+        self._by_pre_approved_limit = SortedIndex()
+        self._lock = threading.RLock()
+
+        if data_path is None:
+            return
+        with open(data_path, 'r') as f:
             data = json.load(f)
-            self.customers = {c['phone']: Customer(**c) for c in data['customers']}
-    
+        for c in data['customers']:
+            customer = Customer(**c)
+            self._index_customer(customer, customer.email.strip().lower(), customer.city.strip().lower())
+        self._by_credit_score = SortedIndex((c.credit_score, c.id) for c in self.customers.values())
+        self._by_pre_approved_limit = SortedIndex((c.pre_approved_limit, c.id) for c in self.customers.values())
+
+    def _index_customer(self, customer: Customer, email: str, city: str) -> None:
+        """Store a customer and its hash index entries (sorted indexes are the caller's)"""
+        self.customers[customer.id] = customer
+        self._by_phone[customer.phone] = customer.id
+        self._by_email[email] = customer.id
+        self._by_city.setdefault(city, {})[customer.id] = None
+
     def get_customer_by_phone(self, phone: str) -> Optional[Customer]:
         """
         Fetch customer profile by phone number
-        
+
         Args:
             phone: Customer's phone number
-            
+
         Returns:
             Customer object if found, None otherwise
         """
-        return self.customers.get(phone)
-    
+        customer_id = self._by_phone.get(phone)
+        return self.customers.get(customer_id) if customer_id else None
+
     def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
         """
         Fetch customer profile by customer ID
-        
+
         Args:
             customer_id: Customer's ID
-            
+
         Returns:
             Customer object if found, None otherwise
         """
-        for customer in self.customers.values():
-            if customer.id == customer_id:
-                return customer
-        return None
+        return self.customers.get(customer_id)
+
+    def get_customer_by_email(self, email: str) -> Optional[Customer]:
+        """
+        Fetch customer profile by email address
+
+        Args:
+            email: Customer's email (case-insensitive)
+
+        Returns:
+            Customer object if found, None otherwise
+        """
+        customer_id = self._by_email.get(email.strip().lower())
+        return self.customers.get(customer_id) if customer_id else None
+
+    def get_customers_by_city(self, city: str) -> List[Customer]:
+        """
+        Fetch all customers in a city
+
+        Args:
+            city: City name (case-insensitive)
+
+        Returns:
+            Customers in load / insertion order
+        """
+        with self._lock:
+            return [self.customers[i] for i in self._by_city.get(city.strip().lower(), ())]
+
+    def get_customers_by_credit_score(self, min_score: Optional[int] = None,
+                                      max_score: Optional[int] = None) -> List[Customer]:
+        """
+        Fetch customers within a credit score range
+
+        Args:
+            min_score: Lowest score included (None: no lower bound)
+            max_score: Highest score included (None: no upper bound)
+
+        Returns:
+            Customers ordered by credit score
+        """
+        with self._lock:
+            return [self.customers[i] for i in self._by_credit_score.range(min_score, max_score)]
+
+    def get_customers_by_pre_approved_limit(self, min_limit: Optional[float] = None,
+                                            max_limit: Optional[float] = None) -> List[Customer]:
+        """
+        Fetch customers within a pre-approved limit range
+
+        Args:
+            min_limit: Lowest limit included (None: no lower bound)
+            max_limit: Highest limit included (None: no upper bound)
+
+        Returns:
+            Customers ordered by pre-approved limit
+        """
+        with self._lock:
+            return [self.customers[i] for i in self._by_pre_approved_limit.range(min_limit, max_limit)]
+
+    def upsert_customer(self, customer: Customer) -> None:
+        """
+        Insert a customer, or replace the profile with the same ID
+
+        Only the index entries whose attribute changed are touched.
+
+        Args:
+            customer: Customer profile
+
+        Raises:
+            ValueError: If the phone or email already belongs to another customer
+        """
+        email = customer.email.strip().lower()
+        city = customer.city.strip().lower()
+        with self._lock:
+            for index, key, field in ((self._by_phone, customer.phone, "Phone"), (self._by_email, email, "Email")):
+                owner = index.get(key)
+                if owner is not None and owner != customer.id:
+                    raise ValueError(f"{field} {key} already belongs to customer {owner}")
+
+            old = self.customers.get(customer.id)
+            if old is not None:
+                old_email = old.email.strip().lower()
+                old_city = old.city.strip().lower()
+                if old.phone != customer.phone:
+                    del self._by_phone[old.phone]
+                if old_email != email:
+                    del self._by_email[old_email]
+                if old_city != city:
+                    del self._by_city[old_city][old.id]
+                    if not self._by_city[old_city]:
+                        del self._by_city[old_city]
+                if old.credit_score != customer.credit_score:
+                    self._by_credit_score.remove(old.credit_score, old.id)
+                if old.pre_approved_limit != customer.pre_approved_limit:
+                    self._by_pre_approved_limit.remove(old.pre_approved_limit, old.id)
+
+            self._index_customer(customer, email, city)
+            if old is None or old.credit_score != customer.credit_score:
+                self._by_credit_score.add(customer.credit_score, customer.id)
+            if old is None or old.pre_approved_limit != customer.pre_approved_limit:
+                self._by_pre_approved_limit.add(customer.pre_approved_limit, customer.id)
+
+
+def create_crm_service() -> CRM:
+    """
+    Build the CRM selected by config.CRM_SNAPSHOT_PATH
+
+    Returns:
+        The memory-mapped snapshot when one is configured, otherwise the
+        JSON-backed CRMService, behind a read-through cache
+    """
+    if config.CRM_SNAPSHOT_PATH:
+        from mocks.crm_snapshot import CRMSnapshotService
+        return CachedCRM(CRMSnapshotService(config.CRM_SNAPSHOT_PATH))
+    return CachedCRM(CRMService())
 
 
 # Singleton instance
-crm_service = CRMService()
+crm_service = create_crm_service()
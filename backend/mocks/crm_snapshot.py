@@ -0,0 +1,336 @@
+"""
+Columnar, memory-mapped CRM snapshot
+
+A snapshot is a directory produced once from a CRM export:
+
+    manifest.json                 Format version, row count, source
+    columns/<field>.npy           One array per Customer field (numbers as
+                                  int64 / float64, text as UTF-8 fixed-width bytes)
+    index/<name>_keys.npy         Sorted lookup keys
+    index/<name>_rows.npy         Row of each key
+
+Every array is opened with np.load(mmap_mode="r"), so loading reads only
+the manifest, and workers on one host share the pages through the page
+cache. Lookups binary-search an index and build a Customer for the rows
+they return, nothing else.
+
+Build one with:
+    python -m mocks.crm_snapshot ../mock_data.json ../data/crm_snapshot
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from models import Customer
+from mocks.crm_service import CRMService
+
+SNAPSHOT_FORMAT = 1
+
+INT_FIELDS = ("age", "credit_score", "current_loans")
+FLOAT_FIELDS = ("monthly_salary", "pre_approved_limit")
+TEXT_FIELDS = ("id", "name", "city", "phone", "email", "kyc_status", "address")
+
+# Index name -> (column, case-insensitive)
+TEXT_INDEXES = {"id": ("id", False), "phone": ("phone", False), "email": ("email", True), "city": ("city", True)}
+NUMBER_INDEXES = ("credit_score", "pre_approved_limit")
+
+
+def _text_key(value: str, fold_case: bool) -> bytes:
+    """Index key for a text value"""
+    value = value.strip()
+    return (value.lower() if fold_case else value).encode("utf-8")
+
+
+def build_snapshot(records: Iterable[dict], snapshot_dir: Path, source: str = "") -> int:
+    """
+    Write a snapshot from customer records
+
+    The snapshot is written next to snapshot_dir and swapped in at the end,
+    so a running service keeps reading the old files until it reloads.
+
+    Args:
+        records: Customer dicts (the 'customers' entries of a CRM export)
+        snapshot_dir: Directory to create or replace
+        source: Where the records came from (kept in the manifest)
+
+    Returns:
+        Number of customers written
+
+    Raises:
+        ValueError: If a record is not a valid Customer
+    """
+    fields = INT_FIELDS + FLOAT_FIELDS + TEXT_FIELDS
+    values: Dict[str, list] = {field: [] for field in fields}
+    for record in records:
+        customer = Customer(**record)
+        for field in fields:
+            values[field].append(getattr(customer, field))
+
+    columns = {field: np.array(values[field], dtype=np.int64) for field in INT_FIELDS}
+    columns.update({field: np.array(values[field], dtype=np.float64) for field in FLOAT_FIELDS})
+    columns.update({field: np.array([v.encode("utf-8") for v in values[field]], dtype=bytes)
+                    for field in TEXT_FIELDS})
+    rows = len(values["id"])
+
+    indexes = {}
+    for name, (field, fold_case) in TEXT_INDEXES.items():
+        keys = np.array([_text_key(v, fold_case) for v in values[field]], dtype=bytes)
+        order = np.argsort(keys, kind="stable")
+        indexes[name] = (keys[order], order)
+    for name in NUMBER_INDEXES:
+        order = np.argsort(columns[name], kind="stable")
+        indexes[name] = (columns[name][order], order)
+
+    snapshot_dir = Path(snapshot_dir)
+    staging = snapshot_dir.with_name(snapshot_dir.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    (staging / "columns").mkdir(parents=True)
+    (staging / "index").mkdir()
+    for field, column in columns.items():
+        np.save(staging / "columns" / f"{field}.npy", column)
+    for name, (keys, order) in indexes.items():
+        np.save(staging / "index" / f"{name}_keys.npy", keys)
+        np.save(staging / "index" / f"{name}_rows.npy", order.astype(np.int64))
+    with open(staging / "manifest.json", "w") as f:
+        json.dump({"format": SNAPSHOT_FORMAT, "rows": rows, "source": source,
+                   "created_at": time.time()}, f, indent=2)
+
+    retired = snapshot_dir.with_name(snapshot_dir.name + ".old")
+    shutil.rmtree(retired, ignore_errors=True)
+    if snapshot_dir.exists():
+        os.rename(snapshot_dir, retired)
+    os.rename(staging, snapshot_dir)
+    shutil.rmtree(retired, ignore_errors=True)  # Open memory maps keep the old files alive
+    return rows
+
+
+class CRMSnapshot:
+    """Read-only view of a snapshot directory"""
+
+    def __init__(self, snapshot_dir: Path):
+        """
+        Open a snapshot (memory-maps the arrays, reads only the manifest)
+
+        Args:
+            snapshot_dir: Directory written by build_snapshot
+
+        Raises:
+            ValueError: If the snapshot format is not supported
+        """
+        self.path = Path(snapshot_dir)
+        with open(self.path / "manifest.json", "r") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported CRM snapshot format {self.manifest.get('format')} in {self.path}")
+        self.rows = int(self.manifest["rows"])
+
+        def load(name: str) -> np.ndarray:
+            return np.load(self.path / name, mmap_mode="r")
+
+        self._columns = {field: load(f"columns/{field}.npy")
+                         for field in INT_FIELDS + FLOAT_FIELDS + TEXT_FIELDS}
+        self._indexes = {name: (load(f"index/{name}_keys.npy"), load(f"index/{name}_rows.npy"))
+                         for name in list(TEXT_INDEXES) + list(NUMBER_INDEXES)}
+
+    def column(self, field: str) -> np.ndarray:
+        """Read-only array of one field for every row (e.g. for evaluate_batch)"""
+        return self._columns[field]
+
+    def customer(self, row: int) -> Customer:
+        """Materialize one row"""
+        data = {field: int(self._columns[field][row]) for field in INT_FIELDS}
+        data.update({field: float(self._columns[field][row]) for field in FLOAT_FIELDS})
+        data.update({field: self._columns[field][row].decode("utf-8") for field in TEXT_FIELDS})
+        return Customer(**data)
+
+    def customer_id(self, row: int) -> str:
+        """ID of a row, without materializing it"""
+        return self._columns["id"][row].decode("utf-8")
+
+    def find(self, index: str, value: str) -> np.ndarray:
+        """
+        Rows whose indexed text equals value
+
+        Args:
+            index: One of TEXT_INDEXES
+            value: Value to look up (case-insensitive for email and city)
+
+        Returns:
+            Matching rows in snapshot order
+        """
+        keys, rows = self._indexes[index]
+        key = _text_key(value, TEXT_INDEXES[index][1])
+        if len(key) > keys.dtype.itemsize:  # Longer than every stored key
+            return rows[:0]
+        return rows[np.searchsorted(keys, key, "left"):np.searchsorted(keys, key, "right")]
+
+    def range(self, index: str, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """
+        Rows with low <= indexed number <= high, in key order
+
+        Args:
+            index: One of NUMBER_INDEXES
+            low: Lower bound (None: unbounded)
+            high: Upper bound (None: unbounded)
+        """
+        keys, rows = self._indexes[index]
+        start = np.searchsorted(keys, low, "left") if low is not None else 0
+        end = np.searchsorted(keys, high, "right") if high is not None else len(keys)
+        return rows[start:end]
+
+
+class CRMSnapshotService:
+    """
+    CRM backed by a memory-mapped snapshot
+
+    Upserts go to an in-memory CRMService overlay that takes precedence over
+    the snapshot; snapshot rows whose customer was upserted are hidden.
+    """
+
+    def __init__(self, snapshot_dir: Path):
+        """
+        Open the snapshot
+
+        Args:
+            snapshot_dir: Directory written by build_snapshot
+        """
+        start = time.perf_counter()
+        self.snapshot = CRMSnapshot(snapshot_dir)
+        self.overlay = CRMService(None)
+        print(f"[CRM] Opened snapshot {self.snapshot.path} ({self.snapshot.rows:,} customers) "
+              f"in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def _visible(self, rows: np.ndarray) -> List[Customer]:
+        """Materialize snapshot rows not superseded by the overlay"""
+        customers = []
+        for row in rows.tolist():
+            if self.snapshot.customer_id(row) not in self.overlay.customers:
+                customers.append(self.snapshot.customer(row))
+        return customers
+
+    def _first(self, index: str, value: str) -> Optional[Customer]:
+        """First visible snapshot customer matching a text index"""
+        for row in self.snapshot.find(index, value).tolist():
+            if self.snapshot.customer_id(row) not in self.overlay.customers:
+                return self.snapshot.customer(row)
+        return None
+
+    def get_customer_by_phone(self, phone: str) -> Optional[Customer]:
+        """
+        Fetch customer profile by phone number
+
+        Args:
+            phone: Customer's phone number
+
+        Returns:
+            Customer object if found, None otherwise
+        """
+        return self.overlay.get_customer_by_phone(phone) or self._first("phone", phone)
+
+    def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
+        """
+        Fetch customer profile by customer ID
+
+        Args:
+            customer_id: Customer's ID
+
+        Returns:
+            Customer object if found, None otherwise
+        """
+        return self.overlay.get_customer_by_id(customer_id) or self._first("id", customer_id)
+
+    def get_customer_by_email(self, email: str) -> Optional[Customer]:
+        """
+        Fetch customer profile by email address
+
+        Args:
+            email: Customer's email (case-insensitive)
+
+        Returns:
+            Customer object if found, None otherwise
+        """
+        return self.overlay.get_customer_by_email(email) or self._first("email", email)
+
+    def get_customers_by_city(self, city: str) -> List[Customer]:
+        """
+        Fetch all customers in a city
+
+        Args:
+            city: City name (case-insensitive)
+
+        Returns:
+            Snapshot customers in snapshot order, then upserted ones
+        """
+        return self._visible(self.snapshot.find("city", city)) + self.overlay.get_customers_by_city(city)
+
+    def get_customers_by_credit_score(self, min_score: Optional[int] = None,
+                                      max_score: Optional[int] = None) -> List[Customer]:
+        """
+        Fetch customers within a credit score range
+
+        Args:
+            min_score: Lowest score included (None: no lower bound)
+            max_score: Highest score included (None: no upper bound)
+
+        Returns:
+            Customers ordered by credit score
+        """
+        customers = (self._visible(self.snapshot.range("credit_score", min_score, max_score))
+                     + self.overlay.get_customers_by_credit_score(min_score, max_score))
+        return sorted(customers, key=lambda customer: customer.credit_score)
+
+    def get_customers_by_pre_approved_limit(self, min_limit: Optional[float] = None,
+                                            max_limit: Optional[float] = None) -> List[Customer]:
+        """
+        Fetch customers within a pre-approved limit range
+
+        Args:
+            min_limit: Lowest limit included (None: no lower bound)
+            max_limit: Highest limit included (None: no upper bound)
+
+        Returns:
+            Customers ordered by pre-approved limit
+        """
+        customers = (self._visible(self.snapshot.range("pre_approved_limit", min_limit, max_limit))
+                     + self.overlay.get_customers_by_pre_approved_limit(min_limit, max_limit))
+        return sorted(customers, key=lambda customer: customer.pre_approved_limit)
+
+    def upsert_customer(self, customer: Customer) -> None:
+        """
+        Insert a customer, or replace the profile with the same ID
+
+        Args:
+            customer: Customer profile
+
+        Raises:
+            ValueError: If the phone or email already belongs to another customer
+        """
+        for field, owner in (("Phone", self.get_customer_by_phone(customer.phone)),
+                             ("Email", self.get_customer_by_email(customer.email))):
+            if owner is not None and owner.id != customer.id:
+                raise ValueError(f"{field} {getattr(customer, field.lower())} already belongs to customer {owner.id}")
+        self.overlay.upsert_customer(customer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a columnar CRM snapshot from a JSON export")
+    parser.add_argument("source", type=Path, help="JSON export with a 'customers' list")
+    parser.add_argument("snapshot_dir", type=Path, help="Snapshot directory to create or replace")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(args.source, "r") as f:
+        records = json.load(f)["customers"]
+    rows = build_snapshot(records, args.snapshot_dir, source=str(args.source))
+    print(f"[CRM] Wrote {rows:,} customers to {args.snapshot_dir} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
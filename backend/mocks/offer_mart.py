@@ -1,43 +1,96 @@
 """Mock Offer Mart service"""
 
-from typing import List, Dict
-from utils.emi_calculator import get_interest_rate
+from typing import Dict, Optional, Tuple
+import threading
+
+from pydantic import ValidationError
+
+from models import OfferCatalogue, TierOffer
+from policy import policy_store, UnderwritingPolicy
+from reloading import ReloadingJSONFile
 import config
 
 
+class OfferCatalogueStore(ReloadingJSONFile[OfferCatalogue]):
+    """
+    Current offer catalogue, reloaded when its file changes
+
+    The file's modification time is checked at most once per
+    config.POLICY_RELOAD_INTERVAL. A file that fails to load is reported and
+    the previous catalogue stays in force.
+    """
+
+    log_tag = "Offer Mart"
+    description = "offer catalogue"
+
+    def _compile(self, data: dict) -> OfferCatalogue:
+        """Validate the parsed catalogue file"""
+        try:
+            return OfferCatalogue(**data)
+        except (ValidationError, TypeError) as e:
+            raise ValueError(f"{type(e).__name__}: {e}") from e
+
+
 class OfferMartService:
-    """Mock offer mart service to fetch loan offers"""
-    
-    def get_offers(self, customer_id: str, credit_score: int) -> Dict:
+    """
+    Mock offer mart service to fetch loan offers
+
+    Offers depend only on the customer's rate tier, so there is one immutable
+    TierOffer per tier, built on first use and handed out by reference. They
+    are rebuilt when the catalogue or the underwriting policy is reloaded.
+    """
+
+    def __init__(self, catalogue_store: OfferCatalogueStore):
+        """
+        Initialize service
+
+        Args:
+            catalogue_store: Source of the current offer catalogue
+        """
+        self.catalogue_store = catalogue_store
+        # (catalogue, policy) the offers were built from, and the offers by tier
+        self._state: Tuple[Tuple[Optional[OfferCatalogue], Optional[UnderwritingPolicy]], Dict[str, TierOffer]] = \
+            ((None, None), {})
+        self._lock = threading.Lock()
+
+    def get_offers(self, customer_id: str, credit_score: int) -> TierOffer:
         """
         Get available loan offers for a customer
-        
+
         Args:
-            customer_id: Customer's ID
+            customer_id: Customer's ID (offers are per rate tier in this mock)
             credit_score: Customer's credit score
-            
+
         Returns:
-            Dictionary with offer details
+            Shared TierOffer for the customer's rate tier
         """
-        interest_rate = get_interest_rate(credit_score)
-        
-        return {
-            "customer_id": customer_id,
-            "interest_rate": interest_rate,
-            "tenure_options": config.TENURE_OPTIONS,
-            "processing_fee_percent": 2.0,
-            "prepayment_charges": {
-                "within_12_months": 4.0,
-                "after_12_months": 2.0
-            },
-            "features": [
-                "Instant approval for pre-approved customers",
-                "Flexible tenure options",
-                "No hidden charges",
-                "Quick disbursement"
-            ]
-        }
-
-
-# Singleton instance
-offer_mart_service = OfferMartService()
+        catalogue = self.catalogue_store.get()
+        policy = policy_store.get()
+        tier = policy.tier(credit_score)
+
+        built_from, offers = self._state
+        current = built_from[0] is catalogue and built_from[1] is policy
+        offer = offers.get(tier)
+        if offer is not None and current:
+            return offer
+
+        with self._lock:
+            built_from, offers = self._state
+            if not (built_from[0] is catalogue and built_from[1] is policy):
+                offers = {}
+                self._state = ((catalogue, policy), offers)
+            offer = offers.get(tier)
+            if offer is None:
+                offer = offers[tier] = TierOffer(
+                    tier=tier,
+                    interest_rate=policy.interest_rate(credit_score),
+                    tenure_options=tuple(config.TENURE_OPTIONS),
+                    policy_version=policy.version,
+                    catalogue=catalogue
+                )
+        return offer
+
+
+# Singleton instances
+offer_catalogue_store = OfferCatalogueStore(config.OFFER_CATALOGUE_PATH)
+offer_mart_service = OfferMartService(offer_catalogue_store)
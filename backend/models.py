@@ -1,7 +1,7 @@
 """Data models for the NBFC Loan System"""
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Literal
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Literal, Dict, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -60,6 +60,7 @@ class LoanApplication(BaseModel):
     decision: LoanDecision = LoanDecision.PENDING
     decision_reason: Optional[str] = None
     reason_code: Optional[str] = None
+    policy_version: Optional[str] = None  # Underwriting policy the decision was made under
     salary_slip_uploaded: bool = False
     salary_slip_url: Optional[str] = None
     parsed_salary: Optional[float] = None
@@ -75,9 +76,14 @@ class ConversationMemory(BaseModel):
     customer: Optional[Customer] = None
     application: Optional[LoanApplication] = None
     current_stage: ConversationStage = ConversationStage.GREETING
-    conversation_history: List[dict] = Field(default_factory=list)
+    conversation_history: List[dict] = Field(default_factory=list)  # Most recent turns only
+    history_offset: int = 0  # Number of older turns spilled to the history archive
     context: dict = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    revision: int = 0  # Incremented on every write
+    # Revision at which 'stage', 'customer' or each 'application.<field>' last changed
+    change_log: Dict[str, int] = Field(default_factory=dict)
 
 
 class ChatMessage(BaseModel):
@@ -96,6 +102,9 @@ class ChatResponse(BaseModel):
     input_type: Optional[Literal["text", "file", "choice"]] = "text"
     choices: Optional[List[str]] = None
     metadata: Optional[dict] = None
+    # Set when the message was rendered from message_templates; kept out of the API payload
+    template_id: Optional[str] = Field(default=None, exclude=True)
+    template_params: Optional[dict] = Field(default=None, exclude=True)
 
 
 class OfferDetails(BaseModel):
@@ -107,6 +116,43 @@ class OfferDetails(BaseModel):
     total_payable: float
 
 
+class PrepaymentCharges(BaseModel):
+    """Prepayment charges (percentage of the prepaid amount)"""
+    model_config = ConfigDict(frozen=True)
+
+    within_12_months: float
+    after_12_months: float
+
+
+class OfferCatalogue(BaseModel):
+    """Offer terms common to every customer, from the versioned catalogue file"""
+    model_config = ConfigDict(frozen=True)
+
+    version: str
+    processing_fee_percent: float
+    prepayment_charges: PrepaymentCharges
+    features: Tuple[str, ...]
+
+    def processing_fee(self, amount: float) -> float:
+        """Processing fee (in rupees) on a loan amount"""
+        return round(amount * self.processing_fee_percent / 100, 2)
+
+
+class TierOffer(BaseModel):
+    """Offer mart terms for one rate tier; shared by every customer in the tier"""
+    model_config = ConfigDict(frozen=True)
+
+    tier: str
+    interest_rate: float
+    tenure_options: Tuple[int, ...]
+    policy_version: str  # Underwriting policy the rate came from
+    catalogue: OfferCatalogue
+
+    def __deepcopy__(self, memo):
+        """Immutable, so copies of a session keep sharing this object"""
+        return self
+
+
 class SanctionRequest(BaseModel):
     """Request to generate sanction letter"""
     customer: Customer
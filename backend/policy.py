@@ -0,0 +1,133 @@
+"""
+Underwriting policy: loaded from a versioned rules file and compiled once
+
+The credit score cut-off, rate tiers, pre-approved multiplier and maximum
+EMI-to-salary ratio live in config.UNDERWRITING_POLICY_PATH. The file is
+compiled into an UnderwritingPolicy with the rate tiers as a sorted
+breakpoint table (bisect for one score, searchsorted for a column of
+scores). PolicyStore reloads it when the file changes, without a restart.
+"""
+
+from bisect import bisect_right
+from typing import List
+
+import numpy as np
+
+from reloading import ReloadingJSONFile
+import config
+
+
+class PolicyError(ValueError):
+    """Raised when a policy file is missing a field or is inconsistent"""
+
+
+class UnderwritingPolicy:
+    """Compiled, immutable underwriting rules"""
+
+    def __init__(self, version: str, min_credit_score: int, pre_approved_multiplier: float,
+                 max_emi_to_salary_ratio: float, rate_tiers: List[dict]):
+        """
+        Compile policy
+
+        Args:
+            version: Policy version recorded on every decision
+            min_credit_score: Applications below this are rejected
+            pre_approved_multiplier: Largest amount as a multiple of the
+                pre-approved limit (with salary verification)
+            max_emi_to_salary_ratio: Highest EMI as a fraction of salary
+            rate_tiers: {'tier', 'min_credit_score', 'interest_rate'} entries,
+                one of which must start at 0
+
+        Raises:
+            PolicyError: If a value is out of range or the tiers do not cover all scores
+        """
+        if not version:
+            raise PolicyError("version is required")
+        if pre_approved_multiplier < 1:
+            raise PolicyError("pre_approved_multiplier must be at least 1")
+        if not 0 < max_emi_to_salary_ratio <= 1:
+            raise PolicyError("max_emi_to_salary_ratio must be in (0, 1]")
+
+        tiers = sorted(rate_tiers, key=lambda tier: tier["min_credit_score"])
+        breakpoints = [int(tier["min_credit_score"]) for tier in tiers]
+        if not breakpoints or breakpoints[0] != 0:
+            raise PolicyError("rate_tiers must include a tier starting at credit score 0")
+        if len(set(breakpoints)) != len(breakpoints):
+            raise PolicyError("rate_tiers must have distinct min_credit_score values")
+        if any(tier["interest_rate"] <= 0 for tier in tiers):
+            raise PolicyError("interest rates must be positive")
+
+        self.version = str(version)
+        self.min_credit_score = int(min_credit_score)
+        self.pre_approved_multiplier = float(pre_approved_multiplier)
+        self.max_emi_to_salary_ratio = float(max_emi_to_salary_ratio)
+        self._breakpoints = breakpoints
+        self._rates = [float(tier["interest_rate"]) for tier in tiers]
+        self._tiers = [str(tier["tier"]) for tier in tiers]
+        self._breakpoint_array = np.array(breakpoints)
+        self._rate_array = np.array(self._rates)
+
+    @classmethod
+    def from_dict(cls, rules: dict) -> "UnderwritingPolicy":
+        """
+        Compile a parsed rules file
+
+        Raises:
+            PolicyError: If a field is missing or malformed
+        """
+        try:
+            return cls(
+                version=rules["version"],
+                min_credit_score=rules["min_credit_score"],
+                pre_approved_multiplier=rules["pre_approved_multiplier"],
+                max_emi_to_salary_ratio=rules["max_emi_to_salary_ratio"],
+                rate_tiers=rules["rate_tiers"]
+            )
+        except PolicyError:
+            raise
+        except (KeyError, TypeError, ValueError) as e:
+            raise PolicyError(f"{type(e).__name__}: {e}") from e
+
+    def interest_rate(self, credit_score: int) -> float:
+        """Annual interest rate (percentage) for a credit score"""
+        return self._rates[bisect_right(self._breakpoints, credit_score) - 1]
+
+    def tier(self, credit_score: int) -> str:
+        """Rate tier name for a credit score"""
+        return self._tiers[bisect_right(self._breakpoints, credit_score) - 1]
+
+    def interest_rates(self, credit_scores: np.ndarray) -> np.ndarray:
+        """Annual interest rates for a column of credit scores"""
+        return self._rate_array[np.searchsorted(self._breakpoint_array, credit_scores, side="right") - 1]
+
+    def max_eligible_amount(self, pre_approved_limit: float) -> float:
+        """Largest amount a customer can apply for (with salary verification)"""
+        return pre_approved_limit * self.pre_approved_multiplier
+
+
+class PolicyStore(ReloadingJSONFile[UnderwritingPolicy]):
+    """
+    Current underwriting policy, reloaded when its file changes
+
+    The file's modification time is checked at most once per
+    config.POLICY_RELOAD_INTERVAL. A file that fails to compile is reported
+    and the previous policy stays in force. Callers should get() the policy
+    once per decision and use that object throughout, so one decision never
+    mixes two versions.
+    """
+
+    error_type = PolicyError
+    log_tag = "Policy"
+    description = "underwriting policy"
+
+    def _compile(self, rules: dict) -> UnderwritingPolicy:
+        """Compile the parsed rules file"""
+        return UnderwritingPolicy.from_dict(rules)
+
+    def version(self) -> str:
+        """Version of the current policy"""
+        return self.get().version
+
+
+# Singleton instance
+policy_store = PolicyStore(config.UNDERWRITING_POLICY_PATH)
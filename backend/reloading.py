@@ -0,0 +1,94 @@
+"""Versioned JSON rules files that reload when they change, without a restart"""
+
+from pathlib import Path
+from typing import Generic, Type, TypeVar
+import json
+import os
+import threading
+import time
+
+import config
+
+
+T = TypeVar("T")
+
+
+class ReloadingJSONFile(Generic[T]):
+    """
+    Object compiled from a JSON file, reloaded when the file changes
+
+    The file's modification time is checked at most once per reload
+    interval. A file that fails to compile is reported and the previous
+    object stays in force. Subclasses implement _compile() and set the
+    error type it raises, the log tag and a description for messages; the
+    compiled object must have a .version.
+    """
+
+    error_type: Type[Exception] = ValueError
+    log_tag = "Config"
+    description = "file"
+
+    def __init__(self, path: Path, reload_interval: float = config.POLICY_RELOAD_INTERVAL):
+        """
+        Initialize and compile the file
+
+        Args:
+            path: JSON file
+            reload_interval: Seconds between modification checks
+
+        Raises:
+            error_type: If the file cannot be loaded at startup
+        """
+        self.path = Path(path)
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = os.stat(self.path).st_mtime_ns
+        self._current = self._load()
+        self._checked_at = time.monotonic()
+        print(f"[{self.log_tag}] Loaded {self.description} {self._current.version}")
+
+    def _compile(self, data) -> T:
+        """
+        Build the object from the parsed file
+
+        Raises:
+            error_type: If a field is missing or malformed
+        """
+        raise NotImplementedError
+
+    def _load(self) -> T:
+        """Read and compile the file"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise self.error_type(f"{type(e).__name__}: {e}") from e
+        return self._compile(data)
+
+    def get(self) -> T:
+        """Current object"""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return self._current
+
+        with self._lock:
+            if now - self._checked_at < self.reload_interval:
+                return self._current
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                print(f"[{self.log_tag}] ERROR: Cannot stat {self.path}: {e}; keeping {self._current.version}")
+                return self._current
+            if mtime != self._mtime:
+                self._mtime = mtime
+                try:
+                    current = self._load()
+                except self.error_type as e:
+                    print(f"[{self.log_tag}] ERROR: Invalid {self.description} file, "
+                          f"keeping {self._current.version}: {e}")
+                else:
+                    print(f"[{self.log_tag}] Reloaded {self.description} "
+                          f"{self._current.version} -> {current.version}")
+                    self._current = current
+        return self._current
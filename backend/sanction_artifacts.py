@@ -0,0 +1,206 @@
+"""
+Storage for rendered sanction letter PDFs, keyed by a hash of their inputs
+
+There is one object per sanction: every letter prints its own sanction ID and
+issue date, so letters of different sanctions are never deduplicated.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from reportlab import Version as REPORTLAB_VERSION
+
+from utils.letter_renderer import get_letter_renderer
+import config
+
+
+def write_atomic(path: Path, data: bytes):
+    """
+    Write a file so readers see either nothing or the complete content
+
+    Args:
+        path: Destination (parent directories are created)
+        data: File content
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class SanctionArtifactStore:
+    """
+    Render cache for sanction letters, named by a hash of what went into them
+
+    The digest covers the canonical letter inputs plus the renderer backend,
+    its version and the ReportLab version, so a layout change never serves a
+    stale PDF. A letter prints its sanction ID and issue date, and both are
+    part of the inputs, so the digest is a per-sanction cache key: it makes
+    each sanction render once, but letters of different sanctions never share
+    an object. A small SQLite index maps the sanction ID, application ID and
+    session ID to the artifact, so every download path finds the letter
+    without rendering it again.
+    """
+
+    def __init__(self, objects_dir: Path, index_path: Path):
+        """
+        Initialize store
+
+        Args:
+            objects_dir: Directory holding the PDF objects
+            index_path: SQLite index file
+        """
+        self.objects_dir = Path(objects_dir)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(index_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                digest TEXT PRIMARY KEY,
+                sanction_id TEXT NOT NULL,
+                application_id TEXT,
+                session_id TEXT,
+                size INTEGER NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+        for column in ("sanction_id", "application_id", "session_id"):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_artifacts_{column} ON artifacts({column})")
+        self._conn.commit()
+
+    @staticmethod
+    def digest(application_data: Dict[str, Any], customer_data: Dict[str, Any],
+               loan_details: Dict[str, Any]) -> str:
+        """
+        Per-sanction cache key: hash of the canonical letter inputs
+
+        Args:
+            application_data: Application ID, sanction letter number, issue date
+            customer_data: Customer name, address, etc.
+            loan_details: Loan amount, tenure, EMI, etc.
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        renderer = get_letter_renderer()
+        canonical = json.dumps(
+            {
+                "template": f"{renderer.name}/{renderer.version}",
+                "renderer": REPORTLAB_VERSION,
+                "application": application_data,
+                "customer": customer_data,
+                "loan": loan_details
+            },
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def object_path(self, digest: str) -> Path:
+        """Path of an object (fanned out by the first two hex digits)"""
+        return self.objects_dir / digest[:2] / f"{digest}.pdf"
+
+    def exists(self, digest: str) -> bool:
+        """Whether an object has been stored"""
+        return self.object_path(digest).exists()
+
+    def put(self, digest: str, pdf_bytes: bytes, sanction_id: str,
+            application_id: Optional[str] = None, session_id: Optional[str] = None) -> Path:
+        """
+        Store a rendered letter and index it
+
+        The object is written to a temporary file and renamed into place, so
+        readers never see a partial PDF.
+
+        Args:
+            digest: Digest of the letter inputs
+            pdf_bytes: Rendered PDF
+            sanction_id: Sanction ID printed on the letter
+            application_id: Loan application ID
+            session_id: Chat session ID
+
+        Returns:
+            Path of the stored object
+        """
+        path = self.object_path(digest)
+        if not path.exists():
+            write_atomic(path, pdf_bytes)
+        self.link(digest, sanction_id, application_id, session_id, size=len(pdf_bytes))
+        return path
+
+    def link(self, digest: str, sanction_id: str, application_id: Optional[str] = None,
+             session_id: Optional[str] = None, size: Optional[int] = None):
+        """
+        Point the sanction / application / session IDs at an existing object
+
+        Args:
+            digest: Digest of a stored object
+            sanction_id: Sanction ID printed on the letter
+            application_id: Loan application ID
+            session_id: Chat session ID
+            size: Object size in bytes (read from disk when omitted)
+        """
+        if size is None:
+            size = self.object_path(digest).stat().st_size
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO artifacts (digest, sanction_id, application_id, session_id, size, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(digest) DO UPDATE SET
+                    application_id = COALESCE(excluded.application_id, artifacts.application_id),
+                    session_id = COALESCE(excluded.session_id, artifacts.session_id)
+                """,
+                (digest, sanction_id, application_id, session_id, size, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def lookup(self, sanction_id: Optional[str] = None, application_id: Optional[str] = None,
+               session_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Find an artifact by any of its IDs (checked in the order given)
+
+        Args:
+            sanction_id: Sanction ID
+            application_id: Loan application ID
+            session_id: Chat session ID
+
+        Returns:
+            Artifact record with 'digest', 'sanction_id', 'application_id',
+            'session_id', 'size', 'created_at' and 'path', or None
+        """
+        for column, value in (("sanction_id", sanction_id), ("application_id", application_id),
+                              ("session_id", session_id)):
+            if not value:
+                continue
+            with self._lock:
+                row = self._conn.execute(
+                    f"""
+                    SELECT digest, sanction_id, application_id, session_id, size, created_at
+                    FROM artifacts WHERE {column} = ? ORDER BY created_at DESC LIMIT 1
+                    """,
+                    (value,)
+                ).fetchone()
+            if row is None:
+                continue
+            record = dict(zip(("digest", "sanction_id", "application_id", "session_id", "size", "created_at"), row))
+            record["path"] = self.object_path(record["digest"])
+            if record["path"].exists():
+                return record
+        return None
+
+    def close(self):
+        """Close the index"""
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance
+sanction_artifacts = SanctionArtifactStore(config.SANCTION_OBJECTS_DIR, config.SANCTION_INDEX_PATH)
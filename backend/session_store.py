@@ -0,0 +1,359 @@
+"""Session storage backends for the Memory Manager"""
+
+from models import ConversationMemory
+from typing import Dict, Iterator, Optional, Protocol, Tuple
+from pathlib import Path
+import atexit
+import sqlite3
+import threading
+import time
+import config
+
+
+class SessionConflictError(Exception):
+    """Raised when a session was written by someone else since it was loaded"""
+    
+    def __init__(self, session_id: str, expected_revision: int, actual_revision: int):
+        super().__init__(
+            f"Session {session_id} is at revision {actual_revision}, expected {expected_revision}"
+        )
+        self.session_id = session_id
+        self.expected_revision = expected_revision
+        self.actual_revision = actual_revision
+
+
+class SessionStore(Protocol):
+    """
+    Storage interface used by the MemoryManager
+
+    Implementations must be safe to call from multiple threads.
+    """
+
+    def get(self, session_id: str) -> Optional[ConversationMemory]:
+        """Return the stored memory for a session, or None"""
+        ...
+
+    def put(self, session_id: str, memory: ConversationMemory,
+            expected_revision: Optional[int] = None) -> None:
+        """
+        Insert or replace the memory for a session
+
+        If expected_revision is given and the stored revision differs,
+        raise SessionConflictError instead of writing.
+        """
+        ...
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session (no-op if it does not exist)"""
+        ...
+
+    def scan(self) -> Iterator[str]:
+        """Iterate over all stored session IDs"""
+        ...
+
+    def scan_activity(self) -> Iterator[Tuple[str, int, float]]:
+        """Iterate over (session ID, revision, last write time) for all stored sessions, oldest write first"""
+        ...
+
+    def close(self) -> None:
+        """Flush pending writes and release resources"""
+        ...
+
+
+class InMemorySessionStore:
+    """Process-local dict store (the original MVP behaviour)"""
+
+    def __init__(self):
+        self.sessions: Dict[str, ConversationMemory] = {}
+        # Stored objects are shared with callers, so track the committed revision separately
+        self._revisions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[ConversationMemory]:
+        return self.sessions.get(session_id)
+
+    def put(self, session_id: str, memory: ConversationMemory,
+            expected_revision: Optional[int] = None) -> None:
+        with self._lock:
+            current = self._revisions.get(session_id, 0)
+            if expected_revision is not None and current != expected_revision:
+                raise SessionConflictError(session_id, expected_revision, current)
+            self.sessions[session_id] = memory
+            self._revisions[session_id] = memory.revision
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self.sessions.pop(session_id, None)
+            self._revisions.pop(session_id, None)
+
+    def scan(self) -> Iterator[str]:
+        return iter(list(self.sessions.keys()))
+
+    def scan_activity(self) -> Iterator[Tuple[str, int, float]]:
+        with self._lock:
+            activity = [(sid, self._revisions.get(sid, 0), memory.updated_at.timestamp())
+                        for sid, memory in self.sessions.items()]
+        return iter(sorted(activity, key=lambda entry: entry[2]))
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteSessionStore:
+    """
+    Disk-backed session store with write-behind batching
+
+    Sessions are serialized on put() and queued; a background thread writes
+    queued sessions to a WAL-mode SQLite database in batches, so put() never
+    waits on a payload write. Each row carries the nanosecond timestamp of the write
+    that produced it, which lets get() keep returning the same in-process
+    object while no other worker has touched the session, and reload it
+    as soon as one has.
+
+    A put() with expected_revision first claims the new revision on disk
+    with a conditional UPDATE of the revision column only (cheap under WAL
+    with synchronous=NORMAL); only the payload write is deferred. If another
+    worker claimed the session first, the claim matches no row and put()
+    raises SessionConflictError to its caller (refusals are counted in
+    .conflicts), so no accepted write is ever dropped at flush time.
+    """
+
+    def __init__(self, db_path: Path, flush_interval: float = 0.05,
+                 batch_size: int = 256):
+        """
+        Open (or create) the session database and start the flush thread
+
+        Args:
+            db_path: SQLite database file
+            flush_interval: Maximum seconds a write stays queued
+            batch_size: Number of queued sessions that triggers an early flush
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # session_id -> (memory object, write stamp) for sessions this process has seen
+        self._cache: Dict[str, Tuple[ConversationMemory, int]] = {}
+        # session_id -> (serialized payload, write stamp, revision) not yet on disk
+        self._dirty: Dict[str, Tuple[str, int, int]] = {}
+        self._deleted: set = set()
+        self.conflicts = 0
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " updated_ns INTEGER NOT NULL,"
+            " revision INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+        if "revision" not in columns:
+            conn.execute("ALTER TABLE sessions ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        conn.commit()
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="session-store-flush",
+                                         daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are per-thread)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> Optional[ConversationMemory]:
+        with self._lock:
+            if session_id in self._deleted:
+                return None
+            cached = self._cache.get(session_id)
+            if cached and session_id in self._dirty:
+                return cached[0]
+
+        row = self._connection().execute(
+            "SELECT payload, updated_ns FROM sessions WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+
+        with self._lock:
+            # A put() or delete() may have raced with the read above; queued data wins
+            if session_id in self._deleted:
+                return None
+            cached = self._cache.get(session_id)
+            if session_id in self._dirty:
+                return cached[0]
+            if row is None:
+                self._cache.pop(session_id, None)
+                return None
+            payload, updated_ns = row
+            if cached and cached[1] == updated_ns:
+                return cached[0]
+            memory = ConversationMemory.model_validate_json(payload)
+            self._cache[session_id] = (memory, updated_ns)
+            return memory
+
+    def _stored_revision(self, session_id: str) -> int:
+        """Revision on disk for a session (0 if there is no row)"""
+        row = self._connection().execute(
+            "SELECT revision FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _claim(self, session_id: str, expected_revision: int, revision: int,
+               payload: str, stamp: int) -> bool:
+        """
+        Atomically move a session's revision on disk from expected_revision to revision
+
+        A new session (expected_revision 0) is inserted with its payload; an
+        existing one only has its revision column bumped, and the queued
+        payload follows with the next flush.
+
+        Returns:
+            False if the stored revision is not expected_revision
+        """
+        conn = self._connection()
+        with conn:
+            if expected_revision == 0:
+                cursor = conn.execute(
+                    "INSERT INTO sessions (session_id, payload, updated_ns, revision) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET revision = excluded.revision "
+                    "WHERE sessions.revision = 0",
+                    (session_id, payload, stamp, revision)
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE sessions SET revision = ? WHERE session_id = ? AND revision = ?",
+                    (revision, session_id, expected_revision)
+                )
+        return cursor.rowcount == 1
+
+    def put(self, session_id: str, memory: ConversationMemory,
+            expected_revision: Optional[int] = None) -> None:
+        payload = memory.model_dump_json()
+        stamp = time.time_ns()
+
+        if expected_revision is not None:
+            with self._lock:
+                deleted = session_id in self._deleted
+            if deleted and expected_revision != 0:
+                raise SessionConflictError(session_id, expected_revision, 0)
+            if not deleted and not self._claim(session_id, expected_revision, memory.revision,
+                                               payload, stamp):
+                current = self._stored_revision(session_id)
+                with self._lock:
+                    self.conflicts += 1
+                    if session_id not in self._dirty:
+                        # Our copy is stale; make the next get() reload it
+                        self._cache.pop(session_id, None)
+                raise SessionConflictError(session_id, expected_revision, current)
+
+        with self._lock:
+            self._cache[session_id] = (memory, stamp)
+            self._dirty[session_id] = (payload, stamp, memory.revision)
+            self._deleted.discard(session_id)
+            pending = len(self._dirty)
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._cache.pop(session_id, None)
+            self._dirty.pop(session_id, None)
+            self._deleted.add(session_id)
+        self._wake.set()
+
+    def scan(self) -> Iterator[str]:
+        self.flush()
+        rows = self._connection().execute("SELECT session_id FROM sessions").fetchall()
+        return iter([row[0] for row in rows])
+
+    def scan_activity(self) -> Iterator[Tuple[str, int, float]]:
+        self.flush()
+        rows = self._connection().execute(
+            "SELECT session_id, revision, updated_ns FROM sessions ORDER BY updated_ns"
+        ).fetchall()
+        return iter([(sid, revision, updated_ns / 1e9) for sid, revision, updated_ns in rows])
+
+    def flush(self):
+        """Write all queued sessions to disk now"""
+        with self._lock:
+            writes = dict(self._dirty)
+            deletes = set(self._deleted)
+        if not writes and not deletes:
+            return
+
+        conn = self._connection()
+        superseded = []
+        with conn:
+            for sid, (payload, stamp, revision) in writes.items():
+                # put() already claimed this revision; never go back past a later claim
+                cursor = conn.execute(
+                    "INSERT INTO sessions (session_id, payload, updated_ns, revision) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET "
+                    "payload = excluded.payload, updated_ns = excluded.updated_ns, revision = excluded.revision "
+                    "WHERE sessions.revision <= excluded.revision",
+                    (sid, payload, stamp, revision)
+                )
+                if cursor.rowcount == 0:
+                    superseded.append(sid)
+            if deletes:
+                conn.executemany("DELETE FROM sessions WHERE session_id = ?",
+                                 [(sid,) for sid in deletes])
+
+        # Only clear entries that were not re-queued while we were writing
+        with self._lock:
+            for sid, (_, stamp, _) in writes.items():
+                current = self._dirty.get(sid)
+                if current and current[1] == stamp:
+                    del self._dirty[sid]
+            self._deleted.difference_update(deletes)
+            for sid in superseded:
+                # A later revision was claimed since; drop our copy so the next get() reloads
+                if sid not in self._dirty:
+                    self._cache.pop(sid, None)
+
+    def _flush_loop(self):
+        """Background writer"""
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"[Session Store] ❌ Flush failed, will retry: {e}")
+
+    def close(self) -> None:
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wake.set()
+        self._flusher.join(timeout=5.0)
+        self.flush()
+
+
+def create_session_store() -> SessionStore:
+    """
+    Build the session store selected by config.SESSION_STORE_BACKEND
+
+    Returns:
+        SessionStore implementation
+    """
+    if config.SESSION_STORE_BACKEND == "sqlite":
+        return SQLiteSessionStore(
+            config.SESSION_DB_PATH,
+            flush_interval=config.SESSION_FLUSH_INTERVAL,
+            batch_size=config.SESSION_FLUSH_BATCH_SIZE
+        )
+    if config.SESSION_STORE_BACKEND != "memory":
+        print(f"[Session Store] Unknown backend '{config.SESSION_STORE_BACKEND}', using in-memory store")
+    return InMemorySessionStore()
@@ -0,0 +1,119 @@
+"""
+Stand-in CRM, credit bureau and offer mart server
+
+Serves the mock data over HTTP with injected latency and errors, so the chat
+flow can be load-tested against real network calls through the HTTP
+adapters. Point the app at it with:
+
+    CRM_SERVICE_URL=http://127.0.0.1:8100 \\
+    CREDIT_BUREAU_SERVICE_URL=http://127.0.0.1:8100 \\
+    OFFER_MART_SERVICE_URL=http://127.0.0.1:8100 uvicorn main:app
+
+Usage:
+    python standin_server.py --port 8100 --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+
+Latency and error rate can also be changed while running:
+    curl -X PUT 'http://127.0.0.1:8100/admin/faults?latency_ms=200&error_rate=0.1'
+"""
+
+from typing import Optional
+import argparse
+import asyncio
+import os
+import random
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+
+from mocks.crm_service import CRMService
+from mocks.offer_mart import offer_mart_service
+
+app = FastAPI(title="Stand-in CRM / Bureau / Offer Mart")
+
+faults = {
+    "latency_ms": float(os.getenv("STANDIN_LATENCY_MS", "50")),  # Mean added latency
+    "jitter_ms": float(os.getenv("STANDIN_JITTER_MS", "20")),  # Latency varies uniformly by +/- this
+    "error_rate": float(os.getenv("STANDIN_ERROR_RATE", "0")),  # Share of requests answered 503
+}
+stats = {"requests": 0, "injected_errors": 0}
+
+crm = CRMService()  # Uncached: the adapters do the caching
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    """Delay every service request and fail a share of them"""
+    if request.url.path.startswith("/admin"):
+        return await call_next(request)
+    stats["requests"] += 1
+    delay = faults["latency_ms"] + random.uniform(-faults["jitter_ms"], faults["jitter_ms"])
+    await asyncio.sleep(max(delay, 0) / 1000)
+    if random.random() < faults["error_rate"]:
+        stats["injected_errors"] += 1
+        return JSONResponse({"detail": "Injected failure"}, status_code=503)
+    return await call_next(request)
+
+
+@app.get("/crm/customers/by-phone/{phone}")
+async def customer_by_phone(phone: str):
+    """CRM profile by phone number"""
+    customer = crm.get_customer_by_phone(phone)
+    if customer is None:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return customer
+
+
+@app.get("/crm/customers/{customer_id}")
+async def customer_by_id(customer_id: str):
+    """CRM profile by customer ID"""
+    customer = crm.get_customer_by_id(customer_id)
+    if customer is None:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return customer
+
+
+@app.get("/bureau/scores/{phone}")
+async def credit_score(phone: str):
+    """Bureau credit score by phone number"""
+    customer = crm.get_customer_by_phone(phone)
+    if customer is None:
+        raise HTTPException(status_code=404, detail="No bureau record")
+    return {"phone": phone, "credit_score": customer.credit_score}
+
+
+@app.get("/offers/{customer_id}")
+async def offers(customer_id: str, credit_score: int = Query(...)):
+    """Offer mart terms for a customer"""
+    return offer_mart_service.get_offers(customer_id, credit_score)
+
+
+@app.get("/admin/faults")
+async def get_faults():
+    """Current fault settings and request counters"""
+    return {**faults, **stats}
+
+
+@app.put("/admin/faults")
+async def set_faults(latency_ms: Optional[float] = None, jitter_ms: Optional[float] = None,
+                     error_rate: Optional[float] = None):
+    """Change fault settings while running"""
+    if error_rate is not None and not 0 <= error_rate <= 1:
+        raise HTTPException(status_code=400, detail="error_rate must be between 0 and 1")
+    for key, value in (("latency_ms", latency_ms), ("jitter_ms", jitter_ms), ("error_rate", error_rate)):
+        if value is not None:
+            faults[key] = value
+    return faults
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stand-in CRM / bureau / offer mart server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=faults["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=faults["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=faults["error_rate"])
+    args = parser.parse_args()
+    faults.update(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -27,7 +27,8 @@ class StateMachine:
         ConversationStage.LEAD_QUALIFICATION: [ConversationStage.OFFER_PRESENTATION, ConversationStage.CLOSE],
         ConversationStage.OFFER_PRESENTATION: [ConversationStage.KYC_VERIFICATION, ConversationStage.OFFER_PRESENTATION],  # Can loop for tenure changes
         ConversationStage.KYC_VERIFICATION: [ConversationStage.UNDERWRITING, ConversationStage.KYC_VERIFICATION],  # Can loop for OTP
-        ConversationStage.UNDERWRITING: [ConversationStage.DECISION, ConversationStage.KYC_VERIFICATION],  # Can go back for salary slip
+        ConversationStage.UNDERWRITING: [ConversationStage.DECISION, ConversationStage.KYC_VERIFICATION,  # Can go back for salary slip
+                                         ConversationStage.OFFER_PRESENTATION],  # Or present a counter-offer
         ConversationStage.DECISION: [ConversationStage.SANCTION_LETTER, ConversationStage.CLOSE],
         ConversationStage.SANCTION_LETTER: [ConversationStage.CLOSE],
         ConversationStage.CLOSE: []  # Terminal state
@@ -0,0 +1,93 @@
+"""
+Batch sanction checks: manifest errors, resuming a run and re-issue linking
+
+Renders real letters in one spawned worker, so it takes a few seconds.
+
+Run with: python -m pytest test_batch_sanction.py
+"""
+
+import json
+
+import pytest
+
+from sanction_artifacts import SanctionArtifactStore
+import batch_sanction
+
+
+def _entry(application_id: str, **overrides) -> dict:
+    entry = {"application_id": application_id, "customer_name": "Rakesh Kumar",
+             "loan_amount": 400000, "interest_rate": 10.5, "tenure": 48, "emi": 10244.9,
+             "issue_date": "2025-01-15"}
+    entry.update(overrides)
+    return entry
+
+
+def _write_manifest(path, lines):
+    path.write_text("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    store = SanctionArtifactStore(tmp_path / "objects", tmp_path / "index.db")
+    monkeypatch.setattr(batch_sanction, "sanction_artifacts", store)
+    yield store
+    store.close()
+
+
+def test_letter_inputs_keep_an_explicit_fee_waiver():
+    _, _, _, loan_details = batch_sanction.letter_inputs(_entry("APP1", processing_fee=0))
+    assert loan_details["processing_fee"] == 0
+
+    _, _, _, loan_details = batch_sanction.letter_inputs(_entry("APP1"))
+    assert loan_details["processing_fee"] > 0
+
+
+def test_letter_inputs_reject_incomplete_entries():
+    entry = _entry("APP1")
+    del entry["emi"]
+    with pytest.raises(batch_sanction.ManifestError):
+        batch_sanction.letter_inputs(entry)
+    with pytest.raises(batch_sanction.ManifestError):
+        batch_sanction.parse_entry("[1, 2]")
+    with pytest.raises(batch_sanction.ManifestError):
+        batch_sanction.parse_entry("{not json")
+
+
+def test_bad_lines_are_reported_and_a_rerun_resumes(tmp_path, artifacts):
+    incomplete = _entry("APP3")
+    del incomplete["tenure"]
+    manifest = _write_manifest(tmp_path / "manifest.jsonl", [
+        _entry("APP1"),
+        "{not json",
+        _entry("APP2", sanction_id="SAN2"),
+        incomplete,
+        "",
+        _entry("APP4", processing_fee=0),
+    ])
+
+    first = batch_sanction.run_batch(manifest, workers=1)
+    assert (first["rendered"], first["skipped"], first["failed"]) == (3, 0, 2)
+    assert sorted(first["errors"]) == [2, 4]
+    for sanction_id in ("APP1", "SAN2", "APP4"):
+        record = artifacts.lookup(sanction_id=sanction_id)
+        assert record is not None and record["path"].stat().st_size > 0
+
+    second = batch_sanction.run_batch(manifest, workers=1)
+    assert (second["rendered"], second["skipped"], second["failed"]) == (0, 3, 2)
+
+    forced = batch_sanction.run_batch(manifest, workers=1, force=True)
+    assert (forced["rendered"], forced["skipped"]) == (3, 0)
+
+
+def test_reissued_letter_stays_attached_to_its_session(tmp_path, artifacts):
+    # A letter issued in chat: sanction ID generated, indexed with its session
+    artifacts.put("0" * 64, b"%PDF-1.4 interactive", "SAN20250115ABCDEF12", "APP9", "session-9")
+
+    manifest = _write_manifest(tmp_path / "reissue.jsonl", [_entry("APP9", issue_date="2025-02-01")])
+    report = batch_sanction.run_batch(manifest, workers=1)
+    assert report["rendered"] == 1
+
+    latest = artifacts.lookup(session_id="session-9")
+    assert latest["sanction_id"] == "APP9"
+    assert latest["digest"] != "0" * 64
@@ -0,0 +1,97 @@
+"""
+Inverse EMI solver and bulk underwriting checks
+
+The solver must agree with calculate_emi (the amounts it returns are quoted
+through it), and evaluate_batch must reach the same decision as
+evaluate_loan row by row.
+
+Run with: python -m pytest test_emi_solver.py
+"""
+
+import numpy as np
+import pytest
+
+from agents.underwriting_agent import underwriting_agent
+from bench_underwriting import customer_for, synthetic_book
+from utils.emi_calculator import calculate_emi
+from utils.emi_solver import max_affordable_amount, max_principal, min_tenure, min_tenure_option
+import config
+
+# Policy rates are always positive (calculate_emi returns 0 for a zero rate)
+RATES = [8.5, 10.5, 11.5, 14.0, 24.0]
+TENURES = [6, 12, 24, 36, 48, 60, 84]
+
+
+@pytest.mark.parametrize("rate", RATES)
+@pytest.mark.parametrize("tenure", TENURES)
+def test_max_principal_inverts_emi(rate, tenure):
+    for principal in (10000.0, 250000.0, 1234567.89):
+        emi = calculate_emi(principal, rate, tenure)
+        assert float(max_principal(emi, rate, tenure)) == pytest.approx(principal, rel=1e-4)
+
+
+def test_max_principal_broadcasts_over_tenures():
+    by_tenure = max_principal(20000, 10.5, TENURES)
+    assert by_tenure.shape == (len(TENURES),)
+    assert np.all(np.diff(by_tenure) > 0)
+
+
+@pytest.mark.parametrize("rate", RATES)
+def test_min_tenure_inverts_emi(rate):
+    principal = 500000.0
+    for tenure in TENURES:
+        emi = calculate_emi(principal, rate, tenure)
+        assert float(min_tenure(principal, rate, emi)) == pytest.approx(tenure, abs=1e-3)
+
+
+def test_interest_free_solutions():
+    assert float(max_principal(1000, 0, 12)) == 12000
+    assert float(min_tenure(12000, 0, 1000)) == 12
+
+
+def test_min_tenure_is_infinite_when_emi_does_not_cover_interest():
+    monthly_interest = 1000000 * 12 / 12 / 100
+    assert np.isinf(min_tenure(1000000, 12, monthly_interest))
+
+
+def test_min_tenure_option_matches_brute_force():
+    rng = np.random.default_rng(7)
+    options = sorted(config.TENURE_OPTIONS)
+    for _ in range(2000):
+        principal = float(rng.integers(10, 2000)) * 1000
+        rate = float(rng.choice(RATES))
+        max_emi = float(rng.uniform(1000, 100000))
+        expected = next((t for t in options if calculate_emi(principal, rate, t) <= max_emi), None)
+        assert min_tenure_option(principal, rate, max_emi) == expected
+
+
+def test_min_tenure_option_at_the_rounding_boundary():
+    # The exact EMI of the quoted amount is the cap itself
+    for tenure in config.TENURE_OPTIONS:
+        emi = calculate_emi(400000, 10.5, tenure)
+        assert min_tenure_option(400000, 10.5, emi) == tenure
+
+
+def test_max_affordable_amount_fits_the_quoted_emi():
+    rng = np.random.default_rng(11)
+    step = config.COUNTER_OFFER_AMOUNT_STEP
+    for _ in range(2000):
+        rate = float(rng.choice(RATES))
+        tenure = int(rng.choice(config.TENURE_OPTIONS))
+        max_emi = float(rng.uniform(500, 100000))
+        amount = max_affordable_amount(max_emi, rate, tenure)
+        assert amount % step == 0
+        assert amount == 0 or calculate_emi(amount, rate, tenure) <= max_emi
+        assert calculate_emi(amount + step, rate, tenure) > max_emi
+
+
+def test_evaluate_batch_matches_evaluate_loan():
+    columns = synthetic_book(3000, seed=3)
+    credit_scores, limits, salaries, amounts, tenures = columns
+    reason_codes = underwriting_agent.evaluate_batch(*columns).reason_codes()
+
+    for i in range(len(amounts)):
+        salary = None if np.isnan(salaries[i]) else float(salaries[i])
+        single = underwriting_agent.evaluate_loan(customer_for(credit_scores[i], limits[i], salaries[i]),
+                                                  float(amounts[i]), int(tenures[i]), salary)
+        assert single["reason_code"] == reason_codes[i], i
@@ -0,0 +1,121 @@
+"""
+ConditionalFileResponse checks: ETag / If-Modified-Since (304), Range (206) and 416
+
+Run with: python -m pytest test_file_responses.py
+"""
+
+from email.utils import formatdate
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from file_responses import ConditionalFileResponse
+
+CONTENT = bytes(range(256)) * 4  # 1024 bytes
+ETAG = "abc123"
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "letter.pdf"
+    path.write_bytes(CONTENT)
+    return path
+
+
+@pytest.fixture
+def client(pdf_path):
+    app = FastAPI()
+
+    @app.get("/letter")
+    async def letter(request: Request):
+        return ConditionalFileResponse(str(pdf_path), request.headers, etag=ETAG,
+                                       media_type="application/pdf")
+
+    return TestClient(app)
+
+
+def test_full_download_carries_validators(client):
+    response = client.get("/letter")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == f'"{ETAG}"'
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+@pytest.mark.parametrize("if_none_match", [f'"{ETAG}"', f'W/"{ETAG}"', f'"other", "{ETAG}"', "*"])
+def test_matching_etag_is_not_modified(client, if_none_match):
+    response = client.get("/letter", headers={"If-None-Match": if_none_match})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_stale_etag_gets_the_file(client):
+    response = client.get("/letter", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_if_modified_since(client, pdf_path):
+    mtime = pdf_path.stat().st_mtime
+    assert client.get("/letter", headers={"If-Modified-Since": formatdate(mtime + 60, usegmt=True)}).status_code == 304
+    assert client.get("/letter", headers={"If-Modified-Since": formatdate(mtime - 60, usegmt=True)}).status_code == 200
+    assert client.get("/letter", headers={"If-Modified-Since": "not a date"}).status_code == 200
+
+
+@pytest.mark.parametrize("range_header, start, end", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=1000-", 1000, 1023),
+    ("bytes=-24", 1000, 1023),
+    ("bytes=1000-5000", 1000, 1023),
+    ("bytes=-5000", 0, 1023),
+])
+def test_byte_ranges(client, range_header, start, end):
+    response = client.get("/letter", headers={"Range": range_header})
+    assert response.status_code == 206
+    assert response.content == CONTENT[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+    assert response.headers["content-length"] == str(end - start + 1)
+
+
+@pytest.mark.parametrize("range_header", ["bytes=1024-", "bytes=500-100", "bytes=-0"])
+def test_unsatisfiable_range(client, range_header):
+    response = client.get("/letter", headers={"Range": range_header})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("range_header", ["bytes=0-1,5-6", "items=0-1", "bytes=x-y"])
+def test_unsupported_range_sends_whole_file(client, range_header):
+    response = client.get("/letter", headers={"Range": range_header})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_if_range_mismatch_sends_whole_file(client):
+    matching = client.get("/letter", headers={"Range": "bytes=0-9", "If-Range": f'"{ETAG}"'})
+    assert matching.status_code == 206
+    stale = client.get("/letter", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert stale.status_code == 200
+    assert stale.content == CONTENT
+
+
+def test_zero_copy_send_extension(pdf_path):
+    response = ConditionalFileResponse(str(pdf_path), {"range": "bytes=10-19"}, etag=ETAG)
+    messages = []
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            # Read what sendfile would send while the file is still open
+            message["file"].seek(message["offset"])
+            message = dict(message, body=message["file"].read(message["count"]))
+        messages.append(message)
+
+    scope = {"type": "http", "extensions": {"http.response.zerocopysend": {}}}
+    asyncio.run(response(scope, None, send))
+
+    assert messages[0]["status"] == 206
+    assert messages[1]["type"] == "http.response.zerocopysend"
+    assert messages[1]["body"] == CONTENT[10:20]
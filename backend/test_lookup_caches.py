@@ -0,0 +1,153 @@
+"""
+CRM lookup checks: read-through cache single flight / negative caching and
+the columnar snapshot's find / range indexes
+
+Run with: python -m pytest test_lookup_caches.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from mocks.cache import AsyncReadThroughCache, ReadThroughCache
+from mocks.crm_snapshot import CRMSnapshot, build_snapshot
+import config
+
+
+def test_concurrent_misses_share_one_load():
+    calls = []
+    release = threading.Event()
+
+    def loader(key):
+        calls.append(key)
+        release.wait(5)
+        return f"value-{key}"
+
+    cache = ReadThroughCache("test_single_flight", loader, ttl=60)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get, "k") for _ in range(8)]
+        time.sleep(0.1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["value-k"] * 8
+    assert calls == ["k"]
+    stats = cache.get_stats()
+    assert stats["misses"] == 1 and stats["coalesced"] == 7
+
+
+def test_not_found_is_cached_for_the_negative_ttl():
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        return None
+
+    cache = ReadThroughCache("test_negative", loader, ttl=60, negative_ttl=0.05)
+    assert cache.get("unknown") is None
+    assert cache.get("unknown") is None
+    assert len(calls) == 1
+    assert cache.get_stats()["negative_hits"] == 1
+
+    time.sleep(0.1)
+    assert cache.get("unknown") is None
+    assert len(calls) == 2
+
+
+def test_loader_errors_reach_every_waiter_and_are_not_cached():
+    attempts = []
+    release = threading.Event()
+
+    def loader(key):
+        attempts.append(key)
+        release.wait(5)
+        if len(attempts) == 1:
+            raise ConnectionError("source down")
+        return "recovered"
+
+    cache = ReadThroughCache("test_errors", loader, ttl=60)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(cache.get, "k") for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        for future in futures:
+            with pytest.raises(ConnectionError):
+                future.result()
+
+    assert cache.get("k") == "recovered"
+    assert len(attempts) == 2
+
+
+def test_async_concurrent_misses_share_one_load():
+    calls = []
+
+    async def loader(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return key.upper()
+
+    async def run():
+        cache = AsyncReadThroughCache("test_async_single_flight", loader, ttl=60)
+        return await asyncio.gather(*(cache.get("k") for _ in range(10)))
+
+    assert asyncio.run(run()) == ["K"] * 10
+    assert calls == ["k"]
+
+
+def test_async_cancelled_waiter_does_not_cancel_the_shared_load():
+    async def loader(key):
+        await asyncio.sleep(0.05)
+        return key
+
+    async def run():
+        cache = AsyncReadThroughCache("test_async_cancel", loader, ttl=60)
+        leader = asyncio.ensure_future(cache.get("k"))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get("k"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await leader
+
+    assert asyncio.run(run()) == "k"
+
+
+@pytest.fixture(scope="module")
+def records():
+    with open(config.MOCK_DATA_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)["customers"]
+
+
+@pytest.fixture(scope="module")
+def snapshot(records, tmp_path_factory):
+    snapshot_dir = tmp_path_factory.mktemp("crm") / "snapshot"
+    assert build_snapshot(records, snapshot_dir) == len(records)
+    return CRMSnapshot(snapshot_dir)
+
+
+def test_snapshot_find_matches_a_scan(snapshot, records):
+    for record in records:
+        assert [snapshot.customer_id(row) for row in snapshot.find("phone", record["phone"])] == [record["id"]]
+        assert snapshot.customer(snapshot.find("id", record["id"])[0]).model_dump() == \
+            snapshot.customer(snapshot.find("phone", record["phone"])[0]).model_dump()
+
+    city = records[0]["city"]
+    expected = sorted(r["id"] for r in records if r["city"].lower() == city.lower())
+    assert sorted(snapshot.customer_id(row) for row in snapshot.find("city", city.upper())) == expected
+    assert len(snapshot.find("phone", "0000000000")) == 0
+    assert len(snapshot.find("email", "x" * 500)) == 0
+
+
+@pytest.mark.parametrize("low, high", [(None, None), (700, None), (None, 750), (720, 800), (901, None)])
+def test_snapshot_range_matches_a_scan(snapshot, records, low, high):
+    expected = sorted(
+        r["id"] for r in records
+        if (low is None or r["credit_score"] >= low) and (high is None or r["credit_score"] <= high)
+    )
+    rows = snapshot.range("credit_score", low, high)
+    assert sorted(snapshot.customer_id(row) for row in rows) == expected
+    scores = [int(snapshot.column("credit_score")[row]) for row in rows]
+    assert scores == sorted(scores)
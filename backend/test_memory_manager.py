@@ -0,0 +1,112 @@
+"""
+Memory Manager checks: TTL / LRU eviction, unit-of-work rollback and history spill
+
+Run with: python -m pytest test_memory_manager.py
+"""
+
+import time
+
+import pytest
+
+from history_archive import HistoryArchive
+from memory_manager import MemoryManager
+from session_store import InMemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return HistoryArchive(tmp_path / "history")
+
+
+def _manager(archive, store=None, **kwargs) -> MemoryManager:
+    settings = {"idle_ttl": 3600, "closed_ttl": 3600, "max_sessions": 100, "history_buffer_size": 4}
+    settings.update(kwargs)
+    return MemoryManager(store=store or InMemorySessionStore(), archive=archive, **settings)
+
+
+def test_idle_sessions_expire(archive):
+    manager = _manager(archive, idle_ttl=0.05)
+    session_id = manager.create_session()
+    time.sleep(0.1)
+
+    assert manager.get_session(session_id) is None
+    assert manager.get_stats()["evicted_idle"] == 1
+
+
+def test_least_recently_used_session_is_evicted_over_capacity(archive):
+    manager = _manager(archive, max_sessions=2)
+    first = manager.create_session()
+    second = manager.create_session()
+    manager.get_session(first)  # Now second is least recently used
+    manager.create_session()
+
+    assert manager.get_session(second) is None
+    assert manager.get_session(first) is not None
+    assert manager.get_stats()["evicted_capacity"] == 1
+
+
+def test_capacity_eviction_spares_sessions_active_on_another_worker(archive, tmp_path):
+    db_path = tmp_path / "sessions.db"
+    worker_a = _manager(archive, SQLiteSessionStore(db_path, flush_interval=60), max_sessions=1)
+    worker_b = _manager(archive, SQLiteSessionStore(db_path, flush_interval=60))
+    try:
+        shared = worker_a.create_session()
+        worker_a.store.flush()
+        with worker_b.session(shared) as session:
+            session.update_context("step", "b")
+        worker_b.store.flush()
+
+        worker_a.create_session()  # Over capacity: shared is least recently used on worker A
+
+        assert worker_a.get_stats()["evicted_capacity"] == 0
+        assert worker_b.get_session(shared).context["step"] == "b"
+    finally:
+        worker_a.store.close()
+        worker_b.store.close()
+
+
+def test_sessions_stored_before_startup_are_tracked(archive, tmp_path):
+    db_path = tmp_path / "sessions.db"
+    before_restart = _manager(archive, SQLiteSessionStore(db_path, flush_interval=60))
+    old = [before_restart.create_session() for _ in range(3)]
+    before_restart.store.close()
+
+    after_restart = _manager(archive, SQLiteSessionStore(db_path, flush_interval=60), max_sessions=2)
+    try:
+        assert after_restart.get_stats()["live_sessions"] == 3
+        after_restart.create_session()
+        assert after_restart.get_stats()["evicted_capacity"] == 2
+        assert after_restart.get_session(old[0]) is None
+    finally:
+        after_restart.store.close()
+
+
+def test_failed_block_leaves_stored_session_unchanged(archive):
+    manager = _manager(archive)
+    session_id = manager.create_session()
+
+    with pytest.raises(RuntimeError):
+        with manager.session(session_id) as session:
+            session.update_context("half", "done")
+            raise RuntimeError("handler failed")
+
+    memory = manager.get_session(session_id)
+    assert "half" not in memory.context
+    assert memory.revision == 0
+
+
+def test_history_spills_to_archive_and_reads_back_in_order(archive):
+    manager = _manager(archive, history_buffer_size=4)
+    session_id = manager.create_session()
+    for i in range(10):
+        with manager.session(session_id) as session:
+            session.add_message("user", f"message {i}")
+
+    memory = manager.get_session(session_id)
+    assert len(memory.conversation_history) <= 4
+    assert memory.history_offset > 0
+
+    history = manager.get_history(memory)
+    assert [turn["index"] for turn in history] == list(range(10))
+    assert [turn["content"] for turn in history] == [f"message {i}" for i in range(10)]
+    assert [turn["index"] for turn in manager.get_history(memory, after=2, limit=3)] == [3, 4, 5]
@@ -0,0 +1,120 @@
+"""
+Session store checks: revision conflicts, write-behind flushing and activity scans
+
+Run with: python -m pytest test_session_store.py
+"""
+
+import pytest
+
+from models import ConversationMemory
+from session_store import InMemorySessionStore, SessionConflictError, SQLiteSessionStore
+
+
+def _memory(session_id: str, revision: int) -> ConversationMemory:
+    return ConversationMemory(session_id=session_id, revision=revision)
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return tmp_path / "sessions.db"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, sqlite_path):
+    if request.param == "memory":
+        yield InMemorySessionStore()
+    else:
+        store = SQLiteSessionStore(sqlite_path, flush_interval=60)
+        yield store
+        store.close()
+
+
+def test_put_get_round_trip(store):
+    store.put("s1", _memory("s1", 1), expected_revision=0)
+    assert store.get("s1").revision == 1
+    assert store.get("missing") is None
+
+
+def test_stale_revision_is_refused_at_put(store):
+    store.put("s1", _memory("s1", 1), expected_revision=0)
+    store.put("s1", _memory("s1", 2), expected_revision=1)
+
+    with pytest.raises(SessionConflictError) as excinfo:
+        store.put("s1", _memory("s1", 2), expected_revision=1)
+    assert excinfo.value.expected_revision == 1
+    assert excinfo.value.actual_revision == 2
+    assert store.get("s1").revision == 2
+
+
+def test_delete_and_scan(store):
+    store.put("s1", _memory("s1", 1), expected_revision=0)
+    store.put("s2", _memory("s2", 1), expected_revision=0)
+    store.delete("s1")
+
+    assert store.get("s1") is None
+    assert sorted(store.scan()) == ["s2"]
+    assert [entry[:2] for entry in store.scan_activity()] == [("s2", 1)]
+
+
+def test_sqlite_flush_persists_queued_writes(sqlite_path):
+    store = SQLiteSessionStore(sqlite_path, flush_interval=60)
+    store.put("s1", _memory("s1", 1), expected_revision=0)
+    store.put("s1", _memory("s1", 2), expected_revision=1)
+    store.close()
+
+    reopened = SQLiteSessionStore(sqlite_path, flush_interval=60)
+    try:
+        assert reopened.get("s1").revision == 2
+    finally:
+        reopened.close()
+
+
+def test_sqlite_conflict_between_workers_is_refused_at_put(sqlite_path):
+    # Two stores on one file stand in for two workers sharing the database
+    first = SQLiteSessionStore(sqlite_path, flush_interval=60)
+    second = SQLiteSessionStore(sqlite_path, flush_interval=60)
+    try:
+        first.put("s1", _memory("s1", 1), expected_revision=0)
+        first.flush()
+        assert second.get("s1").revision == 1
+
+        first.put("s1", _memory("s1", 2), expected_revision=1)
+        with pytest.raises(SessionConflictError):
+            second.put("s1", _memory("s1", 2), expected_revision=1)
+        assert second.conflicts == 1
+
+        # The accepted write lands; the refused one never reaches disk
+        first.flush()
+        assert second.get("s1").revision == 2
+    finally:
+        first.close()
+        second.close()
+
+
+def test_sqlite_new_session_conflicts_with_concurrent_create(sqlite_path):
+    first = SQLiteSessionStore(sqlite_path, flush_interval=60)
+    second = SQLiteSessionStore(sqlite_path, flush_interval=60)
+    try:
+        first.put("s1", _memory("s1", 1), expected_revision=0)
+        with pytest.raises(SessionConflictError):
+            second.put("s1", _memory("s1", 1), expected_revision=0)
+    finally:
+        first.close()
+        second.close()
+
+
+def test_sqlite_get_reloads_after_another_worker_writes(sqlite_path):
+    first = SQLiteSessionStore(sqlite_path, flush_interval=60)
+    second = SQLiteSessionStore(sqlite_path, flush_interval=60)
+    try:
+        first.put("s1", _memory("s1", 1), expected_revision=0)
+        first.flush()
+        cached = second.get("s1")
+        assert second.get("s1") is cached
+
+        first.put("s1", _memory("s1", 2), expected_revision=1)
+        first.flush()
+        assert second.get("s1").revision == 2
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,251 @@
+"""
+Amortization schedules (vectorized with NumPy)
+
+Schedules are built for many loans at once as 2-D arrays (one row per loan,
+one column per month). Each month is one set of array operations across the
+whole batch, so the Python-level loop runs once per month of the longest
+tenure (at most 60 times) however many loans there are.
+
+The schedule follows the loan ledger: interest is charged on the outstanding
+balance and rounded to the paisa each month, the installment is the rounded
+EMI quoted to the customer, and the final installment settles whatever
+balance is left, so the principal column adds up to the loan amount exactly.
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from utils.emi_calculator import calculate_emi
+
+DateLike = Union[date, datetime]
+
+
+class AmortizationSchedule:
+    """Month-by-month payment, principal, interest and balance of one loan"""
+
+    def __init__(self, principal: float, annual_rate: float, tenure: int, emi: float,
+                 payment: np.ndarray, principal_paid: np.ndarray, interest: np.ndarray,
+                 balance: np.ndarray):
+        """
+        Initialize schedule (use amortization_schedule() to build one)
+
+        Args:
+            principal: Loan amount
+            annual_rate: Annual interest rate (percentage)
+            tenure: Tenure in months
+            emi: Monthly installment
+            payment: Amount paid each month (the last one settles the balance)
+            principal_paid: Principal component of each payment
+            interest: Interest component of each payment
+            balance: Outstanding principal after each payment
+        """
+        self.principal = principal
+        self.annual_rate = annual_rate
+        self.tenure = tenure
+        self.emi = emi
+        self.payment = payment
+        self.principal_paid = principal_paid
+        self.interest = interest
+        self.balance = balance
+
+    @property
+    def total_payable(self) -> float:
+        """Sum of all payments"""
+        return round(float(self.payment.sum()), 2)
+
+    @property
+    def total_interest(self) -> float:
+        """Sum of the interest components"""
+        return round(float(self.interest.sum()), 2)
+
+    def due_dates(self, start: DateLike) -> List[date]:
+        """
+        Installment due dates, one calendar month apart
+
+        Args:
+            start: Disbursement / sanction date; the first EMI is due a month later
+
+        Returns:
+            Due date of each installment (month-end safe: 31 Jan -> 28/29 Feb)
+        """
+        start = start.date() if isinstance(start, datetime) else start
+        return [start + relativedelta(months=month) for month in range(1, self.tenure + 1)]
+
+    def first_emi_date(self, start: DateLike) -> date:
+        """Due date of the first installment"""
+        start = start.date() if isinstance(start, datetime) else start
+        return start + relativedelta(months=1)
+
+    def maturity_date(self, start: DateLike) -> date:
+        """Due date of the last installment"""
+        start = start.date() if isinstance(start, datetime) else start
+        return start + relativedelta(months=self.tenure)
+
+    def rows(self, start: Optional[DateLike] = None) -> List[Dict]:
+        """
+        Schedule as a list of dicts (for JSON)
+
+        Args:
+            start: Disbursement date; adds a 'due_date' to each row when given
+
+        Returns:
+            One dict per month with 'month', 'payment', 'principal',
+            'interest' and 'balance'
+        """
+        rows = [
+            {"month": month, "payment": payment, "principal": principal,
+             "interest": interest, "balance": balance}
+            for month, payment, principal, interest, balance in zip(
+                range(1, self.tenure + 1), self.payment.tolist(), self.principal_paid.tolist(),
+                self.interest.tolist(), self.balance.tolist()
+            )
+        ]
+        if start is not None:
+            for row, due_date in zip(rows, self.due_dates(start)):
+                row["due_date"] = due_date.isoformat()
+        return rows
+
+
+class ScheduleBatch:
+    """
+    Schedules for many loans as 2-D arrays, one row per loan
+
+    Columns run to the longest tenure in the batch; months past a loan's own
+    tenure are zero.
+    """
+
+    def __init__(self, principal: np.ndarray, annual_rate: np.ndarray, tenure: np.ndarray,
+                 emi: np.ndarray, payment: np.ndarray, principal_paid: np.ndarray,
+                 interest: np.ndarray, balance: np.ndarray):
+        self.principal = principal
+        self.annual_rate = annual_rate
+        self.tenure = tenure
+        self.emi = emi
+        self.payment = payment
+        self.principal_paid = principal_paid
+        self.interest = interest
+        self.balance = balance
+
+    def __len__(self) -> int:
+        return len(self.principal)
+
+    @property
+    def total_payable(self) -> np.ndarray:
+        """Sum of all payments per loan"""
+        return np.round(self.payment.sum(axis=1), 2)
+
+    @property
+    def total_interest(self) -> np.ndarray:
+        """Sum of the interest components per loan"""
+        return np.round(self.interest.sum(axis=1), 2)
+
+    def schedule(self, i: int) -> AmortizationSchedule:
+        """Schedule of the i-th loan"""
+        n = int(self.tenure[i])
+        return AmortizationSchedule(
+            principal=float(self.principal[i]),
+            annual_rate=float(self.annual_rate[i]),
+            tenure=n,
+            emi=float(self.emi[i]),
+            payment=self.payment[i, :n],
+            principal_paid=self.principal_paid[i, :n],
+            interest=self.interest[i, :n],
+            balance=self.balance[i, :n]
+        )
+
+
+def amortization_schedules(principals: Sequence[float], annual_rates: Sequence[float],
+                           tenures: Sequence[int], emis: Optional[Sequence[float]] = None) -> ScheduleBatch:
+    """
+    Build schedules for many loans at once
+
+    Args:
+        principals: Loan amounts
+        annual_rates: Annual interest rates (percentage); 0 means interest free
+        tenures: Tenures in months (at least 1)
+        emis: Installments already quoted to the customers (computed with
+            the standard EMI formula and rounded to the paisa when omitted)
+
+    Returns:
+        ScheduleBatch in the order of the inputs
+
+    Raises:
+        ValueError: If the inputs differ in length or a tenure is below 1
+    """
+    principal = np.asarray(principals, dtype=float).reshape(-1)
+    annual_rate = np.asarray(annual_rates, dtype=float).reshape(-1)
+    tenure = np.asarray(tenures, dtype=int).reshape(-1)
+    if not (len(principal) == len(annual_rate) == len(tenure)):
+        raise ValueError("principals, annual_rates and tenures must have the same length")
+    if len(tenure) == 0:
+        empty = np.zeros((0, 0))
+        return ScheduleBatch(principal, annual_rate, tenure, np.zeros(0), empty, empty, empty, empty)
+    if tenure.min() < 1:
+        raise ValueError("tenures must be at least 1 month")
+
+    rate = annual_rate / 12 / 100
+    interest_free = rate <= 0
+    safe_rate = np.where(interest_free, 1.0, rate)  # Avoids 0/0; interest-free EMI is P / n
+
+    if emis is None:
+        growth_n = (1 + rate) ** tenure
+        factor = safe_rate * growth_n / np.where(interest_free, 1.0, growth_n - 1)  # Same annuity factor as calculate_emi
+        emi = np.where(interest_free, principal / tenure, principal * factor)
+        emi = np.round(emi, 2)
+    else:
+        emi = np.asarray(emis, dtype=float).reshape(-1)
+        if len(emi) != len(principal):
+            raise ValueError("emis must have the same length as principals")
+
+    # Run the ledger in whole paise so rounding is exact and platform independent
+    months = int(tenure.max())
+    rows = np.arange(len(principal))
+    interest = np.zeros((len(principal), months))
+    principal_paid = np.zeros_like(interest)
+    balance = np.zeros_like(interest)
+    installment = np.rint(emi * 100)
+
+    outstanding = np.rint(principal * 100)
+    for month in range(months):
+        charged = np.rint(outstanding * rate)
+        repaid = installment - charged
+        interest[:, month] = charged
+        principal_paid[:, month] = repaid
+        outstanding = outstanding - repaid
+        balance[:, month] = outstanding
+
+    # The final installment repays exactly what is left; later months are empty
+    last = tenure - 1
+    principal_paid[rows, last] += balance[rows, last]
+    active = np.arange(months)[None, :] < tenure[:, None]
+    principal_paid = np.where(active, principal_paid, 0.0) / 100
+    interest = np.where(active, interest, 0.0) / 100
+    balance = np.where(np.arange(months)[None, :] < last[:, None], balance, 0.0) / 100
+    payment = np.round(principal_paid + interest, 2)
+
+    return ScheduleBatch(principal, annual_rate, tenure, emi, payment, principal_paid, interest, balance)
+
+
+def amortization_schedule(principal: float, annual_rate: float, tenure_months: int,
+                          emi: Optional[float] = None) -> AmortizationSchedule:
+    """
+    Build the schedule of one loan
+
+    Args:
+        principal: Loan amount
+        annual_rate: Annual interest rate (percentage)
+        tenure_months: Tenure in months
+        emi: Installment already quoted to the customer (computed when omitted,
+            through the memoized calculate_emi)
+
+    Returns:
+        AmortizationSchedule
+    """
+    if emi is None and annual_rate > 0:
+        emi = calculate_emi(principal, annual_rate, tenure_months)
+    batch = amortization_schedules([principal], [annual_rate], [tenure_months],
+                                   None if emi is None else [emi])
+    return batch.schedule(0)
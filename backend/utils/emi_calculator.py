@@ -1,7 +1,38 @@
 """EMI calculation utilities"""
 
+from functools import lru_cache
+from typing import Dict
 import math
 
+from policy import policy_store
+import config
+
+
+@lru_cache(maxsize=config.ANNUITY_FACTOR_CACHE_SIZE)
+def annuity_factor(annual_rate: float, tenure_months: int) -> float:
+    """
+    EMI per rupee of principal: r × (1 + r)^n / ((1 + r)^n - 1)
+    
+    Depends only on the rate and tenure, so there is one entry per rate tier
+    and tenure option and an EMI is a single multiply.
+    
+    Args:
+        annual_rate: Annual interest rate (percentage)
+        tenure_months: Loan tenure in months
+        
+    Returns:
+        Annuity factor
+    """
+    monthly_rate = annual_rate / 12 / 100
+    growth = math.pow(1 + monthly_rate, tenure_months)
+    return monthly_rate * growth / (growth - 1)
+
+
+@lru_cache(maxsize=config.EMI_CACHE_SIZE)
+def _cached_emi(principal_paise: int, annual_rate: float, tenure_months: int) -> float:
+    """EMI for a principal in whole paise (see calculate_emi)"""
+    return round(principal_paise / 100 * annuity_factor(annual_rate, tenure_months), 2)
+
 
 def calculate_emi(principal: float, annual_rate: float, tenure_months: int) -> float:
     """
@@ -13,6 +44,11 @@ def calculate_emi(principal: float, annual_rate: float, tenure_months: int) -> f
     r = Monthly interest rate (annual rate / 12 / 100)
     n = Tenure in months
     
+    Results are memoized on (principal in whole paise, rate, tenure), so
+    computed amounts (counter-offers, solver steps) that differ only in float
+    noise share one entry; the rate and tenure part comes from the annuity
+    factor table.
+    
     Args:
         principal: Loan amount
         annual_rate: Annual interest rate (percentage)
@@ -24,16 +60,23 @@ def calculate_emi(principal: float, annual_rate: float, tenure_months: int) -> f
     if principal <= 0 or annual_rate <= 0 or tenure_months <= 0:
         return 0.0
     
-    # Convert annual rate to monthly rate
-    monthly_rate = annual_rate / 12 / 100
-    
-    # Calculate EMI
-    numerator = principal * monthly_rate * math.pow(1 + monthly_rate, tenure_months)
-    denominator = math.pow(1 + monthly_rate, tenure_months) - 1
-    
-    emi = numerator / denominator
-    
-    return round(emi, 2)
+    return _cached_emi(int(principal * 100 + 0.5), annual_rate, tenure_months)
+
+
+def emi_cache_stats() -> Dict[str, Dict]:
+    """Size, hit / miss counts and hit rate of the EMI and annuity factor caches"""
+    stats = {}
+    for name, cached in (("emi", _cached_emi), ("annuity_factor", annuity_factor)):
+        info = cached.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "size": info.currsize,
+            "max_size": info.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0
+        }
+    return stats
 
 
 def calculate_total_payable(emi: float, tenure_months: int) -> float:
@@ -49,13 +92,6 @@ def get_interest_rate(credit_score: int) -> float:
         credit_score: Customer's credit score
         
     Returns:
-        Annual interest rate percentage
+        Annual interest rate percentage (from the current underwriting policy's rate tiers)
     """
-    if credit_score >= 800:
-        return 10.5  # Excellent
-    elif credit_score >= 750:
-        return 11.5  # Good
-    elif credit_score >= 700:
-        return 12.5  # Fair
-    else:
-        return 13.5  # Below threshold
+    return policy_store.get().interest_rate(credit_score)
@@ -0,0 +1,113 @@
+"""
+Inverse EMI calculations (closed form, vectorized with NumPy)
+
+calculate_emi answers "what is the EMI for this amount and tenure". These
+answer the reverse questions underwriting needs for counter-offers, by
+solving the same formula, EMI = P × r × (1 + r)^n / ((1 + r)^n - 1), for P
+or for n:
+
+    P = EMI × (1 - (1 + r)^-n) / r
+    n = -ln(1 - P × r / EMI) / ln(1 + r)
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from utils.emi_calculator import calculate_emi
+import config
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def max_principal(max_emi: ArrayLike, annual_rate: ArrayLike, tenure_months: ArrayLike) -> np.ndarray:
+    """
+    Largest loan amount whose EMI does not exceed max_emi
+
+    Arguments broadcast against each other, e.g. one EMI cap and rate
+    against every tenure option.
+
+    Args:
+        max_emi: Highest affordable EMI
+        annual_rate: Annual interest rate (percentage)
+        tenure_months: Tenure in months
+
+    Returns:
+        Exact (unrounded) principal for each combination
+    """
+    max_emi = np.asarray(max_emi, dtype=float)
+    rate = np.asarray(annual_rate, dtype=float) / 12 / 100
+    tenure = np.asarray(tenure_months, dtype=float)
+    interest_free = rate <= 0
+    safe_rate = np.where(interest_free, 1.0, rate)
+    return np.where(interest_free, max_emi * tenure,
+                    max_emi * (1 - (1 + safe_rate) ** -tenure) / safe_rate)
+
+
+def min_tenure(principal: ArrayLike, annual_rate: ArrayLike, max_emi: ArrayLike) -> np.ndarray:
+    """
+    Shortest tenure (in fractional months) whose EMI does not exceed max_emi
+
+    Args:
+        principal: Loan amount
+        annual_rate: Annual interest rate (percentage)
+        max_emi: Highest affordable EMI
+
+    Returns:
+        Months for each combination; inf where the EMI cap does not even
+        cover the monthly interest, so no tenure works
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(annual_rate, dtype=float) / 12 / 100
+    max_emi = np.asarray(max_emi, dtype=float)
+    interest_free = rate <= 0
+    safe_rate = np.where(interest_free, 1.0, rate)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coverage = 1 - principal * safe_rate / max_emi
+        months = -np.log(np.where(coverage > 0, coverage, 1.0)) / np.log1p(safe_rate)
+        months = np.where(coverage > 0, months, np.inf)
+        return np.where(interest_free, principal / max_emi, months)
+
+
+def min_tenure_option(principal: float, annual_rate: float, max_emi: float,
+                      options: Optional[Sequence[int]] = None) -> Optional[int]:
+    """
+    Shortest offered tenure whose EMI does not exceed max_emi
+
+    Args:
+        principal: Loan amount
+        annual_rate: Annual interest rate (percentage)
+        max_emi: Highest affordable EMI
+        options: Tenures to choose from (defaults to config.TENURE_OPTIONS)
+
+    Returns:
+        Tenure in months, or None if even the longest option is unaffordable
+    """
+    options = sorted(options or config.TENURE_OPTIONS)
+    needed = float(min_tenure(principal, annual_rate, max_emi))
+    # Quoted EMIs are rounded to the paisa, so the exact answer can land just
+    # past an option that still fits; start a month early and confirm with calculate_emi
+    for tenure in options[int(np.searchsorted(options, needed - 1)):]:
+        if calculate_emi(principal, annual_rate, tenure) <= max_emi:
+            return tenure
+    return None
+
+
+def max_affordable_amount(max_emi: float, annual_rate: float, tenure_months: int,
+                          step: float = config.COUNTER_OFFER_AMOUNT_STEP) -> float:
+    """
+    Largest amount, rounded down to a step, whose quoted EMI fits max_emi
+
+    Args:
+        max_emi: Highest affordable EMI
+        annual_rate: Annual interest rate (percentage)
+        tenure_months: Tenure in months
+        step: Rounding step for the amount
+
+    Returns:
+        Amount (0 if not even one step is affordable)
+    """
+    amount = float(np.floor(max_principal(max_emi, annual_rate, tenure_months) / step) * step)
+    while amount > 0 and calculate_emi(amount, annual_rate, tenure_months) > max_emi:
+        amount -= step
+    return max(amount, 0.0)
@@ -0,0 +1,314 @@
+"""
+Sanction letter renderers
+
+Every sanction letter goes through a LetterRenderer. Two backends exist:
+- "platypus": the flowable layout in sanction_letter_generator (the default)
+- "canvas": the same letter drawn at fixed positions with reportlab.pdfgen,
+  skipping flowable layout entirely
+
+The backend is chosen with config.SANCTION_RENDERER.
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+from datetime import datetime
+from typing import Any, Dict, List, Protocol
+import io
+
+from utils.sanction_letter_generator import (
+    get_template, loan_detail_rows, TEMPLATE_VERSION, COMPANY_NAME, COMPANY_ADDRESS,
+    COMPANY_EMAIL, COMPANY_PHONE, COMPANY_WEBSITE, TERMS
+)
+import config
+
+
+class LetterRenderer(Protocol):
+    """Renders a sanction letter PDF from the generator's three input dicts"""
+
+    name: str
+    version: str  # Changes whenever the output for the same inputs changes
+
+    def render(self, application_data: Dict[str, Any], customer_data: Dict[str, Any],
+               loan_details: Dict[str, Any]) -> bytes:
+        """Render the letter and return PDF bytes"""
+        ...
+
+    def warm(self) -> None:
+        """Do any one-time setup up front (fonts, compiled layout)"""
+        ...
+
+
+class PlatypusLetterRenderer:
+    """Flowable layout (SimpleDocTemplate) with the compiled per-thread template"""
+
+    name = "platypus"
+    version = TEMPLATE_VERSION
+
+    def render(self, application_data: Dict[str, Any], customer_data: Dict[str, Any],
+               loan_details: Dict[str, Any]) -> bytes:
+        return get_template().render(application_data, customer_data, loan_details)
+
+    def warm(self) -> None:
+        get_template()
+
+
+NAVY = colors.HexColor('#1a237e')
+HEADER_FILL = colors.HexColor('#e8eaf6')
+STRIPE_FILL = colors.HexColor('#f5f5f5')
+
+DOCUMENTS = [
+    "1. Duly signed loan agreement",
+    "2. Post-dated cheques (PDCs) for EMI payments",
+    "3. Bank account details for disbursement",
+    "4. Latest salary slip (if not already submitted)",
+    "5. Address proof and identity proof (KYC documents)",
+    "6. Any other documents as communicated by our loan officer"
+]
+
+CLOSING = ("We appreciate your trust in our services and look forward to a long-lasting relationship. "
+           "For any queries or assistance, please feel free to contact our customer care team.")
+
+
+class CanvasLetterRenderer:
+    """
+    Fixed-position letter drawn straight onto a pdfgen canvas
+
+    The letter's structure never changes, so instead of measuring and
+    flowing paragraphs it draws each block at a known position, moving a
+    cursor down the page. Static text is wrapped once in __init__; only the
+    customer block and opening line are wrapped per letter.
+    """
+
+    name = "canvas"
+    version = f"{TEMPLATE_VERSION}.1"  # Shares the wording (TERMS etc.) with the platypus template
+
+    PAGE_WIDTH, PAGE_HEIGHT = A4
+    LEFT = 0.75 * inch
+    RIGHT = PAGE_WIDTH - 0.75 * inch
+    TOP = PAGE_HEIGHT - 0.75 * inch
+    BOTTOM = 0.75 * inch
+    WIDTH = RIGHT - LEFT
+
+    def __init__(self):
+        """Pre-wrap the static text blocks"""
+        self.terms = [simpleSplit(f"{i}. {term}", "Helvetica", 10, self.WIDTH)
+                      for i, term in enumerate(TERMS, 1)]
+        self.closing = simpleSplit(CLOSING, "Helvetica", 10, self.WIDTH)
+        self.address_lines = COMPANY_ADDRESS.split("\n") + [
+            f"Phone: {COMPANY_PHONE} | Email: {COMPANY_EMAIL} | Website: {COMPANY_WEBSITE}"
+        ]
+
+    def warm(self) -> None:
+        self.render({'application_id': 'WARMUP'}, {'name': 'Warm Up'},
+                    {'amount': 1.0, 'interest_rate': 1.0, 'tenure': 12, 'emi': 1.0, 'processing_fee': 0.0})
+
+    def render(self, application_data: Dict[str, Any], customer_data: Dict[str, Any],
+               loan_details: Dict[str, Any]) -> bytes:
+        """
+        Render a letter
+
+        Args:
+            application_data: Application ID, sanction letter number and
+                optional 'issue_date' (defaults to now)
+            customer_data: Customer name, address, etc.
+            loan_details: Loan amount, tenure, EMI, etc.
+
+        Returns:
+            PDF bytes
+        """
+        issue_date = application_data.get('issue_date') or datetime.now()
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pagesize=A4)
+        c.setTitle("Loan Sanction Letter")
+        c.setAuthor(COMPANY_NAME)
+
+        y = self._letterhead(c)
+
+        # Title
+        c.setFont("Helvetica-Bold", 18)
+        c.setFillColor(NAVY)
+        c.drawCentredString(self.PAGE_WIDTH / 2, y - 18, "LOAN SANCTION LETTER")
+        y -= 48
+
+        # Reference details
+        refs = [
+            ("Sanction Letter No:", application_data.get('sanction_letter_no', 'SL/2025/' + application_data['application_id'])),
+            ("Date:", issue_date.strftime('%d %B %Y')),
+            ("Application ID:", application_data['application_id'])
+        ]
+        for label, value in refs:
+            c.setFont("Helvetica-Bold", 10)
+            c.setFillColor(NAVY)
+            c.drawString(self.LEFT, y, label)
+            c.setFont("Helvetica", 10)
+            c.setFillColor(colors.black)
+            c.drawString(self.LEFT + 2 * inch, y, str(value))
+            y -= 16
+        y -= 14
+
+        # Customer details
+        y = self._line(c, y, "To,", bold=True)
+        y = self._line(c, y, customer_data['name'], bold=True)
+        for line in simpleSplit(str(customer_data.get('address', 'N/A')), "Helvetica", 10, self.WIDTH):
+            y = self._line(c, y, line)
+        y = self._line(c, y, f"Email: {customer_data.get('email', 'N/A')}")
+        y = self._line(c, y, f"Phone: {customer_data.get('phone', 'N/A')}")
+        y -= 14
+
+        # Subject and opening
+        y = self._line(c, y, f"Subject: Sanction of Personal Loan - Rs. {loan_details['amount']:,.2f}", bold=True)
+        y -= 14
+        y = self._line(c, y, f"Dear {customer_data['name'].split()[0]},")
+        y -= 12
+        opening = (f"We are pleased to inform you that your application for a Personal Loan has been "
+                   f"approved by {COMPANY_NAME}. The sanction is subject to the terms and conditions "
+                   f"mentioned herein.")
+        for line in simpleSplit(opening, "Helvetica", 10, self.WIDTH):
+            y = self._line(c, y, line)
+        y -= 14
+
+        # Loan details table
+        y = self._heading(c, y, "LOAN DETAILS")
+        y = self._loan_table(c, y, loan_detail_rows(loan_details, issue_date))
+        y -= 20
+
+        # Terms and conditions
+        y = self._heading(c, y, "TERMS AND CONDITIONS")
+        for lines in self.terms:
+            y = self._ensure_space(c, y, 12 * len(lines))
+            for line in lines:
+                y = self._line(c, y, line)
+            y -= 6
+        y -= 8
+
+        # Documents required
+        y = self._ensure_space(c, y, 12 * (len(DOCUMENTS) + 3))
+        y = self._heading(c, y, "DOCUMENTS REQUIRED FOR DISBURSEMENT")
+        for line in DOCUMENTS:
+            y = self._line(c, y, line)
+        y -= 20
+
+        # Closing, signature and footer
+        y = self._ensure_space(c, y, 12 * (len(self.closing) + 12))
+        for line in self.closing:
+            y = self._line(c, y, line)
+        y -= 20
+        y = self._line(c, y, f"For {COMPANY_NAME}", bold=True)
+        y -= 24
+        y = self._line(c, y, "Authorized Signatory", bold=True)
+        y = self._line(c, y, "Credit Manager")
+        y = self._line(c, y, "Personal Loans Division")
+        y -= 20
+
+        c.setFillColor(colors.grey)
+        c.setFont("Helvetica-Oblique", 8)
+        c.drawCentredString(self.PAGE_WIDTH / 2, y,
+                            "This is a computer-generated document and does not require a physical signature.")
+        c.setFont("Helvetica", 8)
+        c.drawCentredString(self.PAGE_WIDTH / 2, y - 10,
+                            f"{COMPANY_NAME} | {COMPANY_PHONE} | {COMPANY_EMAIL} | {COMPANY_WEBSITE}")
+
+        c.showPage()
+        c.save()
+        return buffer.getvalue()
+
+    def _letterhead(self, c: canvas.Canvas) -> float:
+        """Draw company name, address and rule; return the cursor below it"""
+        y = self.TOP
+        c.setFont("Helvetica-Bold", 16)
+        c.setFillColor(NAVY)
+        c.drawCentredString(self.PAGE_WIDTH / 2, y - 16, COMPANY_NAME.upper())
+        y -= 30
+        c.setFont("Helvetica", 8)
+        c.setFillColor(colors.grey)
+        for line in self.address_lines:
+            c.drawCentredString(self.PAGE_WIDTH / 2, y, line)
+            y -= 10
+        y -= 8
+        c.setStrokeColor(NAVY)
+        c.setLineWidth(2)
+        c.line(self.LEFT, y, self.RIGHT, y)
+        c.setStrokeColor(colors.grey)
+        c.setLineWidth(0.5)
+        c.line(self.LEFT, y - 4, self.RIGHT, y - 4)
+        return y - 26
+
+    def _line(self, c: canvas.Canvas, y: float, text: str, bold: bool = False) -> float:
+        """Draw one body line and return the next baseline"""
+        y = self._ensure_space(c, y, 12)
+        c.setFont("Helvetica-Bold" if bold else "Helvetica", 10)
+        c.setFillColor(colors.black)
+        c.drawString(self.LEFT, y, text)
+        return y - 12
+
+    def _heading(self, c: canvas.Canvas, y: float, text: str) -> float:
+        """Draw a section heading"""
+        y = self._ensure_space(c, y, 40)
+        c.setFont("Helvetica-Bold", 12)
+        c.setFillColor(NAVY)
+        c.drawString(self.LEFT, y, text)
+        return y - 22
+
+    def _ensure_space(self, c: canvas.Canvas, y: float, needed: float) -> float:
+        """Start a new page if the next block does not fit"""
+        if y - needed >= self.BOTTOM:
+            return y
+        c.showPage()
+        return self.TOP
+
+    def _loan_table(self, c: canvas.Canvas, y: float, rows: List[List[str]]) -> float:
+        """Draw the striped, gridded loan table; return the cursor below it"""
+        row_height = 22
+        label_width, value_width = 3 * inch, 2.5 * inch
+        y = self._ensure_space(c, y, row_height * len(rows))
+        top = y + 4
+        for i, (label, value) in enumerate(rows):
+            row_top = top - i * row_height
+            c.setFillColor(HEADER_FILL if i == 0 else (colors.white if i % 2 == 0 else STRIPE_FILL))
+            c.rect(self.LEFT, row_top - row_height, label_width + value_width, row_height, stroke=0, fill=1)
+            baseline = row_top - row_height / 2 - 3.5
+            c.setFillColor(NAVY if i == 0 else colors.black)
+            c.setFont("Helvetica-Bold", 10)
+            c.drawString(self.LEFT + 6, baseline, label)
+            c.setFont("Helvetica", 10)
+            c.drawRightString(self.LEFT + label_width + value_width - 6, baseline, value)
+
+        # Grid
+        bottom = top - row_height * len(rows)
+        c.setStrokeColor(colors.grey)
+        c.setLineWidth(0.5)
+        for i in range(len(rows) + 1):
+            c.line(self.LEFT, top - i * row_height, self.LEFT + label_width + value_width, top - i * row_height)
+        for x in (self.LEFT, self.LEFT + label_width, self.LEFT + label_width + value_width):
+            c.line(x, top, x, bottom)
+        return bottom - 12
+
+
+RENDERERS = {
+    "platypus": PlatypusLetterRenderer,
+    "canvas": CanvasLetterRenderer
+}
+
+_renderers: Dict[str, LetterRenderer] = {}
+
+
+def get_letter_renderer(name: str = None) -> LetterRenderer:
+    """
+    Get a renderer backend (one shared instance per backend)
+
+    Args:
+        name: "platypus" or "canvas" (defaults to config.SANCTION_RENDERER)
+
+    Returns:
+        LetterRenderer
+    """
+    name = name or config.SANCTION_RENDERER
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown sanction letter renderer: {name!r} (expected one of {sorted(RENDERERS)})")
+    renderer = _renderers.get(name)
+    if renderer is None:
+        renderer = _renderers[name] = RENDERERS[name]()
+    return renderer
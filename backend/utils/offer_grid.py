@@ -0,0 +1,204 @@
+"""
+Offer grid: EMI, total payable and EMI-to-salary ratio for every tenure
+option across a ladder of loan amounts, computed in one vectorized pass
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import threading
+
+import numpy as np
+
+from models import Customer
+from utils.amortization import amortization_schedules
+from policy import policy_store
+import config
+
+
+class OfferGrid:
+    """
+    Offer terms for an amount ladder (rows) by tenure option (columns)
+
+    Amounts off the ladder (e.g. the exact amount a customer asked for) are
+    computed on first use and kept with the grid (the most recent
+    MAX_EXTRA_AMOUNTS of them).
+    """
+
+    MAX_EXTRA_AMOUNTS = 256
+
+    def __init__(self, interest_rate: float, monthly_salary: float, amounts: List[float],
+                 max_emi_to_salary: float, tenures: Optional[List[int]] = None):
+        """
+        Compute the grid
+
+        Args:
+            interest_rate: Annual interest rate (percentage)
+            monthly_salary: Salary the EMI-to-salary ratio is measured against
+                (0 when unknown)
+            amounts: Amount ladder
+            max_emi_to_salary: Highest affordable EMI as a fraction of salary
+            tenures: Tenure options in months (defaults to config.TENURE_OPTIONS)
+        """
+        self.interest_rate = interest_rate
+        self.monthly_salary = monthly_salary
+        self.max_emi_to_salary = max_emi_to_salary
+        self.tenures = list(tenures or config.TENURE_OPTIONS)
+        self.amounts = [float(amount) for amount in amounts]
+        self.emi, self.total_payable = self._compute(self.amounts)
+        self._rows = {amount: i for i, amount in enumerate(self.amounts)}
+        self._extra: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def _compute(self, amounts: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """EMI and total payable matrices (amounts x tenures) from one batch of schedules"""
+        principals = np.repeat(amounts, len(self.tenures))
+        tenures = np.tile(self.tenures, len(amounts))
+        batch = amortization_schedules(principals, np.full(len(principals), self.interest_rate), tenures)
+        shape = (len(amounts), len(self.tenures))
+        return batch.emi.reshape(shape), batch.total_payable.reshape(shape)
+
+    @property
+    def emi_to_salary(self) -> Optional[np.ndarray]:
+        """EMI as a fraction of monthly salary (None when the salary is unknown)"""
+        if not self.monthly_salary:
+            return None
+        return np.round(self.emi / self.monthly_salary, 4)
+
+    def options(self, amount: float) -> List[Dict]:
+        """
+        Terms for one amount at every tenure option
+
+        Args:
+            amount: Loan amount (on the ladder or not)
+
+        Returns:
+            One dict per tenure with 'tenure', 'emi', 'total_payable',
+            'total_interest', 'emi_to_salary' and 'affordable' (EMI within
+            max_emi_to_salary of salary; None when salary is unknown)
+        """
+        amount = float(amount)
+        row = self._rows.get(amount)
+        if row is not None:
+            emi, total_payable = self.emi[row], self.total_payable[row]
+        else:
+            with self._lock:
+                if amount not in self._extra:
+                    if len(self._extra) >= self.MAX_EXTRA_AMOUNTS:
+                        self._extra.pop(next(iter(self._extra)))
+                    emi, total_payable = self._compute([amount])
+                    self._extra[amount] = (emi[0], total_payable[0])
+                emi, total_payable = self._extra[amount]
+
+        options = []
+        for tenure, tenure_emi, tenure_total in zip(self.tenures, emi.tolist(), total_payable.tolist()):
+            ratio = round(tenure_emi / self.monthly_salary, 4) if self.monthly_salary else None
+            options.append({
+                "tenure": tenure,
+                "emi": tenure_emi,
+                "total_payable": tenure_total,
+                "total_interest": round(tenure_total - amount, 2),
+                "emi_to_salary": ratio,
+                "affordable": None if ratio is None else ratio <= self.max_emi_to_salary
+            })
+        return options
+
+    def option(self, amount: float, tenure: int) -> Optional[Dict]:
+        """Terms for one amount and tenure (None if the tenure is not offered)"""
+        return next((option for option in self.options(amount) if option["tenure"] == tenure), None)
+
+    def to_dict(self) -> Dict:
+        """Grid as plain lists (for JSON)"""
+        ratio = self.emi_to_salary
+        return {
+            "interest_rate": self.interest_rate,
+            "monthly_salary": self.monthly_salary,
+            "tenures": self.tenures,
+            "amounts": self.amounts,
+            "emi": self.emi.tolist(),
+            "total_payable": self.total_payable.tolist(),
+            "emi_to_salary": ratio.tolist() if ratio is not None else None,
+            "max_emi_to_salary": self.max_emi_to_salary
+        }
+
+
+def amount_ladder(max_amount: float, step: float = config.OFFER_GRID_AMOUNT_STEP) -> List[float]:
+    """
+    Loan amounts from one step up to max_amount
+
+    Args:
+        max_amount: Largest amount offered (always included)
+        step: Ladder spacing
+
+    Returns:
+        Ascending amounts
+    """
+    amounts = np.arange(step, max_amount, step).tolist() if max_amount > step else []
+    return amounts + [float(max_amount)]
+
+
+class OfferGridService:
+    """
+    Hands out offer grids, cached per rate tier, salary, amount ceiling and
+    underwriting policy version
+
+    Those are the only customer attributes a grid depends on, so a customer
+    gets the same grid object on every call (and customers with identical
+    terms share one). Least recently used grids are dropped beyond
+    config.OFFER_GRID_CACHE_SIZE.
+    """
+
+    def __init__(self, max_grids: int = config.OFFER_GRID_CACHE_SIZE):
+        """
+        Initialize service
+
+        Args:
+            max_grids: Grids kept in the cache
+        """
+        self.max_grids = max_grids
+        self._grids: "OrderedDict[Tuple[str, float, float, float], OfferGrid]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_grid(self, customer: Customer, monthly_salary: Optional[float] = None) -> OfferGrid:
+        """
+        Offer grid for a customer
+
+        Args:
+            customer: Customer profile
+            monthly_salary: Verified salary, if known (defaults to the CRM salary)
+
+        Returns:
+            OfferGrid up to the largest amount the customer can apply for
+            under the current underwriting policy)
+        """
+        policy = policy_store.get()
+        interest_rate = policy.interest_rate(customer.credit_score)
+        salary = float(monthly_salary or customer.monthly_salary or 0)
+        max_amount = float(policy.max_eligible_amount(customer.pre_approved_limit))
+        key = (policy.version, interest_rate, salary, max_amount)
+
+        with self._lock:
+            grid = self._grids.get(key)
+            if grid is not None:
+                self._grids.move_to_end(key)
+                self._hits += 1
+                return grid
+            self._misses += 1
+
+        grid = OfferGrid(interest_rate, salary, amount_ladder(max_amount), policy.max_emi_to_salary_ratio)
+        with self._lock:
+            self._grids[key] = grid
+            self._grids.move_to_end(key)
+            while len(self._grids) > self.max_grids:
+                self._grids.popitem(last=False)
+        return grid
+
+    def get_stats(self) -> Dict:
+        """Cache size and hit / miss counts"""
+        with self._lock:
+            return {"grids": len(self._grids), "hits": self._hits, "misses": self._misses}
+
+
+# Singleton instance
+offer_grid_service = OfferGridService()
@@ -0,0 +1,230 @@
+"""
+Process pool for sanction letter PDF rendering
+
+ReportLab layout is CPU-bound and holds the GIL, so rendering in threads still
+serializes approvals behind each other. Letters are rendered in a small pool of
+worker processes instead, warmed up front with ReportLab, its fonts and a
+generator instance.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+import asyncio
+import multiprocessing
+import threading
+import time
+import config
+
+
+class RenderQueueFullError(RuntimeError):
+    """Raised when too many renders are already running or queued"""
+
+
+class RenderTimeoutError(TimeoutError):
+    """Raised when a render does not finish within the configured timeout"""
+
+
+# Per-process generator, created by the worker initializer
+_generator = None
+
+
+def _warm_worker():
+    """Worker initializer: import ReportLab, load fonts and compile the letter template once"""
+    global _generator
+    from reportlab.pdfbase import pdfmetrics
+    from utils.sanction_letter_generator import SanctionLetterGenerator
+    from utils.letter_renderer import get_letter_renderer
+
+    for font_name in ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique"):
+        pdfmetrics.getFont(font_name)
+    get_letter_renderer().warm()  # Compile styles and static layout
+    _generator = SanctionLetterGenerator()
+
+
+def _ping() -> bool:
+    """No-op task used to start and warm every worker"""
+    return True
+
+
+def _render(application_data: Dict[str, Any], customer_data: Dict[str, Any],
+            loan_details: Dict[str, Any]) -> bytes:
+    """Render one letter (runs in a worker process, or a thread when inline)"""
+    if _generator is None:
+        _warm_worker()
+    return _generator.generate_sanction_letter(
+        application_data=application_data,
+        customer_data=customer_data,
+        loan_details=loan_details
+    )
+
+
+class RenderPool:
+    """
+    Bounded, warm process pool that renders sanction letters
+
+    At most max_pending renders may be running or queued; beyond that callers
+    get RenderQueueFullError straight away instead of waiting behind the
+    backlog. A render that takes longer than timeout raises RenderTimeoutError;
+    the worker finishes it in the background and it keeps its place in the
+    bound until it does. With workers=0 letters are rendered in the shared
+    CPU thread pool instead, which bounds its own queue.
+
+    The pool is created and replaced under a lock, since start() runs on
+    executor threads and several renders can see a worker die at once.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        """
+        Initialize render pool (processes start on first use or start())
+
+        Args:
+            workers: Worker processes (0 renders in threads instead)
+            max_pending: Maximum renders running plus queued
+            timeout: Seconds a caller waits for one render
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Renders finish on the pool's result thread, so counters are shared with it
+        self._counter_lock = threading.Lock()
+        self._pending = 0
+        self._rendered = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    def start(self):
+        """Start the worker processes and wait until each is warm"""
+        if self.workers > 0:
+            self._get_pool()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Current pool, starting one if there is none"""
+        pool = self._pool
+        if pool is not None:
+            return pool
+        with self._pool_lock:
+            if self._pool is None:
+                started = time.perf_counter()
+                pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # Spawned workers do not inherit the server's threads, locks or sockets
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker
+                )
+                for future in [pool.submit(_ping) for _ in range(self.workers)]:
+                    future.result()
+                self._pool = pool
+                print(f"[Render Pool] {self.workers} worker(s) warm in {time.perf_counter() - started:.2f}s")
+            return self._pool
+
+    def _discard_pool(self, broken: ProcessPoolExecutor):
+        """Drop a broken pool, unless another render has already replaced it"""
+        with self._pool_lock:
+            if self._pool is broken:
+                print("[Render Pool] ⚠️ Worker died, restarting pool")
+                self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future: Optional[Future] = None):
+        """Free a pending slot"""
+        with self._counter_lock:
+            self._pending -= 1
+
+    async def render(self, application_data: Dict[str, Any], customer_data: Dict[str, Any],
+                     loan_details: Dict[str, Any]) -> bytes:
+        """
+        Render a sanction letter PDF
+
+        Args:
+            application_data: Application ID, sanction letter number
+            customer_data: Customer name, address, etc.
+            loan_details: Loan amount, tenure, EMI, etc.
+
+        Returns:
+            PDF bytes
+
+        Raises:
+            RenderQueueFullError: If max_pending renders are already in progress
+            RenderTimeoutError: If the render takes longer than the timeout
+        """
+        with self._counter_lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise RenderQueueFullError(f"{self._pending} sanction letters already rendering")
+            self._pending += 1
+
+        # The worker-side future of the latest attempt, set by _submit
+        submitted: Dict[str, Future] = {}
+        try:
+            return await asyncio.wait_for(
+                self._submit(application_data, customer_data, loan_details, submitted),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            with self._counter_lock:
+                self._timed_out += 1
+            raise RenderTimeoutError(f"Sanction letter render exceeded {self.timeout}s")
+        finally:
+            future = submitted.get("future")
+            if future is None or future.done():
+                self._release()
+            else:
+                # Still rendering in a worker: hold the slot until it finishes
+                future.add_done_callback(self._release)
+
+    async def _submit(self, application_data: Dict[str, Any], customer_data: Dict[str, Any],
+                      loan_details: Dict[str, Any], submitted: Dict[str, Future]) -> bytes:
+        """Run one render on the pool, restarting it once if a worker died"""
+        if self.workers <= 0:
+            from executors import cpu_executor
+            pdf_bytes = await cpu_executor.run(_render, application_data, customer_data, loan_details)
+            with self._counter_lock:
+                self._rendered += 1
+            return pdf_bytes
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._pool
+            if pool is None:
+                pool = await loop.run_in_executor(None, self._get_pool)
+            try:
+                future = submitted["future"] = pool.submit(_render, application_data, customer_data, loan_details)
+                pdf_bytes = await asyncio.wrap_future(future)
+                with self._counter_lock:
+                    self._rendered += 1
+                return pdf_bytes
+            except BrokenProcessPool:
+                if attempt:
+                    raise
+                self._discard_pool(pool)
+
+    def get_stats(self) -> dict:
+        """
+        Get render pool load
+
+        Returns:
+            Dictionary with pool size and render counters
+        """
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rendered": self._rendered,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out
+        }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            print("[Render Pool] Workers shut down")
+
+
+# Singleton instance
+render_pool = RenderPool(config.RENDER_WORKERS, config.RENDER_MAX_PENDING, config.RENDER_TIMEOUT_SECONDS)
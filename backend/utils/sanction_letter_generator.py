@@ -9,61 +9,134 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_JUSTIFY
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, List
+import copy
 import io
+import threading
 
+from utils.amortization import amortization_schedule
 
-class SanctionLetterGenerator:
-    """Generate professional loan sanction letters in PDF format"""
-    
-    def __init__(self):
-        self.company_name = "Tata Capital Limited"
-        self.company_address = "11th Floor, Tower A, Peninsula Business Park\nGanpatrao Kadam Marg, Lower Parel\nMumbai - 400013, Maharashtra, India"
-        self.company_email = "customercare@tatacapital.com"
-        self.company_phone = "1800-209-6464"
-        self.company_website = "www.tatacapital.com"
-    
-    def generate_sanction_letter(
-        self,
-        application_data: Dict[str, Any],
-        customer_data: Dict[str, Any],
-        loan_details: Dict[str, Any],
-        output_path: str = None
-    ) -> bytes:
+
+# Bump whenever the letter layout or wording changes (part of the artifact cache key)
+TEMPLATE_VERSION = "2"
+
+COMPANY_NAME = "Tata Capital Limited"
+COMPANY_ADDRESS = "11th Floor, Tower A, Peninsula Business Park\nGanpatrao Kadam Marg, Lower Parel\nMumbai - 400013, Maharashtra, India"
+COMPANY_EMAIL = "customercare@tatacapital.com"
+COMPANY_PHONE = "1800-209-6464"
+COMPANY_WEBSITE = "www.tatacapital.com"
+
+TERMS = [
+    "The loan is subject to verification of all documents submitted by you.",
+    "EMI payments must be made on or before the due date each month through auto-debit from your bank account.",
+    "The interest rate is fixed for the entire tenure of the loan.",
+    "Processing fee is non-refundable and will be deducted from the loan amount at the time of disbursement.",
+    "You may prepay the loan at any time subject to prepayment charges as per our policy.",
+    "In case of default in EMI payment, penal interest will be charged as per our policy.",
+    "The loan is provided for personal use and cannot be used for speculative or illegal purposes.",
+    "You must maintain adequate insurance coverage as per our requirements.",
+    "Any change in your employment status or residential address must be intimated to us immediately.",
+    "This sanction is valid for 30 days from the date of this letter."
+]
+
+DOCUMENTS_TEXT = """
+        1. Duly signed loan agreement<br/>
+        2. Post-dated cheques (PDCs) for EMI payments<br/>
+        3. Bank account details for disbursement<br/>
+        4. Latest salary slip (if not already submitted)<br/>
+        5. Address proof and identity proof (KYC documents)<br/>
+        6. Any other documents as communicated by our loan officer
         """
-        Generate complete sanction letter PDF
-        
-        Args:
-            application_data: Application ID, date, etc.
-            customer_data: Customer name, address, etc.
-            loan_details: Loan amount, tenure, EMI, etc.
-            output_path: Optional file path to save PDF
-        
-        Returns:
-            PDF bytes
+
+CLOSING_TEXT = """
+        We appreciate your trust in our services and look forward to a long-lasting relationship. 
+        For any queries or assistance, please feel free to contact our customer care team.
         """
+
+SIGNATURE_TEXT = """
+        <b>For Tata Capital Limited</b><br/><br/><br/>
+        <b>Authorized Signatory</b><br/>
+        Credit Manager<br/>
+        Personal Loans Division
+        """
+
+REF_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#1a237e')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+LOAN_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8eaf6')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
+
+def loan_detail_rows(loan_details: Dict[str, Any], issue_date: datetime) -> List[List[str]]:
+    """
+    Label / value rows of the loan details table (shared by every renderer)
+    
+    Totals and dates come from the loan's amortization schedule: the total
+    payable includes the final installment's rounding adjustment, and due
+    dates fall on the same day of each calendar month.
+    
+    Args:
+        loan_details: Loan amount, interest rate, tenure, EMI, processing fee
+            and optional 'emi_start_date' and 'maturity_date' overrides
+        issue_date: Date of the letter
         
-        # Create PDF buffer
-        buffer = io.BytesIO()
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=0.75*inch,
-            leftMargin=0.75*inch,
-            topMargin=1*inch,
-            bottomMargin=0.75*inch
-        )
-        
-        # Container for PDF elements
-        elements = []
-        
-        # Define styles
+    Returns:
+        Table rows
+    """
+    schedule = amortization_schedule(loan_details['amount'], loan_details['interest_rate'],
+                                     loan_details['tenure'], emi=loan_details['emi'])
+    processing_fee = loan_details['processing_fee']
+    disbursement_amount = loan_details['amount'] - processing_fee
+    
+    return [
+        ['Loan Amount Sanctioned', f"Rs. {loan_details['amount']:,.2f}"],
+        ['Interest Rate (per annum)', f"{loan_details['interest_rate']}%"],
+        ['Loan Tenure', f"{loan_details['tenure']} months ({loan_details['tenure']//12} years)"],
+        ['Monthly EMI', f"Rs. {loan_details['emi']:,.2f}"],
+        ['Processing Fee', f"Rs. {processing_fee:,.2f}"],
+        ['Net Disbursement Amount', f"Rs. {disbursement_amount:,.2f}"],
+        ['Total Amount Payable', f"Rs. {schedule.total_payable:,.2f}"],
+        ['Total Interest Payable', f"Rs. {schedule.total_interest:,.2f}"],
+        ['EMI Start Date', loan_details.get('emi_start_date', schedule.first_emi_date(issue_date).strftime('%d %B %Y'))],
+        ['Loan Maturity Date', loan_details.get('maturity_date', schedule.maturity_date(issue_date).strftime('%d %B %Y'))]
+    ]
+
+
+class SanctionLetterTemplate:
+    """
+    Precompiled sanction letter layout
+    
+    Styles and every flowable that is the same in all letters (letterhead,
+    title, terms, documents, closing, signature, footer) are built once.
+    render() only creates the handful of customer-specific flowables.
+    Builds lay out shallow copies of the static flowables; a template is
+    still kept per thread (see get_template) since the copies share parsed
+    paragraph state with it.
+    """
+    
+    def __init__(self):
+        """Build styles and static flowables"""
         styles = getSampleStyleSheet()
         
-        # Custom styles
         title_style = ParagraphStyle(
             'CustomTitle',
             parent=styles['Heading1'],
@@ -83,7 +156,7 @@ class SanctionLetterGenerator:
             fontName='Helvetica-Bold'
         )
         
-        normal_style = ParagraphStyle(
+        self.normal_style = ParagraphStyle(
             'CustomNormal',
             parent=styles['Normal'],
             fontSize=10,
@@ -91,32 +164,93 @@ class SanctionLetterGenerator:
             alignment=TA_JUSTIFY
         )
         
-        # Add company letterhead
-        elements.extend(self._create_letterhead())
+        self.subject_style = ParagraphStyle(
+            'Subject',
+            parent=self.normal_style,
+            fontName='Helvetica-Bold'
+        )
         
-        # Add title
-        elements.append(Spacer(1, 0.3*inch))
-        title = Paragraph("LOAN SANCTION LETTER", title_style)
-        elements.append(title)
-        elements.append(Spacer(1, 0.2*inch))
+        footer_style = ParagraphStyle(
+            'Footer',
+            parent=self.normal_style,
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        )
+        
+        # Letterhead and title, before the reference table
+        self.header = self._create_letterhead() + [
+            Spacer(1, 0.3*inch),
+            Paragraph("LOAN SANCTION LETTER", title_style),
+            Spacer(1, 0.2*inch)
+        ]
+        
+        self.loan_heading = Paragraph("<b>LOAN DETAILS</b>", heading_style)
+        
+        # Everything after the loan details table
+        self.tail = [Spacer(1, 0.3*inch), Paragraph("<b>TERMS AND CONDITIONS</b>", heading_style)]
+        self.tail.extend(Paragraph(f"{i}. {term}", self.normal_style) for i, term in enumerate(TERMS, 1))
+        self.tail.extend([
+            Spacer(1, 0.2*inch),
+            Paragraph("<b>DOCUMENTS REQUIRED FOR DISBURSEMENT</b>", heading_style),
+            Paragraph(DOCUMENTS_TEXT, self.normal_style),
+            Spacer(1, 0.3*inch),
+            Paragraph(CLOSING_TEXT, self.normal_style),
+            Spacer(1, 0.3*inch),
+            Paragraph(SIGNATURE_TEXT, self.normal_style),
+            Spacer(1, 0.3*inch),
+            Paragraph(
+                f"""
+        <i>This is a computer-generated document and does not require a physical signature.</i><br/>
+        <b>{COMPANY_NAME}</b> | {COMPANY_PHONE} | {COMPANY_EMAIL} | {COMPANY_WEBSITE}
+        """,
+                footer_style
+            )
+        ])
+        
+    
+    def render(
+        self,
+        application_data: Dict[str, Any],
+        customer_data: Dict[str, Any],
+        loan_details: Dict[str, Any]
+    ) -> bytes:
+        """
+        Render a letter
         
-        # Add reference details
+        Args:
+            application_data: Application ID, sanction letter number and
+                optional 'issue_date' (defaults to now)
+            customer_data: Customer name, address, etc.
+            loan_details: Loan amount, tenure, EMI, etc.
+        
+        Returns:
+            PDF bytes
+        """
+        issue_date = application_data.get('issue_date') or datetime.now()
+        
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=0.75*inch,
+            leftMargin=0.75*inch,
+            topMargin=1*inch,
+            bottomMargin=0.75*inch
+        )
+        
+        # Shallow copies keep the parsed paragraph text but give each build its
+        # own layout state (platypus marks flowables it had to move to a new page)
+        elements = [copy.copy(flowable) for flowable in self.header]
+        
+        # Reference details
         ref_data = [
             ['Sanction Letter No:', application_data.get('sanction_letter_no', 'SL/2025/'+application_data['application_id'])],
-            ['Date:', datetime.now().strftime('%d %B %Y')],
+            ['Date:', issue_date.strftime('%d %B %Y')],
             ['Application ID:', application_data['application_id']]
         ]
-        
         ref_table = Table(ref_data, colWidths=[2*inch, 4*inch])
-        ref_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#1a237e')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
+        ref_table.setStyle(REF_TABLE_STYLE)
         elements.append(ref_table)
         elements.append(Spacer(1, 0.3*inch))
         
@@ -128,157 +262,44 @@ class SanctionLetterGenerator:
         Email: {customer_data.get('email', 'N/A')}<br/>
         Phone: {customer_data.get('phone', 'N/A')}
         """
-        elements.append(Paragraph(customer_text, normal_style))
+        elements.append(Paragraph(customer_text, self.normal_style))
         elements.append(Spacer(1, 0.2*inch))
         
         # Subject
-        subject_style = ParagraphStyle(
-            'Subject',
-            parent=normal_style,
-            fontName='Helvetica-Bold'
-        )
-        subject = Paragraph(
+        elements.append(Paragraph(
             f"<b>Subject: Sanction of Personal Loan - Rs. {loan_details['amount']:,.2f}</b>",
-            subject_style
-        )
-        elements.append(subject)
+            self.subject_style
+        ))
         elements.append(Spacer(1, 0.2*inch))
         
         # Opening paragraph
         opening = f"""
         Dear {customer_data['name'].split()[0]},<br/><br/>
         We are pleased to inform you that your application for a Personal Loan has been 
-        <b>approved</b> by {self.company_name}. The sanction is subject to the terms and 
+        <b>approved</b> by {COMPANY_NAME}. The sanction is subject to the terms and 
         conditions mentioned herein.
         """
-        elements.append(Paragraph(opening, normal_style))
+        elements.append(Paragraph(opening, self.normal_style))
         elements.append(Spacer(1, 0.2*inch))
         
         # Loan details table
-        elements.append(Paragraph("<b>LOAN DETAILS</b>", heading_style))
-        
-        # Calculate values
-        total_repayment = loan_details['emi'] * loan_details['tenure']
-        total_interest = total_repayment - loan_details['amount']
-        processing_fee = loan_details.get('processing_fee', loan_details['amount'] * 0.02)
-        disbursement_amount = loan_details['amount'] - processing_fee
-        
-        loan_data = [
-            ['Loan Amount Sanctioned', f"Rs. {loan_details['amount']:,.2f}"],
-            ['Interest Rate (per annum)', f"{loan_details['interest_rate']}%"],
-            ['Loan Tenure', f"{loan_details['tenure']} months ({loan_details['tenure']//12} years)"],
-            ['Monthly EMI', f"Rs. {loan_details['emi']:,.2f}"],
-            ['Processing Fee', f"Rs. {processing_fee:,.2f}"],
-            ['Net Disbursement Amount', f"Rs. {disbursement_amount:,.2f}"],
-            ['Total Amount Payable', f"Rs. {total_repayment:,.2f}"],
-            ['Total Interest Payable', f"Rs. {total_interest:,.2f}"],
-            ['EMI Start Date', loan_details.get('emi_start_date', (datetime.now() + timedelta(days=30)).strftime('%d %B %Y'))],
-            ['Loan Maturity Date', loan_details.get('maturity_date', (datetime.now() + timedelta(days=30*loan_details['tenure'])).strftime('%d %B %Y'))]
-        ]
-        
-        loan_table = Table(loan_data, colWidths=[3*inch, 2.5*inch])
-        loan_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8eaf6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        
-        elements.append(loan_table)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Terms and conditions
-        elements.append(Paragraph("<b>TERMS AND CONDITIONS</b>", heading_style))
-        
-        terms = [
-            "The loan is subject to verification of all documents submitted by you.",
-            "EMI payments must be made on or before the due date each month through auto-debit from your bank account.",
-            "The interest rate is fixed for the entire tenure of the loan.",
-            "Processing fee is non-refundable and will be deducted from the loan amount at the time of disbursement.",
-            "You may prepay the loan at any time subject to prepayment charges as per our policy.",
-            "In case of default in EMI payment, penal interest will be charged as per our policy.",
-            "The loan is provided for personal use and cannot be used for speculative or illegal purposes.",
-            "You must maintain adequate insurance coverage as per our requirements.",
-            "Any change in your employment status or residential address must be intimated to us immediately.",
-            "This sanction is valid for 30 days from the date of this letter."
-        ]
-        
-        for i, term in enumerate(terms, 1):
-            term_para = Paragraph(f"{i}. {term}", normal_style)
-            elements.append(term_para)
-        
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Documents required
-        elements.append(Paragraph("<b>DOCUMENTS REQUIRED FOR DISBURSEMENT</b>", heading_style))
-        
-        docs_text = """
-        1. Duly signed loan agreement<br/>
-        2. Post-dated cheques (PDCs) for EMI payments<br/>
-        3. Bank account details for disbursement<br/>
-        4. Latest salary slip (if not already submitted)<br/>
-        5. Address proof and identity proof (KYC documents)<br/>
-        6. Any other documents as communicated by our loan officer
-        """
-        elements.append(Paragraph(docs_text, normal_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Closing
-        closing_text = """
-        We appreciate your trust in our services and look forward to a long-lasting relationship. 
-        For any queries or assistance, please feel free to contact our customer care team.
-        """
-        elements.append(Paragraph(closing_text, normal_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Signature
-        signature_text = """
-        <b>For Tata Capital Limited</b><br/><br/><br/>
-        <b>Authorized Signatory</b><br/>
-        Credit Manager<br/>
-        Personal Loans Division
-        """
-        elements.append(Paragraph(signature_text, normal_style))
-        elements.append(Spacer(1, 0.3*inch))
+        elements.append(copy.copy(self.loan_heading))
+        elements.append(self._loan_table(loan_details, issue_date))
         
-        # Footer note
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=normal_style,
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
+        elements.extend(copy.copy(flowable) for flowable in self.tail)
         
-        footer_text = f"""
-        <i>This is a computer-generated document and does not require a physical signature.</i><br/>
-        <b>{self.company_name}</b> | {self.company_phone} | {self.company_email} | {self.company_website}
-        """
-        elements.append(Paragraph(footer_text, footer_style))
-        
-        # Build PDF
         doc.build(elements)
-        
-        # Get PDF bytes
         pdf_bytes = buffer.getvalue()
         buffer.close()
-        
-        # Save to file if path provided
-        if output_path:
-            with open(output_path, 'wb') as f:
-                f.write(pdf_bytes)
-        
         return pdf_bytes
     
-    def _create_letterhead(self):
+    def _loan_table(self, loan_details: Dict[str, Any], issue_date: datetime) -> Table:
+        """Build the loan details table"""
+        loan_table = Table(loan_detail_rows(loan_details, issue_date), colWidths=[3*inch, 2.5*inch])
+        loan_table.setStyle(LOAN_TABLE_STYLE)
+        return loan_table
+    
+    def _create_letterhead(self) -> List:
         """Create company letterhead"""
         elements = []
         
@@ -292,7 +313,7 @@ class SanctionLetterGenerator:
             spaceAfter=6
         )
         
-        company_name = Paragraph(self.company_name.upper(), title_style)
+        company_name = Paragraph(COMPANY_NAME.upper(), title_style)
         elements.append(company_name)
         
         # Company details
@@ -305,8 +326,8 @@ class SanctionLetterGenerator:
         )
         
         details = Paragraph(
-            f"{self.company_address.replace(chr(10), '<br/>')}<br/>"
-            f"Phone: {self.company_phone} | Email: {self.company_email} | Website: {self.company_website}",
+            f"{COMPANY_ADDRESS.replace(chr(10), '<br/>')}<br/>"
+            f"Phone: {COMPANY_PHONE} | Email: {COMPANY_EMAIL} | Website: {COMPANY_WEBSITE}",
             detail_style
         )
         elements.append(details)
@@ -323,6 +344,65 @@ class SanctionLetterGenerator:
         return elements
 
 
+# Compiled templates, one per thread (flowables are not safe to lay out concurrently)
+_templates = threading.local()
+
+
+def get_template() -> SanctionLetterTemplate:
+    """
+    Get this thread's compiled sanction letter template
+    
+    Returns:
+        SanctionLetterTemplate, built on first use in the thread
+    """
+    template = getattr(_templates, "template", None)
+    if template is None:
+        template = _templates.template = SanctionLetterTemplate()
+    return template
+
+
+class SanctionLetterGenerator:
+    """Generate professional loan sanction letters in PDF format (with the configured renderer)"""
+    
+    def __init__(self):
+        self.company_name = COMPANY_NAME
+        self.company_address = COMPANY_ADDRESS
+        self.company_email = COMPANY_EMAIL
+        self.company_phone = COMPANY_PHONE
+        self.company_website = COMPANY_WEBSITE
+    
+    def generate_sanction_letter(
+        self,
+        application_data: Dict[str, Any],
+        customer_data: Dict[str, Any],
+        loan_details: Dict[str, Any],
+        output_path: str = None
+    ) -> bytes:
+        """
+        Generate complete sanction letter PDF
+        
+        Args:
+            application_data: Application ID, date, etc.
+            customer_data: Customer name, address, etc.
+            loan_details: Loan amount, tenure, EMI, etc.
+            output_path: Optional file path to save PDF
+        
+        Returns:
+            PDF bytes
+        """
+        # Imported here: the renderers build on this module's template
+        from utils.letter_renderer import get_letter_renderer
+        
+        pdf_bytes = get_letter_renderer().render(application_data, customer_data, loan_details)
+        
+        # Save to file if path provided
+        if output_path:
+            with open(output_path, 'wb') as f:
+                f.write(pdf_bytes)
+        
+        return pdf_bytes
+
+
 # FastAPI endpoint integration
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import StreamingResponse
@@ -348,6 +428,9 @@ async def generate_sanction_letter_endpoint(request: SanctionLetterRequest):
     """
     Generate and download sanction letter PDF
     """
+    # Imported here: render workers load this module and never need the catalogue
+    from mocks.offer_mart import offer_catalogue_store
+    
     try:
         generator = SanctionLetterGenerator()
         
@@ -369,7 +452,8 @@ async def generate_sanction_letter_endpoint(request: SanctionLetterRequest):
             'interest_rate': request.interest_rate,
             'tenure': request.tenure,
             'emi': request.emi,
-            'processing_fee': request.processing_fee or (request.loan_amount * 0.02)
+            'processing_fee': (request.processing_fee if request.processing_fee is not None
+                               else offer_catalogue_store.get().processing_fee(request.loan_amount))
         }
         
         # Generate PDF
@@ -413,7 +497,8 @@ if __name__ == "__main__":
         'amount': 400000,
         'interest_rate': 10.5,
         'tenure': 48,
-        'emi': 10151.47
+        'emi': 10151.47,
+        'processing_fee': 8000
     }
     
     # Generate PDF
@@ -13,6 +13,8 @@ const ChatInterface = ({ sessionId, initialMessage, onSessionUpdate }) => {
     const [sanctionData, setSanctionData] = useState(null);
     const messagesEndRef = useRef(null);
     const inputRef = useRef(null);
+    // Last session state seen; /state only returns what changed after its revision
+    const sessionStateRef = useRef({ revision: 0, customer: null, application: null });
 
     useEffect(() => {
         // Display initial greeting message if available
@@ -36,6 +38,36 @@ const ChatInterface = ({ sessionId, initialMessage, onSessionUpdate }) => {
         messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
     };
 
+    const refreshSessionState = async (stage, metadata) => {
+        if (!onSessionUpdate) return;
+
+        // Fetch only the customer and application fields changed since the last poll
+        try {
+            const known = sessionStateRef.current;
+            const stateResponse = await axios.get(`/api/session/${sessionId}/state`, {
+                params: { since: known.revision },
+            });
+            const delta = stateResponse.data;
+            const merged = {
+                revision: delta.revision,
+                customer: delta.customer || known.customer,
+                application: delta.application
+                    ? { ...(known.application || {}), ...delta.application }
+                    : known.application,
+            };
+            sessionStateRef.current = merged;
+
+            onSessionUpdate({
+                customer: merged.customer,
+                application: merged.application,
+                stage: stage,
+                metadata: metadata
+            });
+        } catch (err) {
+            console.error('Failed to fetch session data:', err);
+        }
+    };
+
     const sendMessage = async (text) => {
         if (!text.trim() && text !== 'start') return;
 
@@ -81,20 +113,7 @@ const ChatInterface = ({ sessionId, initialMessage, onSessionUpdate }) => {
             }
 
             // Emit session update to parent
-            if (onSessionUpdate) {
-                // Fetch session data to get customer and application info
-                try {
-                    const sessionResponse = await axios.get(`/api/session/${sessionId}`);
-                    onSessionUpdate({
-                        customer: sessionResponse.data.customer,
-                        application: sessionResponse.data.application,
-                        stage: response.data.stage,
-                        metadata: response.data.metadata
-                    });
-                } catch (err) {
-                    console.error('Failed to fetch session data:', err);
-                }
-            }
+            await refreshSessionState(response.data.stage, response.data.metadata);
         } catch (error) {
             console.error('Error sending message:', error);
             const errorMessage = {
@@ -156,19 +175,7 @@ const ChatInterface = ({ sessionId, initialMessage, onSessionUpdate }) => {
                 }
 
                 // Emit session update to parent
-                if (onSessionUpdate) {
-                    try {
-                        const sessionResponse = await axios.get(`/api/session/${sessionId}`);
-                        onSessionUpdate({
-                            customer: sessionResponse.data.customer,
-                            application: sessionResponse.data.application,
-                            stage: response.data.stage,
-                            metadata: response.data.metadata
-                        });
-                    } catch (err) {
-                        console.error('Failed to fetch session data:', err);
-                    }
-                }
+                await refreshSessionState(response.data.stage, response.data.metadata);
             } else {
                 const errorMessage = {
                     role: 'assistant',